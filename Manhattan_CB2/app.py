@@ -1,10 +1,40 @@
-from flask import Flask, render_template, jsonify
-import pandas as pd
+from flask import Blueprint, Flask, Response, current_app, g, render_template, jsonify, request, stream_with_context, url_for
+from flask import before_render_template, template_rendered
 import json
 import openai
 from dotenv import load_dotenv
 import os
-import re
+import hashlib
+import calendar
+import cProfile
+import io
+import pstats
+import time
+import sys
+from datetime import date
+
+# The modules next to this file are imported by name; put this directory on
+# the path however the app is started (gunicorn's pythonpath, python -m, a
+# platform's own launcher), not only when it is the working directory
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from board_data import (
+    CSV_PATHS, GENERATED_PATHS, TREND_PATHS, VOTE_PATHS, llm_cache, load_board_data, metrics, search_index,
+    update_board_trends, update_search_index,
+)
+from board_registry import BOARDS, DEFAULT_BOARD
+from dataset_cache import DatasetCache, file_signature
+from geo_simplify import BOARD_TOLERANCE, OVERVIEW_TOLERANCE, COORD_PRECISION, district_payloads
+from http_cache import CompressedBody, add_default_caching, cached_response
+from llm_cache import cache_key
+from llm_client import LLMBusy, LLMClient
+from prompts import SUMMARY_MODEL, VOTES_MODEL
+from static_pages import StaticPages, page_key, source_hash
+from term_trends import TermTrends, query_hash, term_series
+from summarizer import summarize_minutes, summarize_minutes_stream, extract_votes_chunked, extract_votes_stream
+from vote_rules import month_votes
 
 # Load environment variables
 load_dotenv()
@@ -12,135 +42,521 @@ load_dotenv()
 # Access the OpenAI API key
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
-# Initialize Flask app
-app = Flask(__name__)
+# All routes; create_app() registers them on an app
+site = Blueprint("site", __name__)
 
-# Define paths for Community Board CSVs
-CSV_PATHS = {
-    "manhattan-cb1": "Manhattan_CB1/Manhattan_CB1_with_content.csv",
-    "manhattan-cb2": "Manhattan_CB2/Manhattan_CB2.csv",
-    "manhattan-cb4": "Manhattan_CB4/Manhattan_CB4_with_content.csv",
-    "bronx-cb1": "Bronx_CB1/Bronx_CB1_with_content.csv",
-}
+# Request latency, time per stage, cache hits and OpenAI usage, served at
+# /metrics (see metrics.py). The registry is board_data's, which times the
+# stages of loading a board. Under gunicorn the workers share their numbers
+# through METRICS_DIR (set in gunicorn.conf.py).
+metrics.histogram("http_request_duration_seconds", "Time to build a response by route (streams: until the headers are sent)")
+metrics.counter("cache_requests_total", "Lookups in the app's caches by result")
+metrics.counter("app_errors_total", "Error messages returned by the routes")
+
+# Changes whenever a template changes, so cached pages are revalidated after a deploy
+def templates_version():
+    templates_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(templates_dir)):
+        with open(os.path.join(templates_dir, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+TEMPLATES_VERSION = templates_version()
+
+# Months whose minutes are this old rarely change; browsers may reuse them for a while
+PAST_MONTH_AFTER_DAYS = 90
+PAST_MONTH_MAX_AGE = 7 * 24 * 3600
+
+
+# Helper function to get the Cache-Control max-age for a month's pages
+def month_max_age(records):
+    if records is None:
+        return 0
+    month_end = date(records.year, records.month, calendar.monthrange(records.year, records.month)[1])
+    return PAST_MONTH_MAX_AGE if (date.today() - month_end).days > PAST_MONTH_AFTER_DAYS else 0
 
 # Define community boards
-community_boards = [
-    {"name": "Manhattan Community Board 1", "link": "/manhattan-cb1"},
-    {"name": "Manhattan Community Board 2", "link": "/manhattan-cb2"},
-    {"name": "Manhattan Community Board 4", "link": "/manhattan-cb4"},
-    {"name": "Bronx Community Board 1", "link": "/bronx-cb1"},
-]
-
-
-# Clean data and process for both ManCB1+ManCB4+BronxCB1
-def clean_date(date):
-    if isinstance(date, str):
-        # Handle "YYYY Month YYYY" format (e.g., "2024 January 2024")
-        if re.match(r"^\d{4}\s[A-Za-z]+\s\d{4}$", date):
-            return pd.to_datetime(f"{date.split()[0]} {date.split()[1]} 1", errors="coerce")
-        
-        # Handle "Month YYYY Minutes" format (e.g., "January 2024 Minutes")
-        if re.match(r"^[A-Za-z]+\s\d{4}\sMinutes$", date):
-            month_year = " ".join(date.split()[:2])
-            return pd.to_datetime(month_year, format="%B %Y", errors="coerce")
-        
-        # Handle "Month DD, YYYY Minutes" format (e.g., "June 20, 2024 Minutes")
-        if re.match(r"^[A-Za-z]+\s\d{1,2},\s\d{4}\sMinutes$", date):
-            # Extract the full date
-            full_date = " ".join(date.split()[:3]).replace(",", "")
-            return pd.to_datetime(full_date, format="%B %d %Y", errors="coerce")
-    
-    # Fallback: Try to parse standard date formats
-    return pd.to_datetime(date, errors="coerce")
+community_boards = [{"name": board["name"], "link": f"/{board_id}"} for board_id, board in BOARDS.items()]
+
+# Each board's district in Community Districts.geojson (boro_cd)
+BOARD_DISTRICTS = {board_id: board["district"] for board_id, board in BOARDS.items()}
+
+
+# Per-month term counts of every board for /api/trends, rebuilt whenever a board is (re)loaded
+trends_cache = DatasetCache(TREND_PATHS, TermTrends)
+
+
+def on_board_load(board_id, board):
+    update_search_index(board_id, board)
+    update_board_trends(board_id, board)
+
+
+# Parsed boards stay in memory and are reloaded in the background when the CSV changes
+dataset_cache = DatasetCache(CSV_PATHS, load_board_data, on_load=on_board_load)
+
+
+# Helper function to get a board's processed data (shared, do not modify in place)
+def get_board_data(board_id):
+    return dataset_cache.get(board_id)
+
+
+# Helper function to look up one month's rows through the precomputed index
+def get_month_records(board_id, year, month):
+    board = get_board_data(board_id)
+    with metrics.timer("stage_seconds", stage="lookup"):
+        return board.lookup(year, month)
+
+
+# One pooled, rate-limited chat API client shared by every request thread
+llm_client = LLMClient(int(os.getenv("LLM_CONCURRENCY", "4")), metrics=metrics)
+openai.requestssession = llm_client.session
+
+# Chunk calls one summary or vote list makes at the same time: half the
+# client's slots, so one long uncached month can't take them all and make
+# another request's calls give up with LLMBusy
+CHUNK_PARALLELISM = max(1, llm_client.concurrency // 2)
+
+
+# Helper function to count a hit or miss in one of the caches
+def count_cache(cache, hit):
+    metrics.inc("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+# Helper function for the routes' error messages: counts the error for
+# /metrics and logs the traceback, then returns the message for the reply.
+# Routes send it with a 500; pages that show it inline are still kept out of
+# caches (see http_cache.add_default_caching).
+def error_reply(message):
+    metrics.inc("app_errors_total", route=route_label())
+    current_app.logger.exception(message)
+    g.no_store = True
+    return message
+
+
+# Helper function to run a chat completion through the persistent cache
+def cached_chat_completion(board_id, kind, messages, model="gpt-4"):
+    computed = []
+
+    def compute():
+        computed.append(True)
+        return llm_client.complete(model, messages)
+
+    value = llm_cache.get_or_compute(board_id, kind, model, json.dumps(messages), compute)
+    count_cache("llm", not computed)
+    return value
+
+
+# Helper function to stream a chat completion, storing the full reply in the
+# cache once it has arrived (a cached reply comes back as one piece)
+def cached_chat_stream(board_id, kind, messages, model="gpt-4"):
+    key = cache_key(board_id, kind, model, json.dumps(messages))
+    cached = llm_cache.get(key)
+    count_cache("llm", cached is not None)
+    if cached is not None:
+        yield cached
+        return
+    pieces = []
+    for piece in llm_client.stream(model, messages):
+        pieces.append(piece)
+        yield piece
+    llm_cache.put(key, "".join(pieces), board_id, kind, model)
 
 
+# Helper function to send a generator's output as server-sent events.
+# `events` yields dicts; failures end the stream with an "error" event.
+def event_stream(events):
+    def generate():
+        try:
+            for data in events:
+                yield f"data: {json.dumps(data)}\n\n"
+            yield "event: done\ndata: {}\n\n"
+        except LLMBusy as e:
+            yield f"event: error\ndata: {json.dumps({'error': error_reply(str(e))})}\n\n"
+        except openai.error.OpenAIError as e:
+            yield f"event: error\ndata: {json.dumps({'error': error_reply(f'OpenAI API error: {e}')})}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'error': error_reply(f'Error generating content: {e}')})}\n\n"
+
+    response = Response(stream_with_context(generate()), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    # Keep proxies such as nginx from buffering the stream
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+# Helper function to tell whether a summary/vote page should stream its content
+# (?stream=0 renders it in the request instead, for clients without JavaScript)
+def wants_stream():
+    return request.args.get("stream") != "0"
+
+
+# Pre-generated results are reloaded like the CSVs when pregenerate.py rewrites them
+def load_generated(path):
+    with open(path, "r") as f:
+        return json.load(f)
 
 
-# Helper function to load and preprocess CSV
-def load_and_process_data(csv_path):
+generated_cache = DatasetCache(GENERATED_PATHS, load_generated)
+votes_cache = DatasetCache(VOTE_PATHS, load_generated)
+
+
+# Helper function to get an offline-generated summary or vote list, if it is current
+def get_pregenerated(board_id, records, kind):
+    if records is None:
+        return None
     try:
-        data = pd.read_csv(csv_path)
-        data['Date'] = data['Date'].apply(clean_date)
-        data = data.dropna(subset=['Date'])
-        data['Year'] = data['Date'].dt.year
-        data['Month_Num'] = data['Date'].dt.month
-        data['Month_Name'] = data['Date'].dt.strftime('%B')
-        return data
-    except Exception as e:
-        raise ValueError(f"Error loading or processing data from {csv_path}: {e}")
+        generated = generated_cache.get(board_id)
+    except (KeyError, OSError, ValueError):
+        count_cache("pregenerated", False)
+        return None
+    entry = generated.get(records.key)
+    current = bool(entry) and entry.get("content_hash") == records.content_hash
+    count_cache("pregenerated", current)
+    return entry.get(kind) if current else None
+
+
+# Pages prebuilt by prerender.py; served instead of rendering while still current
+static_pages = StaticPages(os.getenv("STATIC_BUILD_DIR", "Manhattan_CB2/build"))
+
+
+# Helper function to get the source hash a page is rendered from now (None: not prebuildable)
+def page_source(board_id, kind, records=None):
+    if kind == "index":
+        return source_hash(get_board_data(board_id).version, TEMPLATES_VERSION, district_maps_version())
+    if records is None:
+        return None
+    if kind == "month":
+        return source_hash(records.content_hash, TEMPLATES_VERSION)
+    generated = get_pregenerated(board_id, records, kind)
+    if generated is None:
+        return None
+    return source_hash(records.content_hash, json.dumps(generated), TEMPLATES_VERSION)
+
+
+# Helper function to serve a page from the static build if it has a current copy
+def prebuilt_page(board_id, kind, records=None):
+    if not current_app.config["SERVE_PREBUILT"]:
+        return None
+    if kind == "index":
+        key = page_key(board_id, kind)
+    elif records is None:
+        return None
+    else:
+        key = page_key(board_id, kind, records.year, records.month)
+    source = page_source(board_id, kind, records)
+    entry = static_pages.entry(key, source) if source else None
+    count_cache("prebuilt", entry is not None)
+    return static_pages.response(entry, month_max_age(records)) if entry else None
+
+
+# Helper function to build an ETag for a dynamically rendered month/summary/vote page
+def page_etag(board_id, kind, records, year, month):
+    source = page_source(board_id, kind, records)
+    if source is None:
+        return None
+    # The URL's year/month spelling is echoed into the page
+    return f"{kind}-{source_hash(source, board_id, year, month)[:20]}"
 
 
 # Helper function for route logic (month content, summary, and votes)
-def filter_data_and_render(board_id, year, month, template, process_fn=None):
+def filter_data_and_render(board_id, year, month, template, process_fn=None, generated_kind=None, stream_url=None):
     try:
         csv_path = CSV_PATHS.get(board_id)
         if not csv_path:
             return f"Invalid board ID: {board_id}", 404
 
-        data = load_and_process_data(csv_path)
-
-        # Filter rows for the specified year and month
-        filtered_data = data[
-            (data['Year'] == int(year)) & (data['Month_Name'].str.lower() == month.lower())
-        ]
-
-        # If a custom processing function is provided, use it
-        content = process_fn(filtered_data) if process_fn else filtered_data['Content'].str.strip().tolist()
+        records = get_month_records(board_id, year, month)
+        if generated_kind:
+            prebuilt = prebuilt_page(board_id, generated_kind, records)
+            if prebuilt is not None:
+                return prebuilt
+
+        # Prefer offline-generated results, then a custom processing function
+        content = get_pregenerated(board_id, records, generated_kind) if generated_kind else None
+        if content is not None:
+            return cached_response(
+                lambda: render_template(template, year=year, month=month, content_list=content),
+                page_etag(board_id, generated_kind, records, year, month),
+                max_age=month_max_age(records),
+            )
+        # Send the page right away and let it stream the content in
+        if stream_url and records is not None and wants_stream():
+            return render_template(template, year=year, month=month, content_list=[], stream_url=stream_url)
+        if process_fn:
+            with metrics.timer("stage_seconds", stage="llm"):
+                content = process_fn(records.contents if records else [])
+        else:
+            content = records.stripped if records else []
 
         # Render template
         return render_template(template, year=year, month=month, content_list=content)
     except Exception as e:
-        return f"Error processing content for {board_id}: {e}"
+        return error_reply(f"Error processing content for {board_id}: {e}"), 500
 
 
-@app.route("/")
+@site.route("/")
 def landing_page():
-    return render_template("landing_page.html", community_boards=community_boards)
+    return cached_response(
+        lambda: render_template(
+            "landing_page.html", community_boards=community_boards,
+            geojson_url=url_for(".overview_geojson", v=district_maps_version()),
+        ),
+        f"landing-{TEMPLATES_VERSION}-{district_maps_version()}",
+    )
+
 
+GEOJSON_PATH = "Manhattan_CB2/static/Community Districts.geojson"
+GEOJSON_MAX_AGE = 24 * 3600
 
-@app.route("/geojson")
+
+# The district map is parsed once, re-serialized compactly and kept compressed in memory
+def load_geojson(path):
+    with open(path, "r") as f:
+        return CompressedBody(json.dumps(json.load(f), separators=(",", ":")))
+
+
+geojson_cache = DatasetCache({"geojson": GEOJSON_PATH}, load_geojson)
+
+
+@site.route("/geojson")
 def geojson():
-    geojson_path = "Manhattan_CB2/static/Community Districts.geojson"
     try:
-        with open(geojson_path, "r") as f:
-            geojson_data = json.load(f)
-        return jsonify(geojson_data)
+        return geojson_cache.get("geojson").response("application/json", max_age=GEOJSON_MAX_AGE)
+    except Exception as e:
+        return jsonify({"error": error_reply(f"Failed to load GeoJSON: {e}")}), 500
+
+
+# Versioned URLs (?v=...) of the simplified maps never change content
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+# Changes with the source file and the simplification settings
+def district_maps_version():
+    return source_hash(file_signature(GEOJSON_PATH), BOARD_TOLERANCE, OVERVIEW_TOLERANCE, COORD_PRECISION)[:12]
+
+
+# Simplified per-board districts plus a coarse overview, built once per source file
+def load_district_maps(path):
+    version = district_maps_version()
+    with open(path, "r") as f:
+        payloads = district_payloads(json.load(f), BOARD_DISTRICTS.values())
+    return version, {key: CompressedBody(payload) for key, payload in payloads.items()}
+
+
+district_maps = DatasetCache({"districts": GEOJSON_PATH}, load_district_maps)
+
+
+# Helper function to serve one simplified map, immutable when the URL carries its version
+def district_map_response(key):
+    version, bodies = district_maps.get("districts")
+    if key not in bodies:
+        return jsonify({"error": f"No district map for {key}"}), 404
+    if request.args.get("v") == version:
+        response = bodies[key].response("application/json", max_age=IMMUTABLE_MAX_AGE)
+        response.cache_control.immutable = True
+        return response
+    return bodies[key].response("application/json", max_age=GEOJSON_MAX_AGE)
+
+
+@site.route("/geojson/overview")
+def overview_geojson():
+    try:
+        return district_map_response("overview")
+    except Exception as e:
+        return jsonify({"error": error_reply(f"Failed to load GeoJSON: {e}")}), 500
+
+
+@site.route("/<board_id>/geojson")
+def board_geojson(board_id):
+    if board_id not in BOARD_DISTRICTS:
+        return jsonify({"error": f"Invalid board ID: {board_id}"}), 404
+    try:
+        return district_map_response(BOARD_DISTRICTS[board_id])
+    except Exception as e:
+        return jsonify({"error": error_reply(f"Failed to load GeoJSON: {e}")}), 500
+
+
+@site.route("/search")
+@site.route("/<board_id>/search")
+def search(board_id=None):
+    query = request.args.get("q", "").strip()
+    board_id = board_id or request.args.get("board") or None
+    try:
+        if board_id and board_id not in CSV_PATHS:
+            return f"Invalid board ID: {board_id}", 404
+
+        # Loading a board brings its part of the index up to date (in the
+        # background; a board's first load is waited for)
+        board_ids = [board_id] if board_id else list(CSV_PATHS)
+        for searched_board in board_ids:
+            try:
+                get_board_data(searched_board)
+                dataset_cache.wait_loaded(searched_board)
+            except (ValueError, OSError):
+                # Boards whose CSV is missing or broken are searched as last indexed
+                pass
+
+        results = search_index.search(query, [board_id] if board_id else None) if query else []
+        return render_template("search.html", query=query, board_id=board_id, results=results)
+    except Exception as e:
+        return error_reply(f"Error searching minutes: {e}"), 500
+
+
+# Month-by-month mentions of one or more terms across boards, e.g.
+# /api/trends?term=liquor license&term=Chelsea&boards=manhattan-cb1,bronx-cb1
+# (terms may also be comma-separated; all boards by default)
+@site.route("/api/trends")
+def api_trends():
+    terms = [term.strip() for value in request.args.getlist("term") for term in value.split(",") if term.strip()]
+    if not terms:
+        return jsonify({"error": "No term given"}), 400
+    try:
+        for term in terms:
+            query_hash(term)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid term: {e}"}), 400
+    boards_arg = request.args.get("boards", "")
+    board_ids = [board_id.strip() for board_id in boards_arg.split(",") if board_id.strip()] or list(CSV_PATHS)
+    for board_id in board_ids:
+        if board_id not in CSV_PATHS:
+            return jsonify({"error": f"Invalid board ID: {board_id}"}), 404
+
+    try:
+        trends = {}
+        for board_id in board_ids:
+            try:
+                # Loading a board brings its trend file up to date (in the
+                # background; a board's first load is waited for)
+                get_board_data(board_id)
+                dataset_cache.wait_loaded(board_id)
+                trends[board_id] = trends_cache.get(board_id)
+            except (ValueError, OSError):
+                # Boards whose CSV is missing or broken are left out
+                continue
+        versions = "-".join(f"{board_id}:{board.version[:16]}" for board_id, board in trends.items())
+        etag = hashlib.sha256("\x00".join([versions, *terms]).encode("utf-8")).hexdigest()[:32]
+        return cached_response(
+            lambda: json.dumps(term_series(trends, terms)),
+            f"trends-{etag}",
+            mimetype="application/json",
+        )
     except Exception as e:
-        return jsonify({"error": f"Failed to load GeoJSON: {e}"}), 500
+        return jsonify({"error": error_reply(f"Error computing trends: {e}")}), 500
 
 
-@app.route("/<board_id>")
+@site.route("/<board_id>")
 def board_index(board_id):
     try:
         csv_path = CSV_PATHS.get(board_id)
         if not csv_path:
             return f"Invalid board ID: {board_id}", 404
 
-        data = load_and_process_data(csv_path)
-        sorted_data = data.sort_values(by=['Year', 'Month_Num'], ascending=[False, True])
-        grouped_data = (
-            sorted_data.groupby('Year', sort=False)
-            .apply(lambda x: x[['Month_Name', 'Content']].to_dict(orient='records'))
-            .to_dict()
+        board = get_board_data(board_id)
+        prebuilt = prebuilt_page(board_id, "index")
+        if prebuilt is not None:
+            return prebuilt
+
+        template = BOARDS[board_id]["template"]
+
+        # Months only (count, length, preview); bodies are fetched per month
+        return cached_response(
+            lambda: render_template(
+                template, grouped_data=board.grouped_months(), board_id=board_id,
+                geojson_url=url_for(".board_geojson", board_id=board_id, v=district_maps_version()),
+            ),
+            f"{board_id}-{board.version[:16]}-{TEMPLATES_VERSION}-{district_maps_version()}",
+        )
+    except Exception as e:
+        return error_reply(f"Error processing data for board {board_id}: {e}"), 500
+
+
+@site.route("/api/<board_id>/months")
+def api_board_months(board_id):
+    if board_id not in CSV_PATHS:
+        return jsonify({"error": f"Invalid board ID: {board_id}"}), 404
+    try:
+        board = get_board_data(board_id)
+        return cached_response(
+            lambda: json.dumps({
+                "board_id": board_id,
+                "years": [
+                    {"year": year, "months": months} for year, months in board.grouped_months().items()
+                ],
+            }),
+            f"{board_id}-{board.version[:16]}",
+            mimetype="application/json",
         )
+    except Exception as e:
+        return jsonify({"error": error_reply(f"Error processing data for board {board_id}: {e}")}), 500
 
-        # Dynamic template selection
-        if board_id == "manhattan-cb1":
-            template = "index_with_map.html"
-        elif board_id == "manhattan-cb4":
-            template = "CB4_index_with_map.html"
-        elif board_id == "manhattan-cb2":
-            template = "CB2_index_with_map.html"  # Use a new template for CB2 if required
-        else:
-            template = "bronx_index_with_map.html"
 
-        return render_template(template, grouped_data=grouped_data, board_id=board_id)
+@site.route("/api/<board_id>/month/<year>/<month>")
+def api_month_content(board_id, year, month):
+    if board_id not in CSV_PATHS:
+        return jsonify({"error": f"Invalid board ID: {board_id}"}), 404
+    try:
+        records = get_month_records(board_id, year, month)
+        if records is None:
+            return jsonify({"error": f"No minutes for {month} {year}"}), 404
+        return cached_response(
+            lambda: json.dumps({
+                "board_id": board_id,
+                "year": records.year,
+                "month": records.month_name,
+                "documents": [
+                    {"url": url, "content": content}
+                    for url, content in zip(records.urls, records.page_contents)
+                ],
+            }),
+            f"{board_id}-{records.key}-{records.content_hash[:16]}",
+            mimetype="application/json",
+        )
     except Exception as e:
-        return f"Error processing data for board {board_id}: {e}"
+        return jsonify({"error": error_reply(f"Error processing month content for board {board_id}: {e}")}), 500
+
+
 
+@site.route("/api/<board_id>/vote/<year>/<month>")
+def api_month_votes(board_id, year, month):
+    if board_id not in CSV_PATHS:
+        return jsonify({"error": f"Invalid board ID: {board_id}"}), 404
+    try:
+        records = get_month_records(board_id, year, month)
+        if records is None:
+            return jsonify({"error": f"No minutes for {month} {year}"}), 404
+
+        # Stored records when extract_votes.py has covered this version of the
+        # month; otherwise the rules alone, which take milliseconds
+        try:
+            stored = votes_cache.get(board_id).get(records.key)
+        except (KeyError, OSError, ValueError):
+            stored = None
+        current = stored is not None and stored.get("content_hash") == records.content_hash
+
+        def body():
+            votes = stored if current else month_votes("\n\n".join(records.contents))
+            return json.dumps({
+                "board_id": board_id,
+                "year": records.year,
+                "month": records.month_name,
+                "stored": current,
+                "unparsed_sections": votes["unparsed_sections"],
+                "votes": votes["votes"],
+            })
+
+        return cached_response(
+            body,
+            f"{board_id}-votes-{records.key}-{records.content_hash[:16]}-{'stored' if current else 'rules'}",
+            mimetype="application/json",
+            max_age=month_max_age(records),
+        )
+    except Exception as e:
+        return jsonify({"error": error_reply(f"Error extracting votes for board {board_id}: {e}")}), 500
 
 
-@app.route("/<board_id>/month/<year>/<month>")
+@site.route("/<board_id>/month/<year>/<month>")
 def get_month_content(board_id, year, month):
     try:
         # Get the CSV file path from the mapping
@@ -148,104 +564,124 @@ def get_month_content(board_id, year, month):
         if not csv_path:
             return f"Invalid board ID: {board_id}", 404
 
-        # Load and preprocess the data
-        data = load_and_process_data(csv_path)
-
-        # Filter rows for the specified year and month
-        filtered_data = data[
-            (data['Year'] == int(year)) & (data['Month_Name'].str.lower() == month.lower())
-        ]
-
-        # Extract content
-        if not filtered_data.empty:
-            content_list = filtered_data['Content'].str.strip().tolist()
-
-            # Filter out only the bottom half of the content
-            filtered_content = []
-            for content in content_list:
-                if "Back to Previous Page" in content:
-                    # Split at "Back to Previous Page" and take the bottom half
-                    parts = content.split("Back to Previous Page")
-                    filtered_content.append(parts[-1].strip())  # Get content after the marker
-                else:
-                    filtered_content.append(content)  # Fallback if marker not found
-        else:
-            filtered_content = ["No content available."]
+        # Look up the month; content after "Back to Previous Page" is precomputed
+        records = get_month_records(board_id, year, month)
+        prebuilt = prebuilt_page(board_id, "month", records)
+        if prebuilt is not None:
+            return prebuilt
 
-        return render_template("month_content.html", year=year, month=month, content_list=filtered_content)
+        if records is None:
+            return render_template("month_content.html", year=year, month=month, content_list=["No content available."])
+
+        # The page only changes with the month's minutes, so it's tagged before rendering
+        return cached_response(
+            lambda: render_template("month_content.html", year=year, month=month, content_list=records.page_contents),
+            page_etag(board_id, "month", records, year, month),
+            max_age=month_max_age(records),
+        )
 
     except Exception as e:
-        return f"Error processing month content for board {board_id}: {e}"
+        return error_reply(f"Error processing month content for board {board_id}: {e}"), 500
 
 
-@app.route("/summary/<year>/<month>")
-@app.route("/<board_id>/summary/<year>/<month>")
-def get_summary(board_id="manhattan-cb1", year=None, month=None):
-    def summarize(filtered_data):
-        full_content = " ".join(filtered_data['Content'].tolist()) if not filtered_data.empty else "No content available."
+@site.route("/summary/<year>/<month>")
+@site.route("/<board_id>/summary/<year>/<month>")
+def get_summary(board_id=DEFAULT_BOARD, year=None, month=None):
+    def summarize(contents):
+        full_content = "\n\n".join(contents) if contents else "No content available."
         if not full_content.strip() or full_content == "No content available.":
             return "No summary available."
 
         try:
-            # Call OpenAI API for summary
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "Summarize the meeting minutes."},
-                    {"role": "user", "content": f"Summarize: {full_content[:4000]}"},
-                ],
+            # Summarize chunk by chunk with OpenAI, then combine (each call cached per prompt)
+            return summarize_minutes(
+                full_content,
+                lambda kind, messages: cached_chat_completion(board_id, kind, messages, SUMMARY_MODEL),
+                parallel=CHUNK_PARALLELISM,
             )
-            return response.choices[0].message['content']
         except openai.error.OpenAIError as e:
-            return f"OpenAI API error: {e}"
+            return error_reply(f"OpenAI API error: {e}")
         except Exception as e:
-            return f"Error generating summary: {e}"
+            return error_reply(f"Error generating summary: {e}")
 
     try:
         # Validate board_id and fetch CSV path
         if board_id not in CSV_PATHS:
             return f"Invalid board ID: {board_id}", 404
-        csv_path = CSV_PATHS[board_id]
-
-        # Load and filter data
-        data = load_and_process_data(csv_path)
-        filtered_data = data[
-            (data['Year'] == int(year)) & (data['Month_Name'].str.lower() == month.lower())
-        ]
 
-        # Generate summary
-        summary = summarize(filtered_data)
+        # Look up the month's minutes
+        records = get_month_records(board_id, year, month)
+        prebuilt = prebuilt_page(board_id, "summary", records)
+        if prebuilt is not None:
+            return prebuilt
+
+        # Use the offline summary when there is one, otherwise generate it
+        summary = get_pregenerated(board_id, records, "summary")
+        if summary is not None:
+            return cached_response(
+                lambda: render_template("summary.html", year=year, month=month, summary=summary),
+                page_etag(board_id, "summary", records, year, month),
+                max_age=month_max_age(records),
+            )
+        if records is not None and wants_stream():
+            stream_url = url_for(".stream_summary", board_id=board_id, year=year, month=month)
+            return render_template("summary.html", year=year, month=month, summary="", stream_url=stream_url)
+        summary = summarize(records.contents if records else [])
 
         # Render template with summary
         return render_template("summary.html", year=year, month=month, summary=summary)
     except Exception as e:
-        return f"Error processing summary: {e}"
-
-
-
-@app.route("/vote/<year>/<month>")
-@app.route("/<board_id>/vote/<year>/<month>")
+        return error_reply(f"Error processing summary: {e}"), 500
+
+
+# Server-sent events carrying the summary text as OpenAI produces it
+@site.route("/<board_id>/summary/<year>/<month>/stream")
+def stream_summary(board_id, year, month):
+    if board_id not in CSV_PATHS:
+        return f"Invalid board ID: {board_id}", 404
+
+    def pieces():
+        records = get_month_records(board_id, year, month)
+        summary = get_pregenerated(board_id, records, "summary")
+        if summary is not None:
+            yield {"text": summary}
+            return
+        full_content = "\n\n".join(records.contents) if records else ""
+        if not full_content.strip():
+            yield {"text": "No summary available."}
+            return
+        for text in summarize_minutes_stream(
+            full_content,
+            lambda kind, messages: cached_chat_completion(board_id, kind, messages, SUMMARY_MODEL),
+            lambda kind, messages: cached_chat_stream(board_id, kind, messages, SUMMARY_MODEL),
+            parallel=CHUNK_PARALLELISM,
+        ):
+            yield {"text": text}
+
+    return event_stream(pieces())
+
+
+
+@site.route("/vote/<year>/<month>")
+@site.route("/<board_id>/vote/<year>/<month>")
 def get_vote_summary(board_id=None, year=None, month=None):
     # Set default board_id if not provided
     if board_id is None:
-        board_id = "manhattan-cb1"
+        board_id = DEFAULT_BOARD
 
-    def extract_votes(filtered_data):
-        full_content = " ".join(filtered_data['Content'].tolist()) if not filtered_data.empty else ""
+    def extract_votes(contents):
+        full_content = "\n\n".join(contents) if contents else ""
         if not full_content:
             return ["No voting decisions available."]
 
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "Extract voting decisions from the meeting minutes."},
-                    {"role": "user", "content": f"Extract votes: {full_content[:4000]}"},
-                ],
+            return extract_votes_chunked(
+                full_content,
+                lambda kind, messages: cached_chat_completion(board_id, kind, messages, VOTES_MODEL),
+                parallel=CHUNK_PARALLELISM,
             )
-            return [line.strip() for line in response.choices[0].message['content'].split("\n") if line.strip()]
         except Exception as e:
-            return [f"Error extracting votes: {e}"]
+            return [error_reply(f"Error extracting votes: {e}")]
 
     try:
         # Validate board_id and process the request
@@ -253,17 +689,153 @@ def get_vote_summary(board_id=None, year=None, month=None):
             return f"Invalid board ID: {board_id}", 404
         
         # Call helper function to load, filter, and render data
-        return filter_data_and_render(board_id, year, month, "vote.html", extract_votes)
+        stream_url = url_for(".stream_votes", board_id=board_id, year=year, month=month)
+        return filter_data_and_render(board_id, year, month, "vote.html", extract_votes, "votes", stream_url)
 
     except Exception as e:
-        return f"Error processing vote summary: {e}"
+        return error_reply(f"Error processing vote summary: {e}"), 500
+
+
+# Server-sent events carrying each voting decision as soon as it is extracted
+@site.route("/<board_id>/vote/<year>/<month>/stream")
+def stream_votes(board_id, year, month):
+    if board_id not in CSV_PATHS:
+        return f"Invalid board ID: {board_id}", 404
+
+    def votes():
+        records = get_month_records(board_id, year, month)
+        generated = get_pregenerated(board_id, records, "votes")
+        if generated is not None:
+            for vote in generated:
+                yield {"vote": vote}
+            return
+        full_content = "\n\n".join(records.contents) if records else ""
+        if not full_content:
+            yield {"vote": "No voting decisions available."}
+            return
+        for vote in extract_votes_stream(
+            full_content,
+            lambda kind, messages: cached_chat_stream(board_id, kind, messages, VOTES_MODEL),
+        ):
+            yield {"vote": vote}
 
+    return event_stream(votes())
 
 
-@app.route("/month/<year>/<month>")
+
+@site.route("/month/<year>/<month>")
 def default_month_content(year, month):
-    # Default to Manhattan CB1
-    return get_month_content("manhattan-cb1", year, month)
+    return get_month_content(DEFAULT_BOARD, year, month)
+
+
+@site.route("/metrics")
+def prometheus_metrics():
+    response = Response(metrics.render(), mimetype="text/plain")
+    response.headers["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+    response.cache_control.no_store = True
+    return response
+
+
+# Rows of a request's profile shown in the reply
+PROFILE_LINES = 60
+
+
+# Helper function to name the route a request matched (its URL rule, so the
+# label doesn't grow with every board and month)
+def route_label():
+    return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+
+# Helper function to tell whether this request asked to be profiled
+# (?profile=1 or an "X-Profile: 1" header, when the app allows profiling)
+def wants_profile():
+    if not current_app.config["PROFILING"]:
+        return False
+    return request.args.get("profile") == "1" or request.headers.get("X-Profile") == "1"
+
+
+def start_request():
+    g.request_started = time.perf_counter()
+    g.profiler = None
+    if wants_profile():
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            g.profiler = profiler
+        except ValueError:
+            # Another thread's request is being profiled right now
+            pass
+
+
+def finish_request(response):
+    metrics.observe(
+        "http_request_duration_seconds",
+        time.perf_counter() - g.request_started,
+        route=route_label(),
+        method=request.method,
+        status=response.status_code,
+    )
+    if g.get("profiler") is not None:
+        return profile_response(g.profiler)
+    return response
+
+
+# The profile of this request in place of its reply, slowest calls first; with
+# PROFILE_DIR set the raw profile is also saved there (e.g. for snakeviz)
+def profile_response(profiler):
+    profiler.disable()
+    profile_dir = current_app.config.get("PROFILE_DIR")
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        profiler.dump_stats(os.path.join(profile_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{request.endpoint}.prof"))
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(PROFILE_LINES)
+    response = Response(output.getvalue(), mimetype="text/plain")
+    response.cache_control.no_store = True
+    return response
+
+
+# Jinja rendering is timed through Flask's template signals, so every
+# render_template call counts without changing the routes
+def start_render(sender, template, context, **extra):
+    g.setdefault("render_started", []).append(time.perf_counter())
+
+
+def finish_render(sender, template, context, **extra):
+    started = g.get("render_started")
+    if started:
+        metrics.observe("stage_seconds", time.perf_counter() - started.pop(), stage="render")
+
+
+# Load boards, their search index and trend files now instead of on their
+# first request. Under gunicorn with preload_app this runs once in the master,
+# and the workers share the parsed boards copy-on-write (see gunicorn.conf.py).
+def preload_boards():
+    for board_id, csv_path in CSV_PATHS.items():
+        if os.path.exists(csv_path):
+            dataset_cache.preload(board_id)
+
+
+def create_app(config=None):
+    app = Flask(__name__)
+    # Serve pages from the prerender.py build while they are current
+    app.config["SERVE_PREBUILT"] = True
+    # ?profile=1 / X-Profile: 1 return a cProfile report; off unless PROFILING=1
+    app.config["PROFILING"] = os.getenv("PROFILING") == "1"
+    app.config["PROFILE_DIR"] = os.getenv("PROFILE_DIR")
+    app.config.update(config or {})
+    app.register_blueprint(site)
+    app.before_request(start_request)
+    # after_request hooks run last-registered first: timing sees the finished response
+    app.after_request(finish_request)
+    # Routes without their own ETag get one from their body (see http_cache.py)
+    app.after_request(add_default_caching)
+    before_render_template.connect(start_render, app)
+    template_rendered.connect(finish_render, app)
+    return app
+
+
+app = create_app()
 
 
 if __name__ == "__main__":
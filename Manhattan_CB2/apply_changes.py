@@ -0,0 +1,97 @@
+import argparse
+import os
+
+import openai
+
+from board_data import CSV_PATHS, load_board_data, update_board_trends, update_search_index
+from change_feed import changes_path, read_runs, runs_after, touched_months, touched_urls
+from extract_votes import extract_board
+from pregenerate import RateLimiter, load_existing, pregenerate_board, write_generated
+
+# Batch job that brings everything derived from the CSVs up to date after a
+# scraper run, working only on what the run changed.
+#
+# Run from the repository root after the pipeline, e.g.
+#   python Manhattan_CB2/apply_changes.py [--llm] [board_id ...]
+# For each board it reads the runs in the change feed (change_feed.py) after
+# the last one it applied, then: updates the minutes store with only the
+# changed rows, the search index and term trends, the vote records of the
+# touched months, their summaries (with --llm or --api-base; otherwise
+# pregenerate.py picks them up on its next run) and their prebuilt pages. The last applied run of
+# each board is kept in Manhattan_CB2/generated/feed_cursors.json and only
+# moves on when every step succeeded, so a failed run is retried next time.
+
+CURSORS_PATH = "Manhattan_CB2/generated/feed_cursors.json"
+
+
+def apply_board(board_id, runs, args, limiter):
+    months = touched_months(runs)
+    print(
+        f"{board_id}: {len(runs)} new run(s), {len(touched_urls(runs))} documents "
+        f"in {len(months)} months changed"
+    )
+    board = load_board_data(CSV_PATHS[board_id])
+    added, removed = update_search_index(board_id, board)
+    print(f"{board_id}: search index +{added} -{removed}")
+    update_board_trends(board_id, board)
+    extract_board(board_id, use_llm=args.llm, months=months, limiter=limiter, retries=args.retries)
+    failed = 0
+    if args.llm:
+        failed = pregenerate_board(board_id, limiter, args.workers, args.retries, months=months)
+    return months, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply the scraper's change feed to the store, indexes and builds")
+    parser.add_argument("boards", nargs="*", help="board IDs (default: all boards)")
+    parser.add_argument("--llm", action="store_true", help="regenerate summaries and LLM votes of touched months")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent OpenAI calls")
+    parser.add_argument("--rate", type=float, default=1.0, help="max OpenAI calls per second")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--api-base", help="OpenAI-compatible endpoint, e.g. a local fake server (implies --llm)")
+    parser.add_argument("--skip-prerender", action="store_true", help="leave the static build alone")
+    args = parser.parse_args()
+
+    if args.api_base:
+        openai.api_base = args.api_base
+        args.llm = True
+
+    cursors = load_existing(CURSORS_PATH)
+    limiter = RateLimiter(args.rate)
+    applied = {}
+    touched = {}
+    failed = 0
+    for board_id in args.boards or list(CSV_PATHS):
+        csv_path = CSV_PATHS.get(board_id, "")
+        if not os.path.exists(csv_path):
+            print(f"{board_id}: no CSV, skipping")
+            continue
+        runs = runs_after(read_runs(changes_path(csv_path)), cursors.get(board_id, 0))
+        if not runs:
+            print(f"{board_id}: no new runs")
+            continue
+        try:
+            months, board_failed = apply_board(board_id, runs, args, limiter)
+        except Exception as e:
+            print(f"{board_id}: not applied ({e})")
+            failed += 1
+            continue
+        failed += board_failed
+        touched[board_id] = months
+        if not board_failed:
+            applied[board_id] = runs[-1]["seq"]
+
+    if touched and not args.skip_prerender:
+        # Pages are rendered through the Flask app, so it is only imported here
+        from prerender import build, static_pages
+
+        build(list(touched), static_pages.build_dir, touched)
+
+    if applied:
+        cursors.update(applied)
+        write_generated(CURSORS_PATH, cursors)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,45 @@
+import sys
+import timeit
+
+import pandas as pd
+
+from date_parsing import clean_date, parse_dates
+
+# Every board listing checked into the repo (run from the repository root)
+BENCH_CSVS = {
+    "manhattan-cb1": "Manhattan_CB1/Manhattan_CB1_with_content.csv",
+    "manhattan-cb2": "Manhattan_CB1/Manhattan_CB2.csv",
+    "manhattan-cb4": "Manhattan_CB4/Manhattan_CB4_with_content.csv",
+    "bronx-cb1": "Bronx_CB1/Bronx_CB1_with_content.csv",
+}
+
+
+def same_dates(expected, actual):
+    both_missing = expected.isna() & actual.isna()
+    return bool(((expected == actual) | both_missing).all())
+
+
+# Compare batched parsing against clean_date and time both on each board
+def run(csv_paths, repeat=5):
+    ok = True
+    for board_id, csv_path in csv_paths.items():
+        dates = pd.read_csv(csv_path, usecols=["Date"])["Date"]
+
+        expected = dates.apply(clean_date)
+        actual, fallbacks = parse_dates(dates)
+        identical = same_dates(expected, actual)
+        ok = ok and identical
+
+        per_row = min(timeit.repeat(lambda: dates.apply(clean_date), number=1, repeat=repeat))
+        batched = min(timeit.repeat(lambda: parse_dates(dates), number=1, repeat=repeat))
+
+        print(
+            f"{board_id}: {len(dates)} titles, {fallbacks} free-form fallbacks, "
+            f"clean_date {per_row * 1000:.1f} ms, parse_dates {batched * 1000:.1f} ms "
+            f"({per_row / batched:.1f}x), identical={identical}"
+        )
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run(BENCH_CSVS) else 1)
@@ -0,0 +1,226 @@
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+from fake_openai import start_fake_openai
+
+# Offline load test of the web app.
+#
+# Run from the repository root, e.g.
+#   python Manhattan_CB2/bench_load.py [--concurrency 1 4 16 64] [--latency 0.5]
+# Starts the fake OpenAI API (fake_openai.py) and the app under gunicorn with
+# its own empty LLM cache, metrics and static build, then sends a fixed,
+# seeded mix of requests to /, /<board_id>, and the month, summary and vote
+# pages at each concurrency level. Summary and vote pages are requested with
+# ?stream=0 so their latency includes the (fake) OpenAI calls. Reports
+# p50/p95/p99 per route and overall throughput; --json prints the results.
+
+BENCH_BOARDS = ["manhattan-cb1", "manhattan-cb4", "bronx-cb1"]
+CONCURRENCY_LEVELS = [1, 2, 4, 8, 16, 32, 64]
+ROUTES = ["landing", "board", "month", "summary", "vote"]
+PERCENTILES = (50, 95, 99)
+APP_PORT = 8961
+
+
+def get_json(url):
+    with urllib.request.urlopen(url, timeout=60) as response:
+        return json.loads(response.read())
+
+
+# Every (board, year, month name) the app has minutes for
+def available_months(base_url):
+    months = []
+    for board_id in BENCH_BOARDS:
+        for year in get_json(f"{base_url}/api/{board_id}/months")["years"]:
+            months.extend((board_id, year["year"], month["Month_Name"]) for month in year["months"])
+    return months
+
+
+# The same request mix every run: routes in turn, months drawn with a fixed seed
+def request_mix(months, count, seed=0):
+    rng = random.Random(seed)
+    mix = []
+    for i in range(count):
+        route = ROUTES[i % len(ROUTES)]
+        board_id, year, month = rng.choice(months)
+        path = {
+            "landing": "/",
+            "board": f"/{board_id}",
+            "month": f"/{board_id}/month/{year}/{month}",
+            "summary": f"/{board_id}/summary/{year}/{month}?stream=0",
+            "vote": f"/{board_id}/vote/{year}/{month}?stream=0",
+        }[route]
+        mix.append((route, path))
+    return mix
+
+
+def latency_stats(seconds):
+    if not seconds:
+        return {"requests": 0}
+    values = np.array(seconds) * 1000
+    stats = {"requests": len(seconds)}
+    for p in PERCENTILES:
+        stats[f"p{p}_ms"] = round(float(np.percentile(values, p)), 2)
+    stats["mean_ms"] = round(float(values.mean()), 2)
+    return stats
+
+
+# Send `mix` with `concurrency` threads, each on its own keep-alive connection
+def drive(port, mix, concurrency):
+    results = []
+    lock = threading.Lock()
+    pending = iter(mix)
+
+    def worker():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        while True:
+            with lock:
+                item = next(pending, None)
+            if item is None:
+                break
+            route, path = item
+            started = time.perf_counter()
+            try:
+                conn.request("GET", path, headers={"Accept-Encoding": "gzip"})
+                response = conn.getresponse()
+                body = response.read()
+                # The routes report most failures as a 200 with an error message
+                ok = response.status < 400 and not body.startswith(b"Error")
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+                ok = False
+            with lock:
+                results.append((route, ok, time.perf_counter() - started))
+        conn.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    level = {
+        "concurrency": concurrency,
+        "seconds": round(wall, 3),
+        "throughput_rps": round(len(results) / wall, 1),
+        "errors": sum(1 for _, ok, _ in results if not ok),
+        "overall": latency_stats([seconds for _, ok, seconds in results if ok]),
+        "routes": {},
+    }
+    for route in ROUTES:
+        level["routes"][route] = latency_stats([s for r, ok, s in results if r == route and ok])
+    return level
+
+
+def wait_until_up(base_url, process, seconds=180):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("gunicorn exited during startup")
+        try:
+            get_json(f"{base_url}/api/{BENCH_BOARDS[0]}/months")
+            return
+        except OSError:
+            time.sleep(0.5)
+    raise RuntimeError("gunicorn did not start")
+
+
+def run_load(concurrency_levels=CONCURRENCY_LEVELS, requests_per_level=250, latency=0.2, token_delay=0.0,
+             workers=2, llm_concurrency=16, seed=0):
+    fake = start_fake_openai(port=0, latency=latency, token_delay=token_delay)
+    scratch = tempfile.mkdtemp(prefix="bench-load-")
+    env = dict(
+        os.environ,
+        OPENAI_API_BASE=f"http://127.0.0.1:{fake.server_address[1]}/v1",
+        OPENAI_API_KEY="fake",
+        WEB_CONCURRENCY=str(workers),
+        LLM_CONCURRENCY=str(llm_concurrency),
+        LLM_CACHE_PATH=os.path.join(scratch, "llm_cache.sqlite3"),
+        METRICS_DIR=os.path.join(scratch, "metrics"),
+        STATIC_BUILD_DIR=os.path.join(scratch, "build"),
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{APP_PORT}", "app:app"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{APP_PORT}"
+    try:
+        wait_until_up(base_url, process)
+        months = available_months(base_url)
+        levels = []
+        for i, concurrency in enumerate(concurrency_levels):
+            # A new draw per level, so each level meets uncached summaries too
+            levels.append(drive(APP_PORT, request_mix(months, requests_per_level, seed + i), concurrency))
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait()
+        fake.shutdown()
+    return {
+        "settings": {
+            "requests_per_level": requests_per_level,
+            "openai_latency_s": latency,
+            "openai_token_delay_s": token_delay,
+            "workers": workers,
+            "threads_per_worker": int(os.getenv("GUNICORN_THREADS", "16")),
+            "llm_concurrency": llm_concurrency,
+            "seed": seed,
+        },
+        "levels": levels,
+    }
+
+
+def print_results(results):
+    for level in results["levels"]:
+        overall = level["overall"]
+        print(
+            f"concurrency {level['concurrency']:>2}: {level['throughput_rps']} req/s, "
+            f"p50 {overall.get('p50_ms')} ms, p95 {overall.get('p95_ms')} ms, p99 {overall.get('p99_ms')} ms, "
+            f"{level['errors']} errors"
+        )
+        for route, stats in level["routes"].items():
+            if stats["requests"]:
+                print(
+                    f"    {route:<8} p50 {stats['p50_ms']:>8} ms  p95 {stats['p95_ms']:>8} ms  "
+                    f"p99 {stats['p99_ms']:>8} ms  ({stats['requests']} requests)"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the app against a fake OpenAI API")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=CONCURRENCY_LEVELS)
+    parser.add_argument("--requests", type=int, default=250, help="requests per concurrency level")
+    parser.add_argument("--latency", type=float, default=0.2, help="fake OpenAI seconds per call")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="fake OpenAI seconds between streamed chunks")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers")
+    parser.add_argument("--llm-concurrency", type=int, default=16, help="OpenAI calls per worker at once")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = run_load(
+        args.concurrency, args.requests, args.latency, args.token_delay, args.workers, args.llm_concurrency, args.seed
+    )
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main()
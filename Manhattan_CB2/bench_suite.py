@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+import pandas as pd
+
+from bench_load import CONCURRENCY_LEVELS, print_results, run_load
+from board_registry import BOARDS
+
+# Benchmark suite for the app and the ingestion pipeline, offline.
+#
+# Run from the repository root:
+#   python Manhattan_CB2/bench_suite.py [--skip-load] [--output results.json]
+#   python Manhattan_CB2/bench_suite.py --compare old.json new.json
+# Micro-benchmarks: load_and_process_data per board (first import into an
+# empty store, then the usual already-imported load), clean_date and the
+# batched parse_dates over every listing date, term trend files (built from
+# scratch, rebuilt with every month reused) and a three-term query over every
+# board as /api/trends runs it, and PDF extraction on
+# Bronx_CB1_PDFs (in its own process, see scraper/bench_extract.py). Then the
+# load test from bench_load.py. Results go to
+# Manhattan_CB2/bench_results/<commit>.json unless --output says otherwise;
+# --compare prints how every timing changed between two result files.
+
+RESULTS_DIR = "Manhattan_CB2/bench_results"
+PDF_DIR = "Bronx_CB1/Bronx_CB1_PDFs"
+
+# Keys of the results that are "higher is better"; every other number that
+# isn't a count is a time, where lower is better
+HIGHER_IS_BETTER = ("throughput_rps", "pages_per_second")
+COUNT_KEYS = (
+    "requests", "errors", "concurrency", "pdfs", "failed", "pages", "ocr_pages", "chars", "rows", "dates", "months", "file_kb",
+)
+TREND_TERMS = ["liquor license", "street closure", "chelsea"]
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return commit, dirty
+
+
+def board_csvs():
+    return {board_id: board["csv"] for board_id, board in BOARDS.items() if os.path.exists(board["csv"])}
+
+
+# load_and_process_data against a scratch store: the first call imports the
+# CSV, the repeats read the store like every later app start
+def bench_load_and_process(repeat=5):
+    scratch = tempfile.mkdtemp(prefix="bench-suite-")
+    os.environ["MINUTES_STORE_PATH"] = os.path.join(scratch, "minutes.sqlite3")
+    os.environ["MINUTES_CORPUS_DIR"] = os.path.join(scratch, "corpus")
+    os.environ["SEARCH_INDEX_PATH"] = os.path.join(scratch, "search.sqlite3")
+    os.environ["TRENDS_DIR"] = os.path.join(scratch, "trends")
+    os.environ["LLM_CACHE_PATH"] = os.path.join(scratch, "llm_cache.sqlite3")
+    from board_data import load_and_process_data
+
+    results = {}
+    for board_id, csv_path in board_csvs().items():
+        started = time.perf_counter()
+        data = load_and_process_data(csv_path)
+        first = time.perf_counter() - started
+        warm = min(timeit.repeat(lambda: load_and_process_data(csv_path), number=1, repeat=repeat))
+        results[board_id] = {
+            "rows": len(data),
+            "import_ms": round(first * 1000, 2),
+            "warm_ms": round(warm * 1000, 2),
+        }
+    return results
+
+
+def bench_dates(repeat=5):
+    from date_parsing import clean_date, parse_dates
+
+    dates = pd.concat(
+        [pd.read_csv(csv_path, usecols=["Date"])["Date"] for csv_path in board_csvs().values()], ignore_index=True
+    )
+    per_row = min(timeit.repeat(lambda: dates.apply(clean_date), number=1, repeat=repeat))
+    batched = min(timeit.repeat(lambda: parse_dates(dates), number=1, repeat=repeat))
+    return {
+        "dates": len(dates),
+        "clean_date_ms": round(per_row * 1000, 2),
+        "clean_date_us_per_date": round(per_row * 1e6 / len(dates), 2),
+        "parse_dates_ms": round(batched * 1000, 2),
+    }
+
+
+# Runs after bench_load_and_process, in its scratch directory
+def bench_trends(repeat=20):
+    from app import dataset_cache
+    from board_data import TREND_PATHS
+    from term_trends import TermTrends, term_series, write_trends
+
+    results = {"boards": {}}
+    trends = {}
+    for board_id in board_csvs():
+        # Loaded with its on_load finished, so nothing else writes the trend file
+        board = dataset_cache.preload(board_id)
+        path = TREND_PATHS[board_id]
+        started = time.perf_counter()
+        write_trends(path, board)
+        built = time.perf_counter() - started
+        started = time.perf_counter()
+        write_trends(path, board, TermTrends(path))
+        reused = time.perf_counter() - started
+        trends[board_id] = TermTrends(path)
+        results["boards"][board_id] = {
+            "months": len(board.months),
+            "file_kb": os.path.getsize(path) // 1024,
+            "build_ms": round(built * 1000, 2),
+            "rebuild_unchanged_ms": round(reused * 1000, 2),
+        }
+    query = min(timeit.repeat(lambda: term_series(trends, TREND_TERMS), number=1, repeat=repeat))
+    results["query_ms"] = round(query * 1000, 3)
+    return results
+
+
+def bench_pdfs(pdf_dir=PDF_DIR, limit=None):
+    command = [sys.executable, "-m", "scraper.bench_extract", "--dir", pdf_dir]
+    if limit:
+        command += ["--limit", str(limit)]
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+# {"a.b.c": number} for every timing and rate in a result file
+def flatten(results, prefix=""):
+    flat = {}
+    if isinstance(results, dict):
+        items = results.items()
+    elif isinstance(results, list):
+        # Load levels are matched by concurrency, not by position
+        items = ((f"c{item.get('concurrency', i)}", item) for i, item in enumerate(results))
+    else:
+        return flat
+    for key, value in items:
+        path = f"{prefix}{key}"
+        if isinstance(value, (dict, list)):
+            flat.update(flatten(value, f"{path}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and key not in COUNT_KEYS:
+            flat[path] = value
+    return flat
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    old_flat = flatten(old.get("results", {}))
+    new_flat = flatten(new.get("results", {}))
+    for key in sorted(set(old_flat) & set(new_flat)):
+        before, after = old_flat[key], new_flat[key]
+        if not before:
+            continue
+        change = (after - before) / before
+        better = change > 0 if key.endswith(HIGHER_IS_BETTER) else change < 0
+        marker = "" if abs(change) < 0.05 else ("  better" if better else "  WORSE")
+        print(f"{key:<60} {before:>10} -> {after:<10} {change:+.1%}{marker}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite and write the results as JSON")
+    parser.add_argument("--output", help=f"result file (default: {RESULTS_DIR}/<commit>.json)")
+    parser.add_argument("--skip-load", action="store_true", help="micro-benchmarks only")
+    parser.add_argument("--skip-pdfs", action="store_true", help="leave out PDF extraction")
+    parser.add_argument("--pdf-limit", type=int, help="only the first N PDFs")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=CONCURRENCY_LEVELS)
+    parser.add_argument("--requests", type=int, default=250, help="requests per concurrency level")
+    parser.add_argument("--latency", type=float, default=0.2, help="fake OpenAI seconds per call")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    commit, dirty = git_commit()
+    results = {}
+    print("load_and_process_data...")
+    results["load_and_process_data"] = bench_load_and_process()
+    print("clean_date...")
+    results["dates"] = bench_dates()
+    print("term trends...")
+    results["trends"] = bench_trends()
+    if not args.skip_pdfs:
+        print(f"PDF extraction on {PDF_DIR}...")
+        results["pdf_extraction"] = bench_pdfs(PDF_DIR, args.pdf_limit)
+    if not args.skip_load:
+        print("load test...")
+        results["load"] = run_load(args.concurrency, args.requests, args.latency)
+        print_results(results["load"])
+
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps({key: value for key, value in results.items() if key != "load"}, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import re
+import sys
+import timeit
+
+import pandas as pd
+
+from vote_rules import parse_votes
+
+# Board listings checked into the repo (run from the repository root)
+BENCH_CSVS = {
+    "manhattan-cb1": "Manhattan_CB1/Manhattan_CB1_with_content.csv",
+    "manhattan-cb4": "Manhattan_CB4/Manhattan_CB4_with_content.csv",
+    "bronx-cb1": "Bronx_CB1/Bronx_CB1_with_content.csv",
+}
+
+# Hand-checked excerpts of the CSVs, one per vote shape, with the votes they
+# hold as (item, in favor, opposed, abstained, recused, outcome)
+SAMPLES = [
+    ("manhattan-cb1",
+     "comparable to the new area south of Pier 17. Adopted\nBOARD VOTE: 34 In Favor 1 Opposed 0 Abstained 0 Recused\n",
+     [(None, 34, 1, 0, 0, "passed")]),
+    ("manhattan-cb1",
+     "1. Chinatown Connections - Resolution\nVote was passed by 33 in favor, 4 opposed, 4 abstained and 0 recused\n"
+     "2. Changes to illegal cannabis enforcement in NYS budget proposal - Resolution\n"
+     "Vote was passed by 39 in favor, 0 opposed, 2 abstained and 0 recused\n",
+     [("1", 33, 4, 4, 0, "passed"), ("2", 39, 0, 2, 0, "passed")]),
+    ("manhattan-cb1",
+     "1. Request for loading zone parking rule changes – Resolution\n"
+     "Passed by a vote of 44 in favor, 0 opposed, 0 abstained and 0 recused\n",
+     [("1", 44, 0, 0, 0, "passed")]),
+    ("manhattan-cb1",
+     "Precinctas soonaspossible.\nPassed: 37 In Favor 0Opposed 0Abstained 0 Recused\n",
+     [(None, 37, 0, 0, 0, "passed")]),
+    ("manhattan-cb1",
+     "Liberty Street. A hand vote was taken with the following results: 24 In Favor; 0\n"
+     "Opposed; 0 Abstained; 1 Recused.\n",
+     [(None, 24, 0, 0, 1, "passed")]),
+    ("manhattan-cb1",
+     "4) Financial District Security Improvements Phase II – Resolution\n\uf0a7 Vote: 37-0-0\n",
+     [("4", 37, 0, 0, None, "passed")]),
+    ("manhattan-cb1",
+     "a class change food a liquor license – Resolution\nVoted by roll call of 38 in favor, 0 opposed, 0 abstained and 0 recused\n",
+     [(None, 38, 0, 0, 0, "passed")]),
+    ("manhattan-cb1",
+     "1. Lead Paint RighttoKnow Actlegislation-Resolution\nVote waspassedby 32infavor, 1opposed,0abstained and0recused\n",
+     [("1", 32, 1, 0, 0, "passed")]),
+    ("manhattan-cb1",
+     "(Cosmopolitan)– Negative Resolution Approved by a hand vote of 27 in favor,1 opposed,\n0 abstained and 0 recused",
+     [(None, 27, 1, 0, 0, "passed")]),
+    ("manhattan-cb4",
+     "Item 15: Letter to SLA re 686 9th Avenue - Verona Hospitality LLC. APPROVED\n"
+     "Item 16: Letter to SLA re 310 W 38th Street - KHP Midtown LLC APPROVED\n",
+     [("15", None, None, None, None, "passed"), ("16", None, None, None, None, "passed")]),
+    ("manhattan-cb4",
+     "Item 1: Letter to Mayor de Blasio re Funding for Summer Youth Passed with 49 In\n"
+     "Employment Program Items 1-9 and 11-21 were Favor and 1\nbundled Abstention\n",
+     [("1", 49, None, 1, None, "passed")]),
+    ("manhattan-cb4",
+     "Item 2: Letter to SLA re 273 8th Avenue - The Pho 2 Inc. Passed with 42\nIn Favor, 1\nOpposed\n",
+     [("2", 42, 1, None, None, "passed")]),
+    ("bronx-cb1",
+     "roll was called and there were 20-Yes and 1-Abstention. The item passed.",
+     [(None, 20, None, 1, None, "passed")]),
+    ("bronx-cb1",
+     "Vote taken was 2-\nyes, and 21-no, and 6-abstenstions. The Board voted not to provide",
+     [(None, 2, 21, 6, None, "failed")]),
+]
+
+
+def vote_tuple(record):
+    return (record["item"], record["yes"], record["no"], record["abstain"], record["recused"], record["outcome"])
+
+
+def load_texts(csv_path):
+    return pd.read_csv(csv_path, usecols=["Content"])["Content"].dropna().astype(str).tolist()
+
+
+# Sample excerpts must still be in the CSVs, so the checks follow the data
+def check_samples(texts):
+    expected = 0
+    correct = 0
+    extra = 0
+    missing = []
+    for board_id, excerpt, votes in SAMPLES:
+        if not any(excerpt in text for text in texts[board_id]):
+            missing.append(excerpt[:60])
+        found = [vote_tuple(record) for record in parse_votes(excerpt)]
+        expected += len(votes)
+        correct += sum(1 for vote in votes if vote in found)
+        extra += sum(1 for vote in found if vote not in votes)
+        for vote in votes:
+            if vote not in found:
+                print(f"  {board_id}: expected {vote}, got {found}")
+    for excerpt in missing:
+        print(f"  excerpt not in the CSVs: {excerpt!r}")
+    print(f"samples: {correct} of {expected} votes exact, {extra} unexpected")
+    return correct == expected and extra == 0 and not missing
+
+
+# Time the rules on each board and count how many tallies in the text they read
+def run(csv_paths, repeat=3):
+    texts = {board_id: load_texts(csv_path) for board_id, csv_path in csv_paths.items()}
+    tally_mention = re.compile(r"\d+\s*in\s*favou?r", re.IGNORECASE)
+    for board_id, board_texts in texts.items():
+        seconds = min(timeit.repeat(lambda: [parse_votes(text) for text in board_texts], number=1, repeat=repeat))
+        votes = [record for text in board_texts for record in parse_votes(text)]
+        counted = sum(1 for record in votes if record["yes"] is not None)
+        mentions = sum(len(tally_mention.findall(text)) for text in board_texts)
+        size = sum(len(text) for text in board_texts)
+        print(
+            f"{board_id}: {len(board_texts)} documents ({size / 1e6:.1f} MB) in {seconds * 1000:.0f} ms "
+            f"({seconds * 1000 / len(board_texts):.1f} ms each), {len(votes)} votes, "
+            f"{counted} with counts, {mentions} 'N in favor' in the text"
+        )
+    return check_samples(texts)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run(BENCH_CSVS) else 1)
@@ -0,0 +1,125 @@
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Memory used by gunicorn workers serving every month of every board.
+#
+# Run from the repository root, e.g.
+#   python Manhattan_CB2/bench_workers.py [--workers 1 4 16]
+# For each worker count the server is started twice, once reading minutes
+# text from the memory-mapped corpus and once from SQLite (MINUTES_CORPUS=0),
+# every month's text is requested through /api/<board>/month/..., and the
+# workers' RSS and PSS are read from /proc. PSS splits shared pages between
+# the processes mapping them, so its total is what the workers really cost.
+
+BENCH_BOARDS = ["manhattan-cb1", "manhattan-cb4", "bronx-cb1"]
+BENCH_PORT = 8951
+
+
+def get_json(url):
+    with urllib.request.urlopen(url, timeout=60) as response:
+        return json.loads(response.read())
+
+
+def fetch(url):
+    with urllib.request.urlopen(url, timeout=60) as response:
+        return len(response.read())
+
+
+def wait_until_up(base_url, process, seconds=120):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("gunicorn exited during startup")
+        try:
+            get_json(f"{base_url}/api/{BENCH_BOARDS[0]}/months")
+            return
+        except OSError:
+            time.sleep(0.5)
+    raise RuntimeError("gunicorn did not start")
+
+
+def worker_pids(master_pid):
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+# {"Rss": kB, "Pss": kB, ...} for one process
+def memory_kb(pid):
+    usage = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                usage[parts[0].rstrip(":")] = int(parts[1])
+    return usage
+
+
+def month_urls(base_url):
+    urls = []
+    for board_id in BENCH_BOARDS:
+        for year in get_json(f"{base_url}/api/{board_id}/months")["years"]:
+            for month in year["months"]:
+                urls.append(f"{base_url}/api/{board_id}/month/{year['year']}/{month['Month_Name']}")
+    return urls
+
+
+def run_server(workers, use_corpus, passes=2):
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), MINUTES_CORPUS="1" if use_corpus else "0")
+    base_url = f"http://127.0.0.1:{BENCH_PORT}"
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{BENCH_PORT}", "app:app"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_up(base_url, process)
+        urls = month_urls(base_url)
+        started = time.perf_counter()
+        # Enough concurrent requests that every worker serves some months
+        with ThreadPoolExecutor(max(8, workers * 4)) as pool:
+            served = sum(pool.map(fetch, urls * passes))
+        seconds = time.perf_counter() - started
+        usages = [memory_kb(pid) for pid in worker_pids(process.pid)]
+        return {
+            "workers": workers,
+            "source": "corpus" if use_corpus else "sqlite",
+            "requests": len(urls) * passes,
+            "mb_served": round(served / 1e6, 1),
+            "seconds": round(seconds, 2),
+            "rss_mb": round(sum(u["Rss"] for u in usages) / 1024, 1),
+            "pss_mb": round(sum(u["Pss"] for u in usages) / 1024, 1),
+            "private_mb": round(sum(u["Private_Clean"] + u["Private_Dirty"] for u in usages) / 1024, 1),
+        }
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure worker memory with and without the mmap corpus")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = [run_server(workers, use_corpus) for workers in args.workers for use_corpus in (True, False)]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results:
+        print(
+            f"{result['workers']:>2} workers, {result['source']:<6}: {result['requests']} requests "
+            f"({result['mb_served']} MB) in {result['seconds']}s; workers RSS {result['rss_mb']} MB, "
+            f"PSS {result['pss_mb']} MB, private {result['private_mb']} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import os
+
+from board_registry import BOARDS
+from date_parsing import parse_dates
+from llm_cache import LLMCache
+from metrics import Metrics
+from minutes_corpus import open_corpus
+from minutes_store import MINUTES_STORE_PATH, MinutesStore
+from month_index import BoardData
+from search_index import SearchIndex
+from term_trends import update_trends
+
+# Where each board's data lives and how it is loaded, shared by the web app
+# and the batch jobs (pregenerate.py, extract_votes.py, apply_changes.py, ...).
+# The batch jobs import this module rather than app.py, so they don't build a
+# Flask app, an OpenAI client or the templates' version hash just to read a
+# board. Paths are relative to the repository root.
+
+# Time per stage of loading a board; app.py serves these at /metrics (under
+# gunicorn the workers share them through METRICS_DIR)
+metrics = Metrics(os.getenv("METRICS_DIR"))
+metrics.histogram("stage_seconds", "Time spent in each stage of loading boards and serving pages")
+
+# Paths of the Community Board CSVs (see board_registry.py)
+CSV_PATHS = {board_id: board["csv"] for board_id, board in BOARDS.items()}
+
+# Summaries and votes generated offline by pregenerate.py
+GENERATED_PATHS = {
+    board_id: f"Manhattan_CB2/generated/{board_id}.json" for board_id in CSV_PATHS
+}
+
+# Structured vote records extracted by extract_votes.py
+VOTE_PATHS = {
+    board_id: f"Manhattan_CB2/generated/{board_id}-votes.json" for board_id in CSV_PATHS
+}
+
+# Minutes are read from a SQLite store kept in sync with the CSVs (see minutes_store.py)
+minutes_store = MinutesStore(os.getenv("MINUTES_STORE_PATH", MINUTES_STORE_PATH))
+BOARD_IDS_BY_CSV = {csv_path: board_id for board_id, csv_path in CSV_PATHS.items()}
+
+# Text is served from a memory-mapped file per board shared by all workers
+# (see minutes_corpus.py); MINUTES_CORPUS=0 reads it from SQLite instead
+USE_CORPUS = os.getenv("MINUTES_CORPUS", "1") != "0"
+CORPUS_DIR = os.getenv("MINUTES_CORPUS_DIR", "Manhattan_CB2/corpus")
+
+
+# Helper function to load and preprocess a board's metadata (the text stays in the store)
+def load_and_process_data(csv_path):
+    try:
+        board_id = BOARD_IDS_BY_CSV[csv_path]
+        with metrics.timer("stage_seconds", stage="load"):
+            minutes_store.import_csv(board_id, csv_path)
+            data = minutes_store.read_metadata(board_id)
+        # Batched date normalization; remember how many titles needed free-form parsing
+        with metrics.timer("stage_seconds", stage="dates"):
+            data['Date'], date_fallbacks = parse_dates(data['Date'])
+        data.attrs['date_fallbacks'] = date_fallbacks
+        data = data.dropna(subset=['Date'])
+        data['Year'] = data['Date'].dt.year
+        data['Month_Num'] = data['Date'].dt.month
+        data['Month_Name'] = data['Date'].dt.strftime('%B')
+        return data
+    except Exception as e:
+        raise ValueError(f"Error loading or processing data from {csv_path}: {e}")
+
+
+# Helper function to load a board and build its (year, month) index
+def load_board_data(csv_path):
+    data = load_and_process_data(csv_path)
+    fetch_contents = minutes_store.fetch_contents
+    if USE_CORPUS:
+        board_id = BOARD_IDS_BY_CSV[csv_path]
+        with metrics.timer("stage_seconds", stage="corpus"):
+            corpus = open_corpus(minutes_store, board_id, os.path.join(CORPUS_DIR, f"{board_id}.bin"))
+        fetch_contents = corpus.fetch_contents
+    with metrics.timer("stage_seconds", stage="index"):
+        return BoardData(data, fetch_contents)
+
+
+# Full-text index of every board's minutes, updated whenever a board is (re)loaded
+search_index = SearchIndex(os.getenv("SEARCH_INDEX_PATH", "Manhattan_CB2/search.sqlite3"))
+
+
+def update_search_index(board_id, board):
+    with metrics.timer("stage_seconds", stage="search_index"):
+        return search_index.update_board(board_id, board.data, board.fetch_contents)
+
+
+# Per-month term counts of every board for /api/trends (see term_trends.py),
+# rebuilt whenever a board is (re)loaded
+TRENDS_DIR = os.getenv("TRENDS_DIR", "Manhattan_CB2/trends")
+TREND_PATHS = {board_id: os.path.join(TRENDS_DIR, f"{board_id}.bin") for board_id in CSV_PATHS}
+
+
+def update_board_trends(board_id, board):
+    with metrics.timer("stage_seconds", stage="trends"):
+        return update_trends(TREND_PATHS[board_id], board)
+
+
+# OpenAI results persist on disk, keyed by board, prompt kind, model and prompt text
+llm_cache = LLMCache(os.getenv("LLM_CACHE_PATH", "Manhattan_CB2/llm_cache.sqlite3"))
@@ -0,0 +1,36 @@
+# Every board the site serves, keyed by the board ID used in URLs.
+#
+# Adding a board is one entry here (plus its scraper config in
+# scraper/boards.py). Nothing is read at startup: a board's minutes are loaded
+# the first time one of its pages is requested (see DatasetCache), and only
+# its metadata stays in memory; the text is read from the minutes store.
+
+BOARDS = {
+    "manhattan-cb1": {
+        "name": "Manhattan Community Board 1",
+        "csv": "Manhattan_CB1/Manhattan_CB1_with_content.csv",
+        "district": "101",
+        "template": "index_with_map.html",
+    },
+    "manhattan-cb2": {
+        "name": "Manhattan Community Board 2",
+        "csv": "Manhattan_CB2/Manhattan_CB2.csv",
+        "district": "102",
+        "template": "CB2_index_with_map.html",
+    },
+    "manhattan-cb4": {
+        "name": "Manhattan Community Board 4",
+        "csv": "Manhattan_CB4/Manhattan_CB4_with_content.csv",
+        "district": "104",
+        "template": "CB4_index_with_map.html",
+    },
+    "bronx-cb1": {
+        "name": "Bronx Community Board 1",
+        "csv": "Bronx_CB1/Bronx_CB1_with_content.csv",
+        "district": "201",
+        "template": "bronx_index_with_map.html",
+    },
+}
+
+# Board served by the old single-board URLs (/month/..., /summary/..., /vote/...)
+DEFAULT_BOARD = "manhattan-cb1"
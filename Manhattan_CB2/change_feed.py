@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from date_parsing import parse_dates
+
+# Reader for the change feed the scraper pipeline writes next to each board's
+# CSV (scraper/changes.py has the format). Consumers keep the CSV signature
+# (the sha256 of its bytes, see csv_signature) or feed sequence number they
+# last applied and ask for the runs after it; when the feed can't account for
+# every change since then (no feed yet, a hand-edited CSV), they get None and
+# rebuild from the CSV as before.
+
+
+def changes_path(csv_path):
+    root, _ = os.path.splitext(csv_path)
+    return f"{root}_changes.jsonl"
+
+
+def read_runs(path):
+    runs = []
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    runs.append(json.loads(line))
+                except ValueError:
+                    # A run cut off mid-write; the ones before it are still good
+                    continue
+    except OSError:
+        return []
+    return runs
+
+
+# Signature of a CSV's bytes, the same as scraper/changes.py file_signature
+def csv_signature(raw):
+    return hashlib.sha256(raw).hexdigest()
+
+
+# Feeds from before runs were chained by content carry [mtime_ns, size]
+# signatures; those never link up, so consumers rebuild from the CSV once
+def signature_of(value):
+    return value if isinstance(value, str) and value else None
+
+
+# Runs that took the CSV from `from_signature` to `to_signature`, oldest first,
+# or None if the feed doesn't link the two
+def runs_between(runs, from_signature, to_signature):
+    from_signature, to_signature = signature_of(from_signature), signature_of(to_signature)
+    if from_signature is None or to_signature is None:
+        return None
+    chain = []
+    target = to_signature
+    for run in reversed(runs):
+        if signature_of(run.get("csv_signature")) != target:
+            continue
+        chain.append(run)
+        target = signature_of(run.get("previous_signature"))
+        if target == from_signature:
+            return list(reversed(chain))
+        if target is None:
+            break
+    return None
+
+
+def runs_after(runs, seq):
+    return [run for run in runs if run.get("seq", 0) > seq]
+
+
+# URLs added, changed or removed by any of the runs
+def touched_urls(runs):
+    return {change["url"] for run in runs for change in run.get("changes", [])}
+
+
+# "YYYY-MM" keys (as in MonthRecords.key) of the months the runs touched,
+# including the month a row moved out of when its date was corrected
+def touched_months(runs):
+    dates = []
+    for run in runs:
+        for change in run.get("changes", []):
+            dates.append(change.get("date"))
+            if change.get("previous_date"):
+                dates.append(change["previous_date"])
+    if not dates:
+        return set()
+    parsed, _ = parse_dates(pd.Series(dates, dtype=object))
+    return {f"{date.year}-{date.month:02d}" for date in parsed.dropna()}
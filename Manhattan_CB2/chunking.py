@@ -0,0 +1,83 @@
+import re
+
+# Rough token estimate for English minutes (about 4 characters per token)
+CHARS_PER_TOKEN = 4
+
+# Default budget per chunk; leaves room for the prompt and reply in gpt-4's 8k context
+CHUNK_TOKENS = 3000
+
+# Lines where a new section of the minutes starts:
+# resolution blocks, committee headings, and short all-caps headings
+RESOLUTION_LINE = re.compile(
+    r"^\s*(?:WHEREAS|RESOLVED|NOW,?\s+THEREFORE|THEREFORE,?\s+BE\s+IT|BE\s+IT\s+(?:FURTHER\s+)?RESOLVED)\b"
+)
+COMMITTEE_LINE = re.compile(r"^\s*[A-Z][\w&,/'().\- ]{0,80}\bCommittee\b[\w&,/'().\- ]{0,40}:?\s*$")
+CAPS_HEADING_LINE = re.compile(r"^\s*[A-Z][A-Z0-9&,/'().:\- ]{4,80}$")
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def is_boundary(line):
+    if RESOLUTION_LINE.match(line) or COMMITTEE_LINE.match(line):
+        return True
+    # All-caps headings need at least two words to avoid splitting on acronyms
+    return bool(CAPS_HEADING_LINE.match(line)) and len(line.split()) >= 2
+
+
+# Split minutes into sections at structural boundaries
+def split_sections(text):
+    sections = []
+    current = []
+    for line in text.split("\n"):
+        if current and is_boundary(line):
+            sections.append("\n".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("\n".join(current))
+    return [section for section in sections if section.strip()]
+
+
+# Cut a section that is too big on its own at line boundaries (or hard-wrap a huge line)
+def split_oversized(section, max_chars):
+    pieces = []
+    current = ""
+    for line in section.split("\n"):
+        while len(line) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        if current and len(current) + 1 + len(line) > max_chars:
+            pieces.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+# Pack sections into chunks of at most max_tokens, cutting only between
+# sections unless a single section is larger than the budget. The same text
+# always produces the same chunks, so unchanged chunks hit the LLM cache.
+def chunk_minutes(text, max_tokens=CHUNK_TOKENS):
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks = []
+    current = []
+    current_len = 0
+    for section in split_sections(text):
+        pieces = [section] if len(section) <= max_chars else split_oversized(section, max_chars)
+        for piece in pieces:
+            if current and current_len + 1 + len(piece) > max_chars:
+                chunks.append("\n".join(current))
+                current = []
+                current_len = 0
+            current.append(piece)
+            current_len += len(piece) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
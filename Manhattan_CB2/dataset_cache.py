@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+
+
+# File signature used to notice when a board's CSV changes on disk
+def file_signature(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class _Entry:
+    def __init__(self, data, signature):
+        self.data = data
+        self.signature = signature
+        self.checked_at = time.monotonic()
+
+
+# Process-wide cache of parsed board datasets, keyed by board ID.
+#
+# The first request for a board loads it synchronously. After that, requests
+# always get the frame that is already in memory: when the CSV's mtime/size
+# changes, a background thread reparses it and swaps the new frame in, so no
+# request ever waits on a reload. Frames are shared between requests and must
+# be treated as read-only. `on_load(board_id, data)` runs after every load in a
+# background thread (one at a time per board), so derived structures are
+# refreshed off the request path; wait_loaded() waits for the first one, and
+# preload() runs it before returning.
+class DatasetCache:
+    def __init__(self, paths, loader, check_interval=2.0, on_load=None):
+        self.paths = paths
+        self.loader = loader
+        self.check_interval = check_interval
+        self.on_load = on_load
+        self._entries = {}
+        self._reloading = set()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._notify_locks = {}
+        self._first_notified = {}
+
+    def _path(self, board_id):
+        path = self.paths.get(board_id)
+        if not path:
+            raise KeyError(board_id)
+        return path
+
+    def get(self, board_id):
+        path = self._path(board_id)
+        entry = self._entries.get(board_id)
+        if entry is None:
+            return self._load_now(board_id, path).data
+
+        self._maybe_reload(board_id, path, entry)
+        return entry.data
+
+    # Load a board and run on_load in the calling thread, e.g. in the gunicorn
+    # master before forking, where no background thread may be left running
+    def preload(self, board_id):
+        entry = self._load_now(board_id, self._path(board_id), background=False)
+        self.wait_loaded(board_id)
+        return entry.data
+
+    # Block until on_load has run for the board's first load (started by get());
+    # False if it didn't finish within `timeout` seconds
+    def wait_loaded(self, board_id, timeout=None):
+        with self._lock:
+            done = self._first_notified.setdefault(board_id, threading.Event())
+        return done.wait(timeout)
+
+    def invalidate(self, board_id=None):
+        with self._lock:
+            if board_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(board_id, None)
+
+    # Blocking load for the first access; concurrent first requests share it
+    def _load_now(self, board_id, path, background=True):
+        with self._lock:
+            load_lock = self._load_locks.setdefault(board_id, threading.Lock())
+        with load_lock:
+            entry = self._entries.get(board_id)
+            if entry is not None:
+                return entry
+            signature = file_signature(path)
+            entry = _Entry(self.loader(path), signature)
+            self._entries[board_id] = entry
+        if background:
+            threading.Thread(target=self._notify, args=(board_id, entry.data, True), daemon=True).start()
+        else:
+            self._notify(board_id, entry.data, True)
+        return entry
+
+    def _notify(self, board_id, data, first=False):
+        with self._lock:
+            notify_lock = self._notify_locks.setdefault(board_id, threading.Lock())
+            done = self._first_notified.setdefault(board_id, threading.Event())
+        try:
+            if self.on_load is not None:
+                with notify_lock:
+                    self.on_load(board_id, data)
+        except Exception as e:
+            print(f"on_load failed for {board_id}: {e}")
+        finally:
+            if first:
+                done.set()
+
+    def _maybe_reload(self, board_id, path, entry):
+        now = time.monotonic()
+        if now - entry.checked_at < self.check_interval:
+            return
+        entry.checked_at = now
+
+        try:
+            signature = file_signature(path)
+        except OSError:
+            # File is being replaced or was removed; keep serving what we have
+            return
+        if signature == entry.signature:
+            return
+
+        with self._lock:
+            if board_id in self._reloading:
+                return
+            self._reloading.add(board_id)
+
+        thread = threading.Thread(
+            target=self._reload, args=(board_id, path, signature), daemon=True
+        )
+        thread.start()
+
+    def _reload(self, board_id, path, signature):
+        try:
+            data = self.loader(path)
+            # If the file changed again while we were parsing, the signature
+            # taken before the load won't match and the next check reloads
+            with self._lock:
+                self._entries[board_id] = _Entry(data, signature)
+            self._notify(board_id, data)
+        except Exception as e:
+            print(f"Background reload failed for {board_id}: {e}")
+        finally:
+            with self._lock:
+                self._reloading.discard(board_id)
@@ -0,0 +1,119 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+
+# Reference per-row parser for board titles (kept for comparison and benchmarks)
+def clean_date(date):
+    if isinstance(date, str):
+        # Handle "YYYY Month YYYY" format (e.g., "2024 January 2024")
+        if re.match(r"^\d{4}\s[A-Za-z]+\s\d{4}$", date):
+            return pd.to_datetime(f"{date.split()[0]} {date.split()[1]} 1", errors="coerce")
+
+        # Handle "Month YYYY Minutes" format (e.g., "January 2024 Minutes")
+        if re.match(r"^[A-Za-z]+\s\d{4}\sMinutes$", date):
+            month_year = " ".join(date.split()[:2])
+            return pd.to_datetime(month_year, format="%B %Y", errors="coerce")
+
+        # Handle "Month DD, YYYY Minutes" format (e.g., "June 20, 2024 Minutes")
+        if re.match(r"^[A-Za-z]+\s\d{1,2},\s\d{4}\sMinutes$", date):
+            # Extract the full date
+            full_date = " ".join(date.split()[:3]).replace(",", "")
+            return pd.to_datetime(full_date, format="%B %d %Y", errors="coerce")
+
+    # Fallback: Try to parse standard date formats
+    return pd.to_datetime(date, errors="coerce")
+
+
+# Title shapes handled in bulk, tried in order. Each entry is
+# (pattern, function building the string to parse from the groups, format,
+#  whether a failed format falls back to free-form parsing of that string).
+#
+# The first three mirror clean_date exactly. The last two are shapes that
+# clean_date sends to the free-form parser ("2021 January 26" on Manhattan
+# CB1, "October 2024" on CB2); parsing them with an explicit format gives the
+# same dates, and anything the format rejects still goes to the free-form path.
+DATE_SHAPES = [
+    (
+        re.compile(r"^(\d{4})\s([A-Za-z]+)\s\d{4}$"),
+        lambda g: g[0] + " " + g[1] + " 1",
+        "%Y %B %d",
+        True,
+    ),
+    (
+        re.compile(r"^([A-Za-z]+)\s(\d{4})\sMinutes$"),
+        lambda g: g[0] + " " + g[1],
+        "%B %Y",
+        False,
+    ),
+    (
+        re.compile(r"^([A-Za-z]+)\s(\d{1,2}),\s(\d{4})\sMinutes$"),
+        lambda g: g[0] + " " + g[1] + " " + g[2],
+        "%B %d %Y",
+        False,
+    ),
+    (
+        re.compile(r"^(\d{4})\s([A-Za-z]+)\s(\d{1,2})$"),
+        lambda g: g[0] + " " + g[1] + " " + g[2],
+        "%Y %B %d",
+        True,
+    ),
+    (
+        re.compile(r"^([A-Za-z]+)\s(\d{4})$"),
+        lambda g: g[0] + " " + g[1],
+        "%B %Y",
+        True,
+    ),
+]
+
+
+# Batched replacement for dates.apply(clean_date).
+#
+# Rows are classified with Series.str.extract, each shape is converted with a
+# single pd.to_datetime(format=...) call, and only rows that match no shape
+# (or that a format rejects where clean_date would have parsed free-form) are
+# parsed one by one. Returns the parsed dates and the number of titles that
+# needed the slow free-form path.
+def parse_dates(dates):
+    values = np.empty(len(dates), dtype=object)
+    values[:] = pd.NaT
+
+    is_str = dates.map(lambda d: isinstance(d, str)).to_numpy(dtype=bool)
+    remaining = is_str.copy()
+    text = dates.where(is_str, "").astype(str)
+
+    # Missing titles stay NaT; any other non-string value is parsed free-form
+    other = ~is_str & dates.notna().to_numpy()
+    slow_positions = list(np.flatnonzero(other))
+    slow_inputs = list(dates.to_numpy(dtype=object)[other])
+
+    for pattern, build, fmt, free_form_fallback in DATE_SHAPES:
+        if not remaining.any():
+            break
+        candidates = text[remaining]
+        groups = candidates.str.extract(pattern)
+        matched = groups[0].notna().to_numpy()
+        if not matched.any():
+            continue
+
+        positions = np.flatnonzero(remaining)[matched]
+        remaining[positions] = False
+
+        to_parse = build([groups[col][matched] for col in groups.columns])
+        parsed = pd.to_datetime(to_parse, format=fmt, errors="coerce")
+        values[positions] = parsed.tolist()
+
+        if free_form_fallback:
+            failed = parsed.isna().to_numpy()
+            slow_positions.extend(positions[failed])
+            slow_inputs.extend(to_parse[failed].tolist())
+
+    # Strings that match no known shape
+    slow_positions.extend(np.flatnonzero(remaining))
+    slow_inputs.extend(text[remaining].tolist())
+
+    for pos, raw in zip(slow_positions, slow_inputs):
+        values[pos] = pd.to_datetime(raw, errors="coerce")
+
+    return pd.Series(list(values), index=dates.index, name=dates.name), len(slow_positions)
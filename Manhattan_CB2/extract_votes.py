@@ -0,0 +1,84 @@
+import argparse
+import os
+import time
+
+import openai
+
+from board_data import CSV_PATHS, VOTE_PATHS, load_board_data
+from pregenerate import RateLimiter, cached_completion, load_existing, write_generated
+from prompts import VOTES_MODEL
+from vote_rules import month_votes
+
+# Batch job that extracts structured vote records for every month.
+#
+# Run from the repository root, e.g.
+#   python Manhattan_CB2/extract_votes.py [--llm] [board_id ...]
+# The rules in vote_rules.py handle the whole corpus in a few seconds. With
+# --llm, sections the rules found nothing in are sent to OpenAI (through the
+# LLM cache); without it they are only counted as "unparsed_sections".
+# Results go to Manhattan_CB2/generated/<board_id>-votes.json, keyed by month
+# with the content hash they were extracted from; unchanged months are kept.
+# `months` limits the pass to the months a scraper run touched (apply_changes.py).
+
+
+def extract_board(board_id, use_llm=False, force=False, months=None, limiter=None, retries=3):
+    board = load_board_data(CSV_PATHS[board_id])
+    path = VOTE_PATHS[board_id]
+    existing = load_existing(path)
+    complete = cached_completion(board_id, VOTES_MODEL, limiter or RateLimiter(1.0), retries)
+
+    extracted = {}
+    updated = 0
+    started = time.perf_counter()
+    for records in board.months.values():
+        entry = existing.get(records.key)
+        if months is not None and records.key not in months:
+            if entry:
+                extracted[records.key] = entry
+            continue
+        # Redo rules-only months once the LLM is allowed to fill their gaps
+        current = entry and entry.get("content_hash") == records.content_hash
+        if not force and current and not (use_llm and entry.get("unparsed_sections")):
+            extracted[records.key] = entry
+            continue
+        try:
+            votes = month_votes("\n\n".join(records.contents), complete if use_llm else None)
+        except openai.error.OpenAIError as e:
+            print(f"{board_id} {records.key}: OpenAI API error ({e}), keeping rules-only votes")
+            votes = month_votes("\n\n".join(records.contents))
+        extracted[records.key] = {"content_hash": records.content_hash, **votes}
+        updated += 1
+
+    if extracted != existing:
+        write_generated(path, extracted)
+    count = sum(len(entry["votes"]) for entry in extracted.values())
+    unparsed = sum(entry["unparsed_sections"] for entry in extracted.values())
+    print(
+        f"{board_id}: {updated} of {len(board.months)} months extracted in "
+        f"{time.perf_counter() - started:.2f}s, {count} votes, {unparsed} sections left for the LLM"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract structured vote records per month")
+    parser.add_argument("boards", nargs="*", help="board IDs (default: all boards)")
+    parser.add_argument("--llm", action="store_true", help="send sections the rules can't parse to OpenAI")
+    parser.add_argument("--force", action="store_true", help="re-extract unchanged months too")
+    parser.add_argument("--rate", type=float, default=1.0, help="max OpenAI calls per second")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--api-base", help="OpenAI-compatible endpoint, e.g. a local fake server")
+    args = parser.parse_args()
+
+    if args.api_base:
+        openai.api_base = args.api_base
+
+    limiter = RateLimiter(args.rate)
+    for board_id in args.boards or list(CSV_PATHS):
+        if not os.path.exists(CSV_PATHS.get(board_id, "")):
+            print(f"{board_id}: no CSV, skipping")
+            continue
+        extract_board(board_id, args.llm, args.force, limiter=limiter, retries=args.retries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-in for the OpenAI chat completions API, for benchmarks and
+# offline runs.
+#
+# Answers POST /v1/chat/completions like the real endpoint, streamed or not,
+# after `latency` seconds (plus `token_delay` between streamed chunks), with a
+# reply built from the prompt so different months get different summaries.
+# Point the app at it with OPENAI_API_BASE=http://127.0.0.1:<port>/v1 (or
+# --api-base for the batch scripts), e.g.
+#   python Manhattan_CB2/fake_openai.py --port 8765 --latency 0.5
+
+DEFAULT_PORT = 8765
+
+# Words of the prompt echoed back as the reply; each is streamed as one chunk
+REPLY_WORDS = 60
+
+
+def fake_reply(messages):
+    prompt = " ".join(str(message.get("content", "")) for message in messages)
+    words = prompt.split()[-REPLY_WORDS:] or ["No", "content."]
+    return "Summary: " + " ".join(words)
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    token_delay = 0.0
+
+    def do_POST(self):
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError:
+            self.send_json(400, {"error": {"message": "invalid JSON", "type": "invalid_request_error"}})
+            return
+        time.sleep(self.latency)
+        model = request.get("model", "gpt-4")
+        messages = request.get("messages", [])
+        reply = fake_reply(messages)
+        if request.get("stream"):
+            self.send_stream(model, reply)
+            return
+        prompt_tokens = sum(len(str(message.get("content", "")).split()) for message in messages)
+        self.send_json(200, {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(reply.split()),
+                "total_tokens": prompt_tokens + len(reply.split()),
+            },
+        })
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_stream(self, model, reply):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        words = reply.split(" ")
+        for i, word in enumerate(words):
+            if i and self.token_delay:
+                time.sleep(self.token_delay)
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}, "finish_reason": None}],
+            }
+            self.write_chunk(f"data: {json.dumps(chunk)}\n\n")
+        self.write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Port 0 picks a free port (see server.server_address)
+def make_server(port=DEFAULT_PORT, latency=0.0, token_delay=0.0):
+    handler = type("Handler", (FakeOpenAIHandler,), {"latency": latency, "token_delay": token_delay})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    return server
+
+
+# Start the fake in a background thread; returns the server (call shutdown() to stop it)
+def start_fake_openai(port=DEFAULT_PORT, latency=0.0, token_delay=0.0):
+    server = make_server(port, latency, token_delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake OpenAI chat completions API locally")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each reply starts")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="seconds between streamed chunks")
+    args = parser.parse_args()
+
+    server = make_server(args.port, args.latency, args.token_delay)
+    print(f"Fake OpenAI API on http://127.0.0.1:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import argparse
+import json
+import math
+
+# Simplification tolerance in degrees (~5 m) for a board's own district
+BOARD_TOLERANCE = 0.00005
+
+# Coarser tolerance (~50 m) for the all-districts overview on the landing page
+OVERVIEW_TOLERANCE = 0.0005
+
+# Decimal places kept after simplification (~1 m)
+COORD_PRECISION = 5
+
+# Smaller map payloads from the NYC community districts file.
+#
+# Rings are simplified with Douglas-Peucker and their coordinates rounded, then
+# split into one FeatureCollection per district plus a coarser overview of all
+# of them. Every simplified ring is checked against the original: no original
+# vertex may be further than tolerance + rounding error from the simplified
+# outline, and the build fails if one is.
+
+
+def point_segment_distance(point, start, end):
+    px, py = point
+    ax, ay = start
+    bx, by = end
+    dx, dy = bx - ax, by - ay
+    if dx == 0 and dy == 0:
+        return math.hypot(px - ax, py - ay)
+    t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / (dx * dx + dy * dy)))
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+# Indices of the points Douglas-Peucker keeps (iterative, so long rings can't
+# hit the recursion limit)
+def douglas_peucker(points, tolerance):
+    if len(points) < 3:
+        return list(range(len(points)))
+    keep = {0, len(points) - 1}
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        max_distance = -1.0
+        index = None
+        for i in range(first + 1, last):
+            distance = point_segment_distance(points[i], points[first], points[last])
+            if distance > max_distance:
+                max_distance = distance
+                index = i
+        if index is not None and max_distance > tolerance:
+            keep.add(index)
+            stack.append((first, index))
+            stack.append((index, last))
+    return sorted(keep)
+
+
+def quantize(point, precision):
+    return [round(point[0], precision), round(point[1], precision)]
+
+
+# Simplified, rounded copy of a closed ring; None if it collapses
+def simplify_ring(ring, tolerance, precision):
+    # A closed ring starts and ends on the same point, which Douglas-Peucker
+    # can't split on; anchor the far point as well
+    points = ring[:-1] if ring[0] == ring[-1] else ring
+    if len(points) < 3:
+        return None
+    far = max(range(len(points)), key=lambda i: math.hypot(points[i][0] - points[0][0], points[i][1] - points[0][1]))
+    halves = [points[: far + 1], points[far:] + [points[0]]]
+
+    simplified = []
+    for half in halves:
+        kept = [quantize(half[i], precision) for i in douglas_peucker(half, tolerance)]
+        simplified.extend(kept if not simplified else kept[1:])
+
+    # Drop points that rounding made identical
+    deduped = [simplified[0]]
+    for point in simplified[1:]:
+        if point != deduped[-1]:
+            deduped.append(point)
+    if deduped[-1] != deduped[0]:
+        deduped.append(deduped[0])
+    return deduped if len(deduped) >= 4 else None
+
+
+def simplify_geometry(geometry, tolerance, precision):
+    if geometry["type"] == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        return geometry
+
+    simplified = []
+    for polygon in polygons:
+        rings = [simplify_ring(ring, tolerance, precision) for ring in polygon]
+        # A polygon without its outer ring is dropped; collapsed holes just go
+        if rings and rings[0] is not None:
+            simplified.append([ring for ring in rings if ring is not None])
+
+    if geometry["type"] == "Polygon":
+        return {"type": "Polygon", "coordinates": simplified[0] if simplified else []}
+    return {"type": "MultiPolygon", "coordinates": simplified}
+
+
+def rings(geometry):
+    if geometry["type"] == "Polygon":
+        return list(geometry["coordinates"])
+    if geometry["type"] == "MultiPolygon":
+        return [ring for polygon in geometry["coordinates"] for ring in polygon]
+    return []
+
+
+# Largest distance from an original vertex to the nearest simplified edge.
+# Rings that collapsed entirely are skipped (they were smaller than the tolerance).
+def max_deviation(original, simplified):
+    simplified_rings = rings(simplified)
+    worst = 0.0
+    for ring in rings(original):
+        candidates = [
+            candidate for candidate in simplified_rings
+            if len(candidate) > 1 and bounding_boxes_overlap(ring, candidate)
+        ]
+        if not candidates:
+            continue
+        for point in ring:
+            nearest = min(
+                point_segment_distance(point, candidate[i], candidate[i + 1])
+                for candidate in candidates
+                for i in range(len(candidate) - 1)
+            )
+            worst = max(worst, nearest)
+    return worst
+
+
+def bounding_boxes_overlap(a, b):
+    ax = [p[0] for p in a]
+    ay = [p[1] for p in a]
+    bx = [p[0] for p in b]
+    by = [p[1] for p in b]
+    return min(ax) <= max(bx) and min(bx) <= max(ax) and min(ay) <= max(by) and min(by) <= max(ay)
+
+
+# Worst error simplification plus rounding may introduce
+def error_bound(tolerance, precision):
+    return tolerance + math.hypot(0.5, 0.5) * 10 ** -precision
+
+
+def simplified_feature(feature, tolerance, precision, check=True):
+    geometry = simplify_geometry(feature["geometry"], tolerance, precision)
+    if check:
+        deviation = max_deviation(feature["geometry"], geometry)
+        if deviation > error_bound(tolerance, precision):
+            raise ValueError(
+                f"District {feature['properties'].get('boro_cd')}: simplified outline is "
+                f"{deviation:.7f} degrees off (bound {error_bound(tolerance, precision):.7f})"
+            )
+    return {"type": "Feature", "properties": {"boro_cd": feature["properties"].get("boro_cd")}, "geometry": geometry}
+
+
+def feature_collection(features):
+    return json.dumps({"type": "FeatureCollection", "features": features}, separators=(",", ":"))
+
+
+# {"overview": json, boro_cd: json, ...} for the given district codes
+def district_payloads(geojson, districts, tolerance=BOARD_TOLERANCE,
+                      overview_tolerance=OVERVIEW_TOLERANCE, precision=COORD_PRECISION):
+    features = {feature["properties"].get("boro_cd"): feature for feature in geojson["features"]}
+    payloads = {
+        "overview": feature_collection([
+            simplified_feature(feature, overview_tolerance, precision, check=False)
+            for feature in geojson["features"]
+        ])
+    }
+    for code in districts:
+        if code in features:
+            payloads[code] = feature_collection([simplified_feature(features[code], tolerance, precision)])
+    return payloads
+
+
+# Size report: python Manhattan_CB2/geo_simplify.py [--tolerance ...]
+def main():
+    parser = argparse.ArgumentParser(description="Report simplified district payload sizes and errors")
+    parser.add_argument("--source", default="Manhattan_CB2/static/Community Districts.geojson")
+    parser.add_argument("--tolerance", type=float, default=BOARD_TOLERANCE)
+    parser.add_argument("--overview-tolerance", type=float, default=OVERVIEW_TOLERANCE)
+    parser.add_argument("--precision", type=int, default=COORD_PRECISION)
+    parser.add_argument("districts", nargs="*", default=["101", "102", "104", "201"])
+    args = parser.parse_args()
+
+    with open(args.source, "r") as f:
+        geojson = json.load(f)
+    full_size = len(json.dumps(geojson, separators=(",", ":")))
+    payloads = district_payloads(geojson, args.districts, args.tolerance, args.overview_tolerance, args.precision)
+    features = {feature["properties"].get("boro_cd"): feature for feature in geojson["features"]}
+
+    print(f"full file: {full_size} bytes")
+    for key, payload in payloads.items():
+        line = f"{key}: {len(payload)} bytes"
+        if key in features:
+            simplified = json.loads(payload)["features"][0]["geometry"]
+            original = features[key]["geometry"]
+            line += (
+                f", {sum(len(r) for r in rings(original))} -> {sum(len(r) for r in rings(simplified))} points"
+                f", max error {max_deviation(original, simplified):.7f}"
+                f" (bound {error_bound(args.tolerance, args.precision):.7f})"
+            )
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import gzip
+import hashlib
+
+from flask import g, request, make_response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this aren't worth compressing
+MIN_GZIP_BYTES = 1024
+
+
+def accepts_encoding(encoding):
+    return encoding in request.headers.get("Accept-Encoding", "").lower()
+
+
+def accepts_gzip():
+    return accepts_encoding("gzip")
+
+
+# Best encoding the client accepts out of the ones we have
+def pick_encoding(encodings):
+    return next((name for name in ("br", "gzip") if name in encodings and accepts_encoding(name)), None)
+
+
+# Every encoding of a body matches an If-None-Match for any of its tags
+def is_not_modified(etag, encodings=("gzip",)):
+    return any(request.if_none_match.contains(tag) for tag in [etag] + [f"{etag}-{name}" for name in encodings])
+
+
+# The tag out of those that the client's If-None-Match holds, so a 304 repeats
+# the ETag the client stored (a small body was sent without gzip and its tag)
+def matched_etag(etag, encodings=("gzip",)):
+    return next(
+        (tag for tag in [etag] + [f"{etag}-{name}" for name in encodings] if request.if_none_match.contains(tag)), etag
+    )
+
+
+def set_cache_headers(response, etag, max_age):
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if max_age == 0:
+        response.cache_control.no_cache = True
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+# Response whose body exists in several encodings; `read_body(encoding)`
+# returns the bytes for None (identity), "gzip" or "br"
+def encoded_response(read_body, etag, encodings, mimetype, max_age):
+    encoding = pick_encoding(encodings)
+    tag = f"{etag}-{encoding}" if encoding else etag
+    if is_not_modified(etag, encodings):
+        return set_cache_headers(make_response("", 304), tag, max_age)
+
+    response = make_response(read_body(encoding))
+    response.mimetype = mimetype
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return set_cache_headers(response, tag, max_age)
+
+
+# Response with a strong ETag (304 when the client already has it) and gzip
+# when the client accepts it. `etag` should change whenever the body would.
+# `body` may be a callable so nothing is rendered for a 304.
+def cached_response(body, etag, mimetype="text/html", max_age=0):
+    if is_not_modified(etag):
+        return set_cache_headers(make_response("", 304), matched_etag(etag), max_age)
+
+    if callable(body):
+        body = body()
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+
+    # Each encoding of the body gets its own strong ETag
+    use_gzip = accepts_gzip() and len(body) >= MIN_GZIP_BYTES
+    if use_gzip:
+        body = gzip.compress(body, compresslevel=6)
+
+    response = make_response(body)
+    response.mimetype = mimetype
+    if use_gzip:
+        response.headers["Content-Encoding"] = "gzip"
+    return set_cache_headers(response, f"{etag}-gzip" if use_gzip else etag, max_age)
+
+
+# Response for a file written ahead of time, with precompressed copies at
+# `path`.br / `path`.gz for the encodings listed
+def prebuilt_response(path, etag, encodings=(), mimetype="text/html", max_age=0):
+    suffixes = {None: "", "gzip": ".gz", "br": ".br"}
+
+    def read_body(encoding):
+        with open(path + suffixes[encoding], "rb") as f:
+            return f.read()
+
+    return encoded_response(read_body, etag, encodings, mimetype, max_age)
+
+
+# A body compressed once and kept in memory in every encoding we can produce
+class CompressedBody:
+    def __init__(self, body):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.etag = hashlib.sha256(body).hexdigest()[:20]
+        self.bodies = {None: body, "gzip": gzip.compress(body, compresslevel=9)}
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(body)
+
+    def response(self, mimetype, max_age=0):
+        encodings = [name for name in self.bodies if name]
+        return encoded_response(self.bodies.get, self.etag, encodings, mimetype, max_age)
+
+
+# after_request fallback for responses that didn't set their own ETag: tag the
+# body by its hash, answer If-None-Match with 304 and gzip larger bodies.
+# Responses to requests that set g.no_store (error replies), and responses
+# already marked no-store (/metrics, profiler reports), are left uncached.
+def add_default_caching(response):
+    if g.get("no_store"):
+        response.cache_control.no_store = True
+    if response.cache_control.no_store:
+        return response
+    if (
+        request.method != "GET"
+        or response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "ETag" in response.headers
+    ):
+        return response
+
+    body = response.get_data()
+    etag = hashlib.sha256(body).hexdigest()[:20]
+    use_gzip = accepts_gzip() and len(body) >= MIN_GZIP_BYTES
+    tag = f"{etag}-gzip" if use_gzip else etag
+    if is_not_modified(etag):
+        response.status_code = 304
+        response.set_data(b"")
+    elif use_gzip:
+        response.set_data(gzip.compress(body, compresslevel=6))
+        response.headers["Content-Encoding"] = "gzip"
+    return set_cache_headers(response, tag, 0)
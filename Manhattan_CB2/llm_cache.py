@@ -0,0 +1,125 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+
+# Content-addressed key for one LLM call
+def cache_key(board_id, kind, model, prompt):
+    payload = json.dumps([board_id, kind, model, prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Disk-backed cache for OpenAI results (summaries, vote extractions).
+#
+# Entries are keyed on a hash of (board, prompt kind, model, prompt text), so a
+# month's result is reused until its minutes (and therefore the prompt) change.
+# Old entries are dropped by TTL (optional) and by least-recent use once the
+# cache holds more than max_entries. Concurrent misses for the same key in this
+# process share one in-flight call.
+class LLMCache:
+    def __init__(self, path, max_entries=5000, ttl=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._inflight = {}
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    board_id TEXT,
+                    kind TEXT,
+                    model TEXT,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_lru ON llm_cache (last_used_at)")
+
+    # One short-lived connection per operation, so the cache is safe to share across threads
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE llm_cache SET last_used_at = ? WHERE key = ?", (now, key))
+            return value
+
+    def put(self, key, value, board_id=None, kind=None, model=None):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, board_id, kind, model, value, now, now),
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        if self.ttl is not None:
+            conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+        if self.max_entries is not None:
+            conn.execute(
+                """
+                DELETE FROM llm_cache WHERE key NOT IN (
+                    SELECT key FROM llm_cache ORDER BY last_used_at DESC LIMIT ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    # Return the cached result for this prompt, or run compute() once and store it.
+    # compute() should raise on failure so errors are never cached.
+    def get_or_compute(self, board_id, kind, model, prompt, compute):
+        key = cache_key(board_id, kind, model, prompt)
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            # The previous leader may have stored it between our lookup and taking the lead
+            value = self.get(key)
+            if value is None:
+                value = compute()
+                self.put(key, value, board_id, kind, model)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
@@ -0,0 +1,111 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import openai
+import requests
+
+# Chat API calls one app process makes at the same time
+LLM_CONCURRENCY = 4
+
+# Seconds a request waits for a free slot before giving up
+LLM_QUEUE_TIMEOUT = 10
+
+# (connect, read) timeouts in seconds; while streaming, the read timeout is the
+# longest gap allowed between two tokens
+LLM_TIMEOUT = (10, 60)
+
+# Shared chat API client for the web app.
+#
+# All calls go through one pooled requests session (keep-alive connections are
+# reused instead of a TLS handshake per call) and a semaphore, so at most
+# `concurrency` threads are ever waiting on OpenAI. Anything beyond that fails
+# fast with LLMBusy instead of queueing up and taking every worker thread with
+# it, which keeps ordinary pages responsive while summaries are generated.
+# Point openai.api_base at a local server to run against a fake endpoint.
+# With `metrics` (see metrics.py), call latency, token counts, errors and
+# rejected calls are counted per model.
+
+
+class LLMBusy(Exception):
+    pass
+
+
+class LLMClient:
+    def __init__(self, concurrency=LLM_CONCURRENCY, timeout=LLM_TIMEOUT, queue_timeout=LLM_QUEUE_TIMEOUT, metrics=None):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.metrics = metrics
+        self._slots = threading.BoundedSemaphore(concurrency)
+        if metrics is not None:
+            metrics.histogram("openai_request_seconds", "OpenAI chat call latency (streams: until the last token)")
+            metrics.histogram("openai_first_token_seconds", "Time from a streamed chat call to its first token")
+            metrics.counter("openai_tokens_total", "OpenAI tokens by type (streamed completions count one per chunk)")
+            metrics.counter("openai_errors_total", "Failed OpenAI chat calls by error type")
+            metrics.counter("openai_busy_total", "Chat calls rejected because every slot was taken")
+
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @contextmanager
+    def slot(self):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._count("openai_busy_total")
+            raise LLMBusy("Too many summaries are being generated right now, please try again shortly.")
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def _count(self, name, value=1, **labels):
+        if self.metrics is not None:
+            self.metrics.inc(name, value, **labels)
+
+    def _observe(self, name, seconds, **labels):
+        if self.metrics is not None:
+            self.metrics.observe(name, seconds, **labels)
+
+    def complete(self, model, messages):
+        with self.slot():
+            started = time.perf_counter()
+            try:
+                response = openai.ChatCompletion.create(
+                    model=model, messages=messages, request_timeout=self.timeout
+                )
+            except openai.error.OpenAIError as e:
+                self._count("openai_errors_total", model=model, error=type(e).__name__)
+                raise
+            self._observe("openai_request_seconds", time.perf_counter() - started, model=model, mode="complete")
+        usage = response.get("usage") or {}
+        for kind in ("prompt_tokens", "completion_tokens"):
+            if kind in usage:
+                self._count("openai_tokens_total", usage[kind], model=model, type=kind.split("_")[0])
+        return response.choices[0].message["content"]
+
+    # Yields the reply's text as it arrives. The slot is held until the reply
+    # ends or the caller stops iterating (e.g. the browser went away).
+    def stream(self, model, messages):
+        with self.slot():
+            started = time.perf_counter()
+            chunks_seen = 0
+            try:
+                chunks = openai.ChatCompletion.create(
+                    model=model, messages=messages, stream=True, request_timeout=self.timeout
+                )
+                for chunk in chunks:
+                    choices = chunk.get("choices") or []
+                    text = choices[0].get("delta", {}).get("content") if choices else None
+                    if text:
+                        if chunks_seen == 0:
+                            self._observe("openai_first_token_seconds", time.perf_counter() - started, model=model)
+                        chunks_seen += 1
+                        yield text
+            except openai.error.OpenAIError as e:
+                self._count("openai_errors_total", model=model, error=type(e).__name__)
+                raise
+            finally:
+                self._count("openai_tokens_total", chunks_seen, model=model, type="completion")
+            self._observe("openai_request_seconds", time.perf_counter() - started, model=model, mode="stream")
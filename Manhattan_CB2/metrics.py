@@ -0,0 +1,180 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the latency histogram buckets; LLM calls take far
+# longer than page renders, so the range runs from 1 ms to 2 minutes
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# Seconds between a worker's snapshots to its shared directory
+FLUSH_INTERVAL = 1.0
+
+# Counters and latency histograms in the Prometheus text format.
+#
+# Metrics are declared once with their help text; `inc()` and `observe()`
+# take label values as keyword arguments. Each process counts on its own, so
+# under gunicorn every worker also writes a snapshot of its numbers to
+# `shared_dir` (from a background thread, within FLUSH_INTERVAL seconds of a
+# change) and `render()` adds up the snapshots of all workers, including ones
+# that have since exited, which keeps the totals from going backwards when a
+# worker is replaced.
+
+
+def label_key(labels):
+    return json.dumps(sorted(labels.items()))
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(pairs, extra=()):
+    pairs = list(pairs) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in pairs) + "}"
+
+
+class Metrics:
+    def __init__(self, shared_dir=None, buckets=LATENCY_BUCKETS):
+        self.shared_dir = shared_dir
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._help = {}
+        self._types = {}
+        # {name: {label_key: value}} for counters and
+        # {name: {label_key: [bucket counts..., sum, count]}} for histograms
+        self._values = {}
+        self._changed = False
+        self._flusher = None
+        if shared_dir:
+            os.makedirs(shared_dir, exist_ok=True)
+        # A forked worker starts from zero (and without the parent's flusher
+        # thread); what the master counted before the fork, e.g. preloading
+        # boards, is in the master's own snapshot
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._values = {name: {} for name in self._values}
+        self._changed = False
+        self._flusher = None
+
+    def counter(self, name, help_text):
+        self._declare(name, "counter", help_text)
+
+    def histogram(self, name, help_text):
+        self._declare(name, "histogram", help_text)
+
+    def _declare(self, name, kind, help_text):
+        self._help[name] = help_text
+        self._types[name] = kind
+        self._values.setdefault(name, {})
+
+    def inc(self, name, value=1, **labels):
+        key = label_key(labels)
+        with self._lock:
+            series = self._values[name]
+            series[key] = series.get(key, 0) + value
+            self._mark_changed()
+
+    def observe(self, name, seconds, **labels):
+        key = label_key(labels)
+        with self._lock:
+            series = self._values[name]
+            counts = series.get(key)
+            if counts is None:
+                counts = series[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[i] += 1
+                    break
+            counts[-2] += seconds
+            counts[-1] += 1
+            self._mark_changed()
+
+    # Called with the lock held
+    def _mark_changed(self):
+        self._changed = True
+        if self.shared_dir and self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(FLUSH_INTERVAL)
+            if self._changed:
+                try:
+                    self.flush()
+                except OSError as e:
+                    print(f"Writing metrics to {self.shared_dir} failed: {e}")
+
+    # Time the block into a histogram
+    @contextmanager
+    def timer(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def snapshot(self):
+        with self._lock:
+            self._changed = False
+            return json.loads(json.dumps(self._values))
+
+    # Write this process's numbers for the other workers' /metrics to read
+    def flush(self):
+        if not self.shared_dir:
+            return
+        path = os.path.join(self.shared_dir, f"{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    # This process's numbers plus every other worker's latest snapshot
+    def collect(self):
+        if not self.shared_dir:
+            return self.snapshot()
+        self.flush()
+        totals = {name: {} for name in self._types}
+        for filename in os.listdir(self.shared_dir):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.shared_dir, filename)) as f:
+                    values = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, series in values.items():
+                if name not in totals:
+                    continue
+                for key, value in series.items():
+                    if isinstance(value, list):
+                        current = totals[name].get(key) or [0] * len(value)
+                        totals[name][key] = [a + b for a, b in zip(current, value)]
+                    else:
+                        totals[name][key] = totals[name].get(key, 0) + value
+        return totals
+
+    def render(self):
+        lines = []
+        for name, series in self.collect().items():
+            lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} {self._types[name]}")
+            for key, value in sorted(series.items()):
+                labels = json.loads(key)
+                if self._types[name] == "counter":
+                    lines.append(f"{name}{format_labels(labels)} {value}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets, value):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{format_labels(labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{name}_bucket{format_labels(labels, [('le', '+Inf')])} {value[-1]}")
+                lines.append(f"{name}_sum{format_labels(labels)} {value[-2]}")
+                lines.append(f"{name}_count{format_labels(labels)} {value[-1]}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,102 @@
+import mmap
+import os
+import struct
+
+import numpy as np
+
+# File layout: header, then one (id, offset, length) int64 row per document
+# sorted by id, then the UTF-8 text of every document back to back
+MAGIC = b"MINCORP2"
+HEADER = struct.Struct("<8sQ32s")
+
+# Stands in for the rows signature of a corpus written without one
+NO_SIGNATURE = bytes(32)
+
+# Read-only, memory-mapped copy of one board's minutes text.
+#
+# Every gunicorn worker maps the same file, so the text lives once in the OS
+# page cache no matter how many workers there are, instead of once per worker
+# (or per SQLite connection cache). A document is a slice of the map: `view()`
+# returns it without copying; `fetch_contents()` decodes it for templates.
+# The file is rebuilt from the minutes store whenever the board's rows or
+# their IDs change (see minutes_store.rows_signature), and replaced atomically, so workers still mapping the old file keep
+# a consistent copy until they reload the board.
+
+
+# Write (id, text) pairs, given in ascending id order, to a new corpus file
+def write_corpus(path, documents, signature):
+    ids = []
+    offsets = []
+    lengths = []
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    # Text goes to a scratch file first; the table size is only known at the end
+    blob_path = f"{path}.{os.getpid()}.blob"
+    with open(blob_path, "wb") as blob:
+        offset = 0
+        for doc_id, content in documents:
+            if ids and doc_id <= ids[-1]:
+                raise ValueError("corpus documents must be in ascending id order")
+            data = content.encode("utf-8")
+            ids.append(doc_id)
+            offsets.append(offset)
+            lengths.append(len(data))
+            blob.write(data)
+            offset += len(data)
+
+    table = np.array([ids, offsets, lengths], dtype="<i8").T.copy() if ids else np.zeros((0, 3), dtype="<i8")
+    with open(tmp_path, "wb") as f, open(blob_path, "rb") as blob:
+        f.write(HEADER.pack(MAGIC, len(ids), bytes.fromhex(signature) if signature else NO_SIGNATURE))
+        f.write(table.tobytes())
+        while True:
+            chunk = blob.read(1 << 20)
+            if not chunk:
+                break
+            f.write(chunk)
+    os.remove(blob_path)
+    os.replace(tmp_path, path)
+
+
+class MinutesCorpus:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, signature = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a minutes corpus")
+        # The store's rows_signature() when this was written
+        self.signature = None if signature == NO_SIGNATURE else signature.hex()
+        # Zero-copy view of the table inside the map
+        self._table = np.frombuffer(self._map, dtype="<i8", count=count * 3, offset=HEADER.size).reshape(count, 3)
+        self._text_start = HEADER.size + count * 3 * 8
+        self._view = memoryview(self._map)
+
+    def __len__(self):
+        return len(self._table)
+
+    # Memoryview of one document's UTF-8 bytes (empty if unknown)
+    def view(self, doc_id):
+        row = np.searchsorted(self._table[:, 0], int(doc_id))
+        if row >= len(self._table) or self._table[row, 0] != int(doc_id):
+            return self._view[0:0]
+        start = self._text_start + int(self._table[row, 1])
+        return self._view[start:start + int(self._table[row, 2])]
+
+    # Text for the given minutes IDs, in the same order (same as MinutesStore.fetch_contents)
+    def fetch_contents(self, ids):
+        return [str(self.view(doc_id), "utf-8") for doc_id in ids]
+
+
+# The board's corpus file, rebuilt from the store if it's missing or doesn't match its rows
+def open_corpus(store, board_id, path):
+    signature = store.rows_signature(board_id)
+    try:
+        corpus = MinutesCorpus(path)
+        if corpus.signature == signature:
+            return corpus
+    except (OSError, ValueError):
+        pass
+    write_corpus(path, store.iter_contents(board_id), signature)
+    return MinutesCorpus(path)
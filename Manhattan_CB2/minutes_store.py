@@ -0,0 +1,303 @@
+import argparse
+import hashlib
+import io
+import os
+import sqlite3
+from contextlib import contextmanager
+
+import pandas as pd
+
+from board_registry import BOARDS
+from change_feed import changes_path, csv_signature, read_runs, runs_between, touched_urls
+from dataset_cache import file_signature
+from month_index import BACK_MARKER
+
+# Default location of the store, relative to the repository root
+MINUTES_STORE_PATH = "Manhattan_CB2/minutes.sqlite3"
+
+# Bump when the schema changes; the store is rebuilt from the CSVs
+SCHEMA_VERSION = 4
+
+# Characters of the first line kept as a preview on board index pages
+PREVIEW_CHARS = 160
+
+# SQLite store for the scraped minutes.
+#
+# Listing metadata (title, URL, content hash, length, preview) and the extracted PDF
+# text live in separate tables, so rendering a board's index reads only the
+# small metadata rows and a month's text is fetched by primary key when it is
+# actually shown. Each board's rows are imported from its *_with_content.csv;
+# the import is skipped while the CSV's mtime/size match what was imported,
+# or when its sha256 does (a checkout or copy only moves the mtime). When the
+# scraper's change feed (change_feed.py), which is chained by the same sha256,
+# covers every run since the last import, only the rows it lists are rewritten.
+
+
+def content_hash(content):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+# First non-empty line of the minutes, skipping the site navigation
+def content_preview(content):
+    if BACK_MARKER in content:
+        content = content.split(BACK_MARKER)[-1]
+    for line in content.split("\n"):
+        line = line.strip()
+        if line:
+            return line[:PREVIEW_CHARS]
+    return ""
+
+
+# (position, date, URL, text) for each row of a board CSV
+def csv_rows(data):
+    rows = []
+    for position, (date, url, content) in enumerate(
+        zip(data["Date"].tolist(), data["URL"].tolist(), data["Content"].tolist())
+    ):
+        content = content if isinstance(content, str) else ""
+        date = date if isinstance(date, str) else None
+        url = url if isinstance(url, str) else None
+        rows.append((position, date, url, content))
+    return rows
+
+
+def insert_row(conn, board_id, position, date, url, content):
+    cursor = conn.execute(
+        "INSERT INTO minutes (board_id, position, date, url, content_hash, content_length, preview) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (board_id, position, date, url, content_hash(content), len(content), content_preview(content)),
+    )
+    conn.execute("INSERT INTO minutes_content (id, content) VALUES (?, ?)", (cursor.lastrowid, content))
+
+
+def delete_row(conn, doc_id):
+    conn.execute("DELETE FROM minutes_content WHERE id = ?", (doc_id,))
+    conn.execute("DELETE FROM minutes WHERE id = ?", (doc_id,))
+
+
+# Hash of a board's (id, content hash) rows. It changes whenever rows get new
+# IDs, even when the CSV didn't (a forced re-import, a rebuild after a schema
+# change), so copies keyed by ID such as the corpus file know to rebuild.
+def rows_signature(conn, board_id):
+    digest = hashlib.sha256()
+    for doc_id, row_hash in conn.execute(
+        "SELECT id, content_hash FROM minutes WHERE board_id = ? ORDER BY id", (board_id,)
+    ):
+        digest.update(f"{doc_id}:{row_hash}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+# `signature` is the CSV's sha256 (see change_feed.csv_signature), `stat` its
+# (mtime_ns, size) when it was read
+def set_source(conn, board_id, source_path, signature, stat=None):
+    mtime_ns, size = stat if stat else (None, None)
+    conn.execute(
+        "INSERT OR REPLACE INTO boards VALUES (?, ?, ?, ?, ?, ?)",
+        (board_id, source_path, mtime_ns, size, signature, rows_signature(conn, board_id)),
+    )
+
+
+class MinutesStore:
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                conn.executescript(
+                    """
+                    DROP TABLE IF EXISTS boards;
+                    DROP TABLE IF EXISTS minutes;
+                    DROP TABLE IF EXISTS minutes_content;
+                    """
+                )
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS boards (
+                    board_id TEXT PRIMARY KEY,
+                    source_path TEXT,
+                    source_mtime_ns INTEGER,
+                    source_size INTEGER,
+                    source_sha256 TEXT,
+                    rows_sha256 TEXT
+                );
+                -- AUTOINCREMENT: IDs are never reused, so a worker still holding
+                -- old metadata can't fetch another row's text
+                CREATE TABLE IF NOT EXISTS minutes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    board_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    date TEXT,
+                    url TEXT,
+                    content_hash TEXT NOT NULL,
+                    content_length INTEGER NOT NULL,
+                    preview TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS minutes_board ON minutes (board_id, position);
+                CREATE TABLE IF NOT EXISTS minutes_content (
+                    id INTEGER PRIMARY KEY,
+                    content TEXT NOT NULL
+                );
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # sha256 of the CSV the board was last imported from, or None
+    def imported_signature(self, board_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT source_sha256 FROM boards WHERE board_id = ?", (board_id,)).fetchone()
+        return row[0] if row else None
+
+    # rows_signature() of the board as last imported, or None
+    def rows_signature(self, board_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT rows_sha256 FROM boards WHERE board_id = ?", (board_id,)).fetchone()
+        return row[0] if row else None
+
+    # (mtime_ns, size) of that CSV when it was last checked, or None
+    def imported_stat(self, board_id):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT source_mtime_ns, source_size FROM boards WHERE board_id = ?", (board_id,)
+            ).fetchone()
+        return tuple(row) if row and row[0] is not None else None
+
+    def _update_stat(self, board_id, stat):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE boards SET source_mtime_ns = ?, source_size = ? WHERE board_id = ?", (*stat, board_id)
+            )
+
+    # Replace a board's rows with the rows of its CSV (one transaction)
+    def write_board(self, board_id, data, source_path=None, signature=None, stat=None):
+        rows = csv_rows(data)
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "DELETE FROM minutes_content WHERE id IN (SELECT id FROM minutes WHERE board_id = ?)",
+                (board_id,),
+            )
+            conn.execute("DELETE FROM minutes WHERE board_id = ?", (board_id,))
+            for position, date, url, content in rows:
+                insert_row(conn, board_id, position, date, url, content)
+            set_source(conn, board_id, source_path, signature, stat)
+        return len(rows)
+
+    # Bring a board in line with its CSV rewriting only the rows whose URL is in
+    # `urls` (plus any the store is missing); the others just get their new
+    # position and date. Returns the number of rows rewritten, or None when
+    # URLs aren't unique and the board has to be written in full.
+    def apply_changes(self, board_id, data, urls, source_path=None, signature=None, stat=None):
+        rows = csv_rows(data)
+        if len({url for _, _, url, _ in rows}) != len(rows):
+            return None
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            existing = conn.execute("SELECT url, id FROM minutes WHERE board_id = ?", (board_id,)).fetchall()
+            ids = dict(existing)
+            if len(ids) != len(existing):
+                return None
+
+            listed = set()
+            rewritten = 0
+            for position, date, url, content in rows:
+                listed.add(url)
+                if url in ids and url not in urls:
+                    conn.execute("UPDATE minutes SET position = ?, date = ? WHERE id = ?", (position, date, ids[url]))
+                    continue
+                # New text gets a new ID (IDs are never reused, see the schema)
+                if url in ids:
+                    delete_row(conn, ids[url])
+                insert_row(conn, board_id, position, date, url, content)
+                rewritten += 1
+            for url, doc_id in ids.items():
+                if url not in listed:
+                    delete_row(conn, doc_id)
+                    rewritten += 1
+            set_source(conn, board_id, source_path, signature, stat)
+        return rewritten
+
+    # Import a board's CSV unless the store already has this version of it;
+    # through the change feed when it covers the runs since the last import
+    def import_csv(self, board_id, csv_path, force=False):
+        # Taken before reading, so a write after it shows up as a change next time
+        stat = file_signature(csv_path)
+        if not force and self.imported_stat(board_id) == stat:
+            return False
+        with open(csv_path, "rb") as f:
+            raw = f.read()
+        signature = csv_signature(raw)
+        imported = self.imported_signature(board_id)
+        if not force and imported == signature:
+            self._update_stat(board_id, stat)
+            return False
+        data = pd.read_csv(io.BytesIO(raw))
+        runs = None if force or imported is None else runs_between(read_runs(changes_path(csv_path)), imported, signature)
+        if runs is not None and self.apply_changes(board_id, data, touched_urls(runs), csv_path, signature, stat) is not None:
+            return True
+        self.write_board(board_id, data, csv_path, signature, stat)
+        return True
+
+    # Everything except the text, in CSV order; column names match the CSVs
+    def read_metadata(self, board_id):
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                """
+                SELECT id, date AS Date, url AS URL, content_hash, content_length, preview
+                FROM minutes WHERE board_id = ? ORDER BY position
+                """,
+                conn,
+                params=(board_id,),
+            )
+
+    # Text for the given minutes IDs, in the same order
+    def fetch_contents(self, ids):
+        if not ids:
+            return []
+        with self._connect() as conn:
+            found = dict(
+                conn.execute(
+                    f"SELECT id, content FROM minutes_content WHERE id IN ({', '.join('?' for _ in ids)})",
+                    [int(i) for i in ids],
+                )
+            )
+        return [found.get(int(i), "") for i in ids]
+
+    # (id, text) for every row of a board, in id order, without holding them all
+    def iter_contents(self, board_id):
+        with self._connect() as conn:
+            yield from conn.execute(
+                """
+                SELECT c.id, c.content FROM minutes_content c JOIN minutes m ON m.id = c.id
+                WHERE m.board_id = ? ORDER BY c.id
+                """,
+                (board_id,),
+            )
+
+
+# Migration tool: python Manhattan_CB2/minutes_store.py [board_id ...] [--force]
+def main():
+    parser = argparse.ArgumentParser(description="Import board CSVs into the minutes store")
+    parser.add_argument("boards", nargs="*", help="board IDs (default: all boards)")
+    parser.add_argument("--force", action="store_true", help="re-import even if the CSV is unchanged")
+    args = parser.parse_args()
+
+    store = MinutesStore(os.getenv("MINUTES_STORE_PATH", MINUTES_STORE_PATH))
+    for board_id in args.boards or list(BOARDS):
+        csv_path = BOARDS[board_id]["csv"]
+        if not os.path.exists(csv_path):
+            print(f"{board_id}: {csv_path} not found, skipping")
+            continue
+        imported = store.import_csv(board_id, csv_path, force=args.force)
+        print(f"{board_id}: {'imported' if imported else 'unchanged'}")
+
+
+if __name__ == "__main__":
+    main()
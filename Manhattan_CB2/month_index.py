@@ -0,0 +1,109 @@
+import calendar
+import hashlib
+
+# Marker that separates the site navigation from the minutes in scraped pages
+BACK_MARKER = "Back to Previous Page"
+
+MONTH_NUMBERS = {name.lower(): num for num, name in enumerate(calendar.month_name) if name}
+
+
+# Normalize a month name from a URL ("January", "january") to its number
+def month_number(month):
+    return MONTH_NUMBERS.get(str(month).strip().lower())
+
+
+# Everything the month/summary/vote routes need for one (year, month).
+# The text itself is fetched from the minutes store when it is used.
+class MonthRecords:
+    def __init__(self, year, month, rows, ids, row_hashes, urls, lengths, previews, fetch_contents):
+        self.year = year
+        self.month = month
+        self.month_name = calendar.month_name[month]
+        self.key = f"{year}-{month:02d}"
+        self.rows = rows
+        self.ids = ids
+        self.urls = urls
+        self.content_length = sum(lengths)
+        self.preview = next((preview for preview in previews if preview), "")
+        self._fetch_contents = fetch_contents
+        # Changes whenever the month's minutes change; used to reuse generated results
+        self.content_hash = hashlib.sha256("\x00".join(row_hashes).encode("utf-8")).hexdigest()
+
+    # Lightweight entry for board index pages and the JSON index
+    def summary(self):
+        return {
+            "Month_Name": self.month_name,
+            "month": self.month,
+            "documents": len(self.ids),
+            "content_length": self.content_length,
+            "preview": self.preview,
+        }
+
+    @property
+    def contents(self):
+        return self._fetch_contents(self.ids)
+
+    @property
+    def stripped(self):
+        return [content.strip() for content in self.contents]
+
+    # Keep only the part after the navigation marker for display
+    @property
+    def page_contents(self):
+        return [
+            content.split(BACK_MARKER)[-1].strip() if BACK_MARKER in content else content
+            for content in self.stripped
+        ]
+
+
+# A board's processed metadata frame plus its (year, month number) index
+class BoardData:
+    def __init__(self, data, fetch_contents):
+        self.data = data
+        self.fetch_contents = fetch_contents
+        self.date_fallbacks = data.attrs.get('date_fallbacks', 0)
+        self.months = build_month_index(data, fetch_contents)
+        # Changes whenever any month changes; used for ETags
+        self.version = hashlib.sha256(
+            "\x00".join(f"{key}:{records.content_hash}" for key, records in sorted(self.months.items())).encode("utf-8")
+        ).hexdigest()
+
+    # {year: [month summaries]} with the newest year first and months in order
+    def grouped_months(self):
+        grouped = {}
+        for year, month in sorted(self.months, key=lambda key: (-key[0], key[1])):
+            grouped.setdefault(year, []).append(self.months[(year, month)].summary())
+        return grouped
+
+    # Records of a month, or None for an unknown month or a year that isn't a number
+    def lookup(self, year, month):
+        num = month_number(month)
+        if num is None or not str(year).isdigit():
+            return None
+        return self.months.get((int(year), num))
+
+
+# Build the (year, month number) -> MonthRecords index once per load
+def build_month_index(data, fetch_contents):
+    positions = {}
+    years = data['Year'].tolist()
+    month_nums = data['Month_Num'].tolist()
+    for pos, key in enumerate(zip(years, month_nums)):
+        positions.setdefault((int(key[0]), int(key[1])), []).append(pos)
+
+    columns = {
+        name: data[name].tolist() for name in ['id', 'content_hash', 'URL', 'content_length', 'preview']
+    }
+
+    def pick(name, rows):
+        return [columns[name][pos] for pos in rows]
+
+    return {
+        key: MonthRecords(
+            key[0], key[1], rows,
+            pick('id', rows), pick('content_hash', rows), pick('URL', rows),
+            pick('content_length', rows), pick('preview', rows),
+            fetch_contents,
+        )
+        for key, rows in positions.items()
+    }
@@ -0,0 +1,159 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import openai
+
+from board_data import CSV_PATHS, GENERATED_PATHS, load_board_data, llm_cache
+from prompts import SUMMARY_MODEL, VOTES_MODEL
+from summarizer import summarize_minutes, extract_votes_chunked
+
+# Batch job that generates every month's summary and vote list ahead of time.
+#
+# Run from the repository root, e.g.
+#   python Manhattan_CB2/pregenerate.py --workers 4 --rate 1
+# Results go to Manhattan_CB2/generated/<board_id>.json, which app.py serves
+# instead of calling OpenAI. Months whose content hash hasn't changed since
+# the last run are skipped. Point --api-base at a local fake server to run
+# without OpenAI. apply_changes.py passes `months` to only look at the months a
+# scraper run touched.
+
+
+# Spaces calls out so we never exceed `rate` requests per second overall
+class RateLimiter:
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def chat_completion(messages, model, limiter, retries=3, timeout=120):
+    for attempt in range(retries + 1):
+        limiter.wait()
+        try:
+            response = openai.ChatCompletion.create(
+                model=model, messages=messages, request_timeout=timeout
+            )
+            return response.choices[0].message['content']
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = 2 ** attempt
+            print(f"OpenAI call failed ({e}), retrying in {delay}s")
+            time.sleep(delay)
+
+
+# Completion function for the summarizer; chunk results go through the app's
+# LLM cache (board_data.llm_cache) so only changed chunks are sent again
+def cached_completion(board_id, model, limiter, retries):
+    def complete(kind, messages):
+        return llm_cache.get_or_compute(
+            board_id, kind, model, json.dumps(messages),
+            lambda: chat_completion(messages, model, limiter, retries),
+        )
+
+    return complete
+
+
+def generate_month(board_id, records, limiter, retries):
+    full_content = "\n\n".join(records.contents)
+    if not full_content.strip():
+        summary = "No summary available."
+        votes = ["No voting decisions available."]
+    else:
+        summary = summarize_minutes(full_content, cached_completion(board_id, SUMMARY_MODEL, limiter, retries))
+        votes = extract_votes_chunked(full_content, cached_completion(board_id, VOTES_MODEL, limiter, retries))
+    return {"content_hash": records.content_hash, "summary": summary, "votes": votes}
+
+
+def load_existing(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# Write to a temp file and rename so the app never reads a half-written file
+def write_generated(path, generated):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(dict(sorted(generated.items())), f, indent=1, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def pregenerate_board(board_id, limiter, workers=4, retries=3, force=False, months=None):
+    board = load_board_data(CSV_PATHS[board_id])
+    path = GENERATED_PATHS[board_id]
+    existing = load_existing(path)
+
+    # Keep current months only; drop months that disappeared from the CSV
+    generated = {}
+    todo = []
+    for records in board.months.values():
+        entry = existing.get(records.key)
+        if months is not None and records.key not in months:
+            if entry:
+                generated[records.key] = entry
+            continue
+        if not force and entry and entry.get("content_hash") == records.content_hash:
+            generated[records.key] = entry
+        else:
+            todo.append(records)
+
+    print(f"{board_id}: {len(todo)} of {len(board.months)} months to generate")
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(generate_month, board_id, records, limiter, retries): records for records in todo}
+        for future in as_completed(futures):
+            records = futures[future]
+            try:
+                generated[records.key] = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"{board_id} {records.key}: giving up ({e})")
+                continue
+            write_generated(path, generated)
+
+    if generated != existing:
+        write_generated(path, generated)
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate month summaries and vote lists")
+    parser.add_argument("boards", nargs="*", help="board IDs (default: all boards)")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent OpenAI calls")
+    parser.add_argument("--rate", type=float, default=1.0, help="max OpenAI calls per second")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--force", action="store_true", help="regenerate unchanged months too")
+    parser.add_argument("--api-base", help="OpenAI-compatible endpoint, e.g. a local fake server")
+    args = parser.parse_args()
+
+    if args.api_base:
+        openai.api_base = args.api_base
+
+    limiter = RateLimiter(args.rate)
+    failed = 0
+    for board_id in args.boards or list(CSV_PATHS):
+        if not os.path.exists(CSV_PATHS.get(board_id, "")):
+            print(f"{board_id}: no CSV, skipping")
+            continue
+        failed += pregenerate_board(board_id, limiter, args.workers, args.retries, args.force)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
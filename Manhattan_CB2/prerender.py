@@ -0,0 +1,152 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+
+from app import CSV_PATHS, app, dataset_cache, page_source, static_pages
+from static_pages import MANIFEST_NAME, load_manifest, page_key
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Build step that renders board index, month, summary and vote pages to static
+# files the app (or any static server/CDN in front of it) can serve directly.
+#
+# Run from the repository root, e.g.
+#   python Manhattan_CB2/prerender.py [board_id ...]
+# Pages go to Manhattan_CB2/build/pages/<hash>.html with .gz (and .br when the
+# brotli package is installed) next to them; build/manifest.json maps each page
+# to its file and source hash. Only pages whose source hash changed since the
+# last build are rendered again. Summary and vote pages are built only for
+# months pregenerate.py has already covered, so the build never calls OpenAI.
+# build() can be limited to some months per board (apply_changes.py passes the
+# months a scraper run touched); the board index is always checked.
+
+
+def write_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+PAGE_KINDS = [("month", "month"), ("summary", "summary"), ("votes", "vote")]
+
+
+# (page key, URL, source hash) for every prebuildable page of a board, or only
+# the index and the pages of `months` ("YYYY-MM" keys)
+def board_pages(board_id, months=None):
+    # Its search index and trend file are updated before the script can exit
+    board = dataset_cache.preload(board_id)
+    pages = [(page_key(board_id, "index"), f"/{board_id}", page_source(board_id, "index"))]
+    for records in board.months.values():
+        if months is not None and records.key not in months:
+            continue
+        for kind, route in PAGE_KINDS:
+            source = page_source(board_id, kind, records)
+            if source is None:
+                continue
+            pages.append((
+                page_key(board_id, kind, records.year, records.month),
+                f"/{board_id}/{route}/{records.year}/{records.month_name}",
+                source,
+            ))
+    return pages
+
+
+# Write a rendered page under its content hash; returns its manifest entry
+def write_page(pages_dir, body, source):
+    etag = hashlib.sha256(body).hexdigest()[:20]
+    file_name = f"{etag}.html"
+    path = os.path.join(pages_dir, file_name)
+    encodings = ["gzip"]
+    if not os.path.exists(path):
+        write_atomic(path + ".gz", gzip.compress(body, compresslevel=9, mtime=0))
+        if brotli is not None:
+            write_atomic(path + ".br", brotli.compress(body))
+        write_atomic(path, body)
+    if brotli is not None:
+        encodings.insert(0, "br")
+    return {"file": f"pages/{file_name}", "etag": etag, "source": source, "encodings": encodings}
+
+
+# Keys any page of the given months would have, built or not
+def month_page_keys(board_id, months):
+    keys = set()
+    for month_key in months:
+        year, month = month_key.split("-")
+        keys.update(page_key(board_id, kind, year, month) for kind, _ in PAGE_KINDS)
+    return keys
+
+
+# `months` maps a board ID to the months to look at; boards not in it are
+# checked in full
+def build(board_ids, build_dir, months=None):
+    pages_dir = os.path.join(build_dir, "pages")
+    os.makedirs(pages_dir, exist_ok=True)
+    manifest_path = os.path.join(build_dir, MANIFEST_NAME)
+    try:
+        manifest = load_manifest(manifest_path)
+    except (OSError, ValueError):
+        manifest = {}
+
+    # Render through the app itself, bypassing any existing build
+    app.config["SERVE_PREBUILT"] = False
+    client = app.test_client()
+
+    for board_id in board_ids:
+        board_months = months.get(board_id) if months else None
+        pages = board_pages(board_id, board_months)
+        current_keys = {key for key, _, _ in pages}
+        rendered = 0
+        for key, url, source in pages:
+            entry = manifest.get(key)
+            if entry and entry["source"] == source and os.path.exists(os.path.join(build_dir, entry["file"])):
+                continue
+            response = client.get(url)
+            # Routes report failures as a 200 with an error message
+            if response.status_code != 200 or response.get_data().startswith(b"Error"):
+                print(f"{url}: HTTP {response.status_code}, not prebuilt")
+                manifest.pop(key, None)
+                continue
+            manifest[key] = write_page(pages_dir, response.get_data(), source)
+            rendered += 1
+
+        # Drop pages for months that no longer exist or can't be prebuilt
+        if board_months is None:
+            stale = [key for key in manifest if key.startswith(f"{board_id}/") and key not in current_keys]
+        else:
+            stale = [key for key in month_page_keys(board_id, board_months) if key in manifest and key not in current_keys]
+        for key in stale:
+            del manifest[key]
+        print(f"{board_id}: {rendered} of {len(pages)} pages rendered")
+
+    write_atomic(manifest_path, json.dumps(dict(sorted(manifest.items())), indent=1).encode("utf-8"))
+
+    # Remove files no page points to any more
+    referenced = {os.path.basename(entry["file"]) for entry in manifest.values()}
+    for name in os.listdir(pages_dir):
+        if name.split(".")[0] + ".html" not in referenced:
+            os.remove(os.path.join(pages_dir, name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prerender board pages to static files")
+    parser.add_argument("boards", nargs="*", help="board IDs (default: all boards)")
+    parser.add_argument("--build-dir", default=static_pages.build_dir)
+    args = parser.parse_args()
+
+    board_ids = []
+    for board_id in args.boards or list(CSV_PATHS):
+        if not os.path.exists(CSV_PATHS.get(board_id, "")):
+            print(f"{board_id}: no CSV, skipping")
+            continue
+        board_ids.append(board_id)
+    build(board_ids, args.build_dir)
+
+
+if __name__ == "__main__":
+    main()
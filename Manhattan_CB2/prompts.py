@@ -0,0 +1,41 @@
+# Prompts shared by the Flask routes and the batch pre-generation job
+SUMMARY_MODEL = "gpt-4"
+VOTES_MODEL = "gpt-4"
+
+
+# Whole month when it fits in one chunk
+def summary_messages(text):
+    return [
+        {"role": "system", "content": "Summarize the meeting minutes."},
+        {"role": "user", "content": f"Summarize: {text}"},
+    ]
+
+
+# One chunk of a longer month (map step); no position in the prompt so cached
+# chunk summaries stay valid when other parts of the month change
+def chunk_summary_messages(text):
+    return [
+        {"role": "system", "content": "Summarize this excerpt of the meeting minutes. Keep names, addresses and decisions."},
+        {"role": "user", "content": f"Summarize: {text}"},
+    ]
+
+
+# Combine chunk summaries (reduce step)
+def reduce_summary_messages(partials):
+    joined = "\n\n".join(partials)
+    return [
+        {"role": "system", "content": "Combine these summaries of consecutive parts of one meeting's minutes into a single summary of the meeting."},
+        {"role": "user", "content": f"Combine: {joined}"},
+    ]
+
+
+def vote_messages(text):
+    return [
+        {"role": "system", "content": "Extract voting decisions from the meeting minutes."},
+        {"role": "user", "content": f"Extract votes: {text}"},
+    ]
+
+
+# The vote reply is one decision per line
+def parse_vote_lines(reply):
+    return [line.strip() for line in reply.split("\n") if line.strip()]
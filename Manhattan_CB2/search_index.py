@@ -0,0 +1,164 @@
+import hashlib
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from markupsafe import escape, Markup
+
+# Markers placed around matches by snippet(); swapped for <mark> after escaping
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+# Quoted phrases, prefix terms (chel*), plain terms and boolean operators
+QUERY_TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+OPERATORS = {"AND", "OR", "NOT"}
+
+
+# Turn a user query into a safe FTS5 MATCH expression.
+# "street closure" stays a phrase, liquor* stays a prefix query, AND/OR/NOT
+# are kept, and every other term is quoted so punctuation can't break the query.
+def build_match_query(query):
+    parts = []
+    for phrase, term in QUERY_TOKEN.findall(query):
+        if phrase:
+            words = phrase.split()
+            if words:
+                parts.append('"' + " ".join(w.replace('"', "") for w in words) + '"')
+        elif term in OPERATORS:
+            if parts and parts[-1] not in OPERATORS:
+                parts.append(term)
+        else:
+            prefix = term.endswith("*")
+            term = re.sub(r'[^\w\'\-]', " ", term.rstrip("*")).strip()
+            for word in term.split():
+                parts.append(f'"{word}"')
+            if prefix and term:
+                parts[-1] += "*"
+    while parts and parts[-1] in OPERATORS:
+        parts.pop()
+    return " ".join(parts)
+
+
+def document_key(board_id, row):
+    payload = "\x00".join([board_id, str(row["URL"]), str(row["Date"]), str(row["content_hash"])])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SearchResult:
+    def __init__(self, board_id, year, month, url, snippet, score):
+        self.board_id = board_id
+        self.year = year
+        self.month = month
+        self.url = url
+        self.snippet = snippet
+        self.score = score
+
+
+# Full-text index over every board's minutes (SQLite FTS5, BM25 ranking).
+#
+# Each board's rows are identified by a hash of (board, URL, date, content hash).
+# When a board's data is (re)loaded only rows whose hash is new are inserted
+# and rows that disappeared are deleted, so updating after a scrape touches
+# just the changed months.
+class SearchIndex:
+    def __init__(self, path):
+        self.path = path
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS documents (
+                    id INTEGER PRIMARY KEY,
+                    doc_key TEXT UNIQUE NOT NULL,
+                    board_id TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS documents_board ON documents (board_id)")
+            conn.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS minutes_fts USING fts5(
+                    content,
+                    board_id UNINDEXED,
+                    year UNINDEXED,
+                    month UNINDEXED,
+                    url UNINDEXED,
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3 4'
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # Bring one board's documents in line with its metadata frame; text is
+    # fetched only for rows that aren't indexed yet
+    def update_board(self, board_id, data, fetch_contents):
+        wanted = {}
+        for row in data[["id", "URL", "Date", "content_hash", "Year", "Month_Name"]].to_dict(orient="records"):
+            wanted[document_key(board_id, row)] = row
+
+        with self._write_lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            existing = dict(
+                conn.execute("SELECT doc_key, id FROM documents WHERE board_id = ?", (board_id,))
+            )
+
+            removed = [doc_id for key, doc_id in existing.items() if key not in wanted]
+            for doc_id in removed:
+                conn.execute("DELETE FROM minutes_fts WHERE rowid = ?", (doc_id,))
+                conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+
+            new_rows = [(key, row) for key, row in wanted.items() if key not in existing]
+            contents = fetch_contents([row["id"] for _, row in new_rows])
+            for (key, row), content in zip(new_rows, contents):
+                cursor = conn.execute(
+                    "INSERT INTO documents (doc_key, board_id) VALUES (?, ?)", (key, board_id)
+                )
+                conn.execute(
+                    "INSERT INTO minutes_fts (rowid, content, board_id, year, month, url) VALUES (?, ?, ?, ?, ?, ?)",
+                    (cursor.lastrowid, content, board_id, int(row["Year"]), row["Month_Name"], row["URL"]),
+                )
+        return len(new_rows), len(removed)
+
+    def search(self, query, board_ids=None, limit=20):
+        match = build_match_query(query)
+        if not match:
+            return []
+
+        sql = """
+            SELECT board_id, year, month, url,
+                   snippet(minutes_fts, 0, ?, ?, '…', 24),
+                   bm25(minutes_fts)
+            FROM minutes_fts
+            WHERE minutes_fts MATCH ?
+        """
+        params = [MATCH_START, MATCH_END, match]
+        if board_ids:
+            sql += f" AND board_id IN ({', '.join('?' for _ in board_ids)})"
+            params.extend(board_ids)
+        sql += " ORDER BY bm25(minutes_fts) LIMIT ?"
+        params.append(limit)
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        return [
+            SearchResult(board_id, year, month, url, highlight(snippet), score)
+            for board_id, year, month, url, snippet, score in rows
+        ]
+
+
+# Escape the snippet for HTML and wrap matches in <mark>
+def highlight(snippet):
+    html = str(escape(snippet))
+    return Markup(html.replace(MATCH_START, "<mark>").replace(MATCH_END, "</mark>"))
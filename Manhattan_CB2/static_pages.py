@@ -0,0 +1,59 @@
+import hashlib
+import json
+import os
+
+from dataset_cache import DatasetCache
+from http_cache import prebuilt_response
+
+# Pages rendered ahead of time by prerender.py.
+#
+# Each page is stored once under a content-hash file name (plus .gz/.br copies)
+# and listed in manifest.json by page key, together with the hash of the
+# sources it was rendered from. The app serves a prebuilt page only while that
+# source hash still matches the live data, so a stale build is never served;
+# the page just falls back to being rendered.
+
+MANIFEST_NAME = "manifest.json"
+
+
+# "manhattan-cb1/month/2024/01", "manhattan-cb1/index", ...
+def page_key(board_id, kind, year=None, month=None):
+    if year is None:
+        return f"{board_id}/{kind}"
+    return f"{board_id}/{kind}/{int(year)}/{int(month):02d}"
+
+
+def source_hash(*parts):
+    return hashlib.sha256("\x00".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+def load_manifest(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+class StaticPages:
+    def __init__(self, build_dir):
+        self.build_dir = build_dir
+        self.manifest_path = os.path.join(build_dir, MANIFEST_NAME)
+        # Picks up a new build without a restart
+        self._manifest = DatasetCache({"manifest": self.manifest_path}, load_manifest)
+
+    def manifest(self):
+        try:
+            return self._manifest.get("manifest")
+        except (OSError, ValueError):
+            return {}
+
+    # Manifest entry for a page if the build has it for exactly this source
+    def entry(self, key, source):
+        entry = self.manifest().get(key)
+        if entry and entry.get("source") == source:
+            return entry
+        return None
+
+    def file_path(self, entry):
+        return os.path.join(self.build_dir, entry["file"])
+
+    def response(self, entry, max_age=0):
+        return prebuilt_response(self.file_path(entry), entry["etag"], entry.get("encodings", []), max_age=max_age)
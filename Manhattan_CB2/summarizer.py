@@ -0,0 +1,148 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from chunking import CHARS_PER_TOKEN, CHUNK_TOKENS, chunk_minutes, estimate_tokens
+from prompts import (
+    summary_messages,
+    chunk_summary_messages,
+    reduce_summary_messages,
+    vote_messages,
+    parse_vote_lines,
+)
+from vote_rules import format_vote, needs_llm, parse_votes
+
+# Chunks of one month sent to the LLM at the same time, unless the caller
+# passes `parallel` (the web app keeps it below its LLM client's slot count)
+MAX_PARALLEL_CHUNKS = 4
+
+# Map-reduce summarization and vote extraction over chunked minutes.
+#
+# `complete(kind, messages)` runs one chat completion and returns its text.
+# Callers route it through the LLM cache, so each chunk's result is cached by
+# its prompt and only chunks whose text changed are sent again. The streaming
+# variants take `stream(kind, messages)`, which yields the reply as it arrives.
+
+
+def map_chunks(fn, items, parallel=MAX_PARALLEL_CHUNKS):
+    if len(items) == 1 or parallel <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(len(items), parallel)) as pool:
+        return list(pool.map(fn, items))
+
+
+# Group partial summaries so each group fits in one reduce prompt
+def group_partials(partials, max_tokens):
+    groups = []
+    current = []
+    current_tokens = 0
+    for partial in partials:
+        tokens = estimate_tokens(partial)
+        if current and current_tokens + tokens > max_tokens:
+            groups.append(current)
+            current = []
+            current_tokens = 0
+        current.append(partial)
+        current_tokens += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+# Cut a partial summary down to `max_tokens`, at a line break when there is
+# one in its second half
+def truncate_partial(partial, max_tokens):
+    if estimate_tokens(partial) <= max_tokens:
+        return partial
+    max_chars = max(max_tokens - 1, 0) * CHARS_PER_TOKEN
+    cut = partial[:max_chars]
+    newline = cut.rfind("\n")
+    return cut[:newline] if newline > max_chars // 2 else cut
+
+
+# Prompt for the call that produces the final summary; chunk summaries it
+# depends on are computed first
+def final_summary_messages(text, complete, max_tokens=CHUNK_TOKENS, parallel=MAX_PARALLEL_CHUNKS):
+    chunks = chunk_minutes(text, max_tokens)
+    if len(chunks) == 1:
+        return summary_messages(chunks[0])
+
+    partials = map_chunks(lambda chunk: complete("summary-chunk", chunk_summary_messages(chunk)), chunks, parallel)
+
+    # Reduce in rounds until the partial summaries fit into one prompt
+    while len(partials) > 1:
+        groups = group_partials(partials, max_tokens)
+        if len(groups) == 1:
+            break
+        if len(groups) == len(partials):
+            # No two partials fit in one prompt: shorten each to half the
+            # budget so they pair up, rather than send everything at once
+            partials = [truncate_partial(partial, max_tokens // 2) for partial in partials]
+            groups = group_partials(partials, max_tokens)
+        partials = map_chunks(
+            lambda group: complete("summary-reduce", reduce_summary_messages(group)), groups, parallel
+        )
+
+    # A single partial can still be over the budget on its own
+    if len(partials) == 1:
+        partials = [truncate_partial(partials[0], max_tokens)]
+    return reduce_summary_messages(partials)
+
+
+def summarize_minutes(text, complete, max_tokens=CHUNK_TOKENS, parallel=MAX_PARALLEL_CHUNKS):
+    return complete("summary", final_summary_messages(text, complete, max_tokens, parallel))
+
+
+# Only the final call is streamed; chunk summaries are short and cached
+def summarize_minutes_stream(text, complete, stream, max_tokens=CHUNK_TOKENS, parallel=MAX_PARALLEL_CHUNKS):
+    yield from stream("summary", final_summary_messages(text, complete, max_tokens, parallel))
+
+
+# Concatenate vote lines in document order, dropping lines repeated across chunks
+def unique_votes(lines):
+    seen = set()
+    for line in lines:
+        if line not in seen:
+            seen.add(line)
+            yield line
+
+
+# Vote lines of one chunk: from the rules when they find any, otherwise from
+# the LLM if the chunk talks about votes at all
+def chunk_votes(chunk, complete):
+    records = parse_votes(chunk)
+    if needs_llm(chunk, records):
+        return parse_vote_lines(complete("votes", vote_messages(chunk)))
+    return [format_vote(record) for record in records]
+
+
+def extract_votes_chunked(text, complete, max_tokens=CHUNK_TOKENS, parallel=MAX_PARALLEL_CHUNKS):
+    chunks = chunk_minutes(text, max_tokens)
+    lines = map_chunks(lambda chunk: chunk_votes(chunk, complete), chunks, parallel)
+    return list(unique_votes(line for chunk_lines in lines for line in chunk_lines))
+
+
+# Complete lines of a streamed reply, each as soon as its newline arrives
+def stream_lines(pieces):
+    buffer = ""
+    for piece in pieces:
+        buffer += piece
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            if line.strip():
+                yield line.strip()
+    if buffer.strip():
+        yield buffer.strip()
+
+
+def chunk_votes_stream(chunk, stream):
+    records = parse_votes(chunk)
+    if needs_llm(chunk, records):
+        yield from stream_lines(stream("votes", vote_messages(chunk)))
+    else:
+        yield from (format_vote(record) for record in records)
+
+
+# Yields each vote as it is extracted. Chunks are streamed one after another
+# so votes come out in document order.
+def extract_votes_stream(text, stream, max_tokens=CHUNK_TOKENS):
+    chunks = chunk_minutes(text, max_tokens)
+    yield from unique_votes(line for chunk in chunks for line in chunk_votes_stream(chunk, stream))
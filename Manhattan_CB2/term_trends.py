@@ -0,0 +1,280 @@
+import hashlib
+import mmap
+import os
+import re
+import struct
+from collections import Counter
+
+import numpy as np
+
+from vote_rules import parse_votes
+
+# Header: magic, board version (sha256), then the section sizes below
+MAGIC = b"TRENDS01"
+HEADER = struct.Struct("<8s32sqqqq")
+
+# Lowercased runs of letters and digits; "Liquor-License" and "liquor license"
+# are the same two words, for the minutes and for queries alike
+WORD = re.compile(r"[a-z0-9]+")
+
+# Terms are single words and two-word phrases ("street closure")
+MAX_TERM_WORDS = 2
+
+# Per-month term counts for one board, precomputed for /api/trends.
+#
+# Every month's minutes are tokenized once, when the board is loaded, into
+# counts of every word and two-word phrase. Terms are stored as 64-bit hashes
+# in a sorted array with a compressed sparse column matrix per measure
+# (indptr, month rows, counts), so counting a term across all months is a
+# binary search and a slice:
+#   mentions      how often the term appears in the month's minutes
+#   agenda_items  how many of the month's agenda items (resolutions found by
+#                 vote_rules.py) mention it
+# plus the words and agenda items of each month, to normalize by. Like the
+# minutes corpus, the file is memory-mapped and shared by all workers. It is
+# rebuilt whenever the board's version changes; months whose content hash is
+# unchanged are copied from the old file instead of being tokenized again.
+
+
+def section_layout(months, terms, mention_nnz, item_nnz):
+    return [
+        ("months", "<i8", months),
+        ("words", "<i8", months),
+        ("agenda_items", "<i8", months),
+        ("month_hashes", "u1", months * 32),
+        ("terms", "<u8", terms),
+        ("mention_indptr", "<i8", terms + 1),
+        ("item_indptr", "<i8", terms + 1),
+        ("mention_rows", "<i4", mention_nnz),
+        ("mention_counts", "<i4", mention_nnz),
+        ("item_rows", "<i4", item_nnz),
+        ("item_counts", "<i4", item_nnz),
+    ]
+
+
+def tokenize(text):
+    return WORD.findall(text.lower())
+
+
+# Words and two-word phrases of a token list, with counts
+def term_counts(words):
+    counts = Counter(words)
+    counts.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    return counts
+
+
+def term_hash(term):
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+# Hash of a user's query term, or ValueError if it isn't one or two words
+def query_hash(term):
+    words = tokenize(term)
+    if not words or len(words) > MAX_TERM_WORDS:
+        raise ValueError(f"terms are one or two words: {term!r}")
+    return term_hash(" ".join(words))
+
+
+# Months are stored as year * 12 + month - 1
+def month_ordinal(year, month):
+    return int(year) * 12 + int(month) - 1
+
+
+def month_label(ordinal):
+    return f"{ordinal // 12}-{ordinal % 12 + 1:02d}"
+
+
+# (term hashes, mention counts, item term hashes, item counts, words, items) of one month
+def tokenize_month(contents, hashes):
+    mentions = Counter()
+    items = Counter()
+    words = 0
+    agenda_items = 0
+    for text in contents:
+        tokens = tokenize(text)
+        words += len(tokens)
+        mentions.update(term_counts(tokens))
+        for record in parse_votes(text):
+            agenda_items += 1
+            items.update(set(term_counts(tokenize(record["resolution"] or ""))))
+
+    def encode(counts):
+        keys = np.fromiter(
+            (hashes[term] if term in hashes else hashes.setdefault(term, term_hash(term)) for term in counts),
+            dtype="<u8", count=len(counts),
+        )
+        return keys, np.fromiter(counts.values(), dtype="<i4", count=len(counts))
+
+    return (*encode(mentions), *encode(items), words, agenda_items)
+
+
+# (indptr, rows, counts) of a CSC matrix over `terms` from (term, row, count) triplets
+def csc(terms, keys, rows, counts):
+    columns = np.searchsorted(terms, keys)
+    order = np.lexsort((rows, columns))
+    indptr = np.zeros(len(terms) + 1, dtype="<i8")
+    np.cumsum(np.bincount(columns, minlength=len(terms)), out=indptr[1:])
+    return indptr, rows[order].astype("<i4"), counts[order].astype("<i4")
+
+
+# Write a board's trend file, reusing unchanged months of `previous` (a TermTrends or None)
+def write_trends(path, board, previous=None):
+    keys = sorted(board.months)
+    ordinals = np.array([month_ordinal(year, month) for year, month in keys], dtype="<i8")
+    month_hashes = [board.months[key].content_hash for key in keys]
+
+    reusable = {}
+    if previous is not None:
+        for row, (ordinal, digest) in enumerate(zip(previous.months.tolist(), previous.month_hash_list())):
+            reusable[(ordinal, digest)] = row
+
+    # (term, new row, count) triplets per measure, in pieces
+    parts = {"mention": ([], [], []), "item": ([], [], [])}
+    words = np.zeros(len(keys), dtype="<i8")
+    agenda_items = np.zeros(len(keys), dtype="<i8")
+    old_rows = np.full(len(previous.months) if previous is not None else 0, -1, dtype="<i8")
+    hashes = {}
+    for row, (key, ordinal, digest) in enumerate(zip(keys, ordinals.tolist(), month_hashes)):
+        old_row = reusable.get((ordinal, digest))
+        if old_row is not None:
+            old_rows[old_row] = row
+            words[row] = previous.words[old_row]
+            agenda_items[row] = previous.agenda_items[old_row]
+            continue
+        mention_keys, mention_counts, item_keys, item_counts, words[row], agenda_items[row] = tokenize_month(
+            board.months[key].contents, hashes
+        )
+        for name, term_keys, counts in [("mention", mention_keys, mention_counts), ("item", item_keys, item_counts)]:
+            parts[name][0].append(term_keys)
+            parts[name][1].append(np.full(len(term_keys), row, dtype="<i8"))
+            parts[name][2].append(counts)
+
+    if previous is not None:
+        for name in parts:
+            term_keys, rows, counts = previous.triplets(name)
+            kept = old_rows[rows] >= 0
+            parts[name][0].append(term_keys[kept])
+            parts[name][1].append(old_rows[rows[kept]])
+            parts[name][2].append(counts[kept])
+
+    arrays = {"months": ordinals, "words": words, "agenda_items": agenda_items}
+    arrays["month_hashes"] = np.frombuffer(b"".join(bytes.fromhex(digest) for digest in month_hashes), dtype="u1")
+    triplets = {}
+    for name, (term_keys, rows, counts) in parts.items():
+        triplets[name] = (
+            np.concatenate(term_keys) if term_keys else np.zeros(0, dtype="<u8"),
+            np.concatenate(rows) if rows else np.zeros(0, dtype="<i8"),
+            np.concatenate(counts) if counts else np.zeros(0, dtype="<i4"),
+        )
+    terms = np.unique(np.concatenate([triplets["mention"][0], triplets["item"][0]]))
+    arrays["terms"] = terms
+    for name in parts:
+        arrays[f"{name}_indptr"], arrays[f"{name}_rows"], arrays[f"{name}_counts"] = csc(terms, *triplets[name])
+
+    layout = section_layout(len(keys), len(terms), len(arrays["mention_rows"]), len(arrays["item_rows"]))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(
+            MAGIC, bytes.fromhex(board.version), len(keys), len(terms), len(arrays["mention_rows"]), len(arrays["item_rows"])
+        ))
+        for name, dtype, count in layout:
+            data = np.ascontiguousarray(arrays[name], dtype=dtype)
+            if data.size != count:
+                raise ValueError(f"{name}: expected {count} values, got {data.size}")
+            f.write(data.tobytes())
+    os.replace(tmp_path, path)
+
+
+class TermTrends:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, months, terms, mention_nnz, item_nnz = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a term trends file")
+        self.version = version.hex()
+        offset = HEADER.size
+        # Zero-copy views of every section inside the map
+        for name, dtype, count in section_layout(months, terms, mention_nnz, item_nnz):
+            array = np.frombuffer(self._map, dtype=dtype, count=count, offset=offset)
+            setattr(self, name, array)
+            offset += array.nbytes
+
+    def month_hash_list(self):
+        return [bytes(digest).hex() for digest in self.month_hashes.reshape(-1, 32)]
+
+    # (term, row, count) arrays of one measure ("mention" or "item")
+    def triplets(self, name):
+        indptr = getattr(self, f"{name}_indptr")
+        term_keys = np.repeat(self.terms, np.diff(indptr))
+        return term_keys, getattr(self, f"{name}_rows").astype("<i8"), getattr(self, f"{name}_counts")
+
+    # Per-month counts of one term hash for a measure, aligned with self.months
+    def counts(self, key, name="mention"):
+        result = np.zeros(len(self.months), dtype="<i8")
+        column = np.searchsorted(self.terms, key)
+        if column < len(self.terms) and self.terms[column] == key:
+            indptr = getattr(self, f"{name}_indptr")
+            start, end = indptr[column], indptr[column + 1]
+            result[getattr(self, f"{name}_rows")[start:end]] = getattr(self, f"{name}_counts")[start:end]
+        return result
+
+
+# The board's trend file, rebuilt if it's missing or older than `board`; True if it was rebuilt
+def update_trends(path, board):
+    previous = None
+    try:
+        previous = TermTrends(path)
+        if previous.version == board.version:
+            return False
+    except (OSError, ValueError):
+        pass
+    write_trends(path, board, previous)
+    return True
+
+
+# Month-by-month series of each term across the given boards ({board ID: TermTrends}).
+# Months run from the first to the last month any of the boards has minutes
+# for; months a board has no minutes for are null in its series.
+def term_series(trends, terms):
+    keys = [np.uint64(query_hash(term)) for term in terms]
+    ordinals = [board.months for board in trends.values() if len(board.months)]
+    if not ordinals:
+        return {"months": [], "boards": {}, "terms": [{"term": term, "mentions": [], "agenda_items": []} for term in terms]}
+    first = int(min(months[0] for months in ordinals))
+    last = int(max(months[-1] for months in ordinals))
+    span = last - first + 1
+
+    def spread(board, values):
+        series = np.full(span, -1, dtype="<i8")
+        series[board.months - first] = values
+        return series
+
+    def listed(series):
+        return [None if value < 0 else value for value in series.tolist()]
+
+    boards = {}
+    per_term = [{"term": term, "mentions": np.zeros(span, dtype="<i8"), "agenda_items": np.zeros(span, dtype="<i8"),
+                 "boards": {}} for term in terms]
+    for board_id, board in trends.items():
+        boards[board_id] = {
+            "words": listed(spread(board, board.words)),
+            "agenda_items": listed(spread(board, board.agenda_items)),
+        }
+        for entry, key in zip(per_term, keys):
+            mentions = spread(board, board.counts(key, "mention"))
+            items = spread(board, board.counts(key, "item"))
+            entry["mentions"] += np.maximum(mentions, 0)
+            entry["agenda_items"] += np.maximum(items, 0)
+            entry["boards"][board_id] = {"mentions": listed(mentions), "agenda_items": listed(items)}
+
+    for entry in per_term:
+        entry["mentions"] = entry["mentions"].tolist()
+        entry["agenda_items"] = entry["agenda_items"].tolist()
+    return {
+        "months": [month_label(ordinal) for ordinal in range(first, last + 1)],
+        "boards": boards,
+        "terms": per_term,
+    }
@@ -0,0 +1,269 @@
+import re
+
+from chunking import CHUNK_TOKENS, chunk_minutes
+from prompts import vote_messages, parse_vote_lines
+
+# Characters of text kept as a vote's resolution
+MAX_RESOLUTION_CHARS = 300
+
+# How far back from a tally to look for the item it belongs to
+MAX_CONTEXT_CHARS = 600
+
+# Rule-based vote extraction.
+#
+# Minutes record most votes in a few regular shapes, e.g.
+#   "BOARD VOTE: 41 In Favor 0 Opposed 0 Abstained 0 Recused"   (CB1)
+#   "passed by a hand vote of 27 in favor, 1 opposed, 0 abstained and 0 recused"
+#   "A roll call vote was taken with 20-Yes, 2-No, and 1-Abstention"   (Bronx)
+#   "Vote: 35-0-0"
+#   "Item 05: Letter to SLA re ... Passed with 38 In Favor and 1 Opposed"   (CB4)
+# Each match becomes a record with the item number (when the minutes number
+# it), the resolution text before the tally, the outcome and the counts
+# (None when a count isn't stated). Text is matched with optional whitespace
+# because PDF extraction often drops spaces ("Vote waspassedby 40infavor").
+
+COUNT_LABELS = {
+    "yes": r"in\s*favou?r|yes|ayes?",
+    "no": r"opposed|no(?:[’']?e?s)?\b|nays?|against",
+    "abstain": r"abst\w*",
+    "recused": r"recus\w*",
+    "ineligible": r"present,?\s*not\s*eligible|pne\b",
+}
+LABEL_KINDS = [(kind, re.compile(pattern, re.IGNORECASE)) for kind, pattern in COUNT_LABELS.items()]
+
+COUNT = r"\d{1,3}\s*[-–]?\s*(?:" + "|".join(COUNT_LABELS.values()) + r")"
+COUNT_PART = re.compile(r"(\d{1,3})\s*[-–]?\s*(" + "|".join(COUNT_LABELS.values()) + r")", re.IGNORECASE)
+
+# Two or more "<number> <label>" parts in a row
+TALLY = re.compile(rf"{COUNT}(?:[\s,;:.]*(?:and(?![a-z])|&)?[\s,;:.]*{COUNT})+", re.IGNORECASE)
+
+# "Vote: 35-0-0" / "passed 30-2-1-0": in favor, opposed, abstained[, recused].
+# The numbers are matched first and the word before them checked separately,
+# which is much faster than scanning for the words.
+DASHED_TALLY = re.compile(r"(?<![\d/-])(\d{1,2})\s*-\s*(\d{1,2})\s*-\s*(\d{1,2})(?:\s*-\s*(\d{1,2}))?(?![\d/-])")
+DASHED_LEAD = re.compile(r"\b(?:vote[ds]?|passed|approved|adopted|carried)\b[^\d\n]{0,20}$", re.IGNORECASE)
+
+# "Item 05:" / "Letter 2:" rows of CB4's tables of board actions
+ITEM_ROW = re.compile(r"^\s*(?:Item|Letter)\s*(\d+)\s*:", re.IGNORECASE | re.MULTILINE)
+ITEM_STATUS = re.compile(r"\b(?:APPROVED|DISAPPROVED|DENIED|TABLED|WITHDRAWN|FAILED|REJECTED|Passed|Failed)\b")
+UNANIMOUS = re.compile(r"\bUnanimous", re.IGNORECASE)
+# In table rows other columns get interleaved with the tally, so counts are
+# found label by label with up to a few stray words in between
+LOOSE_COUNTS = {
+    "yes": re.compile(r"\b(\d{1,3})\s*In\b(?:\s+(?!\d+\s)\S+){0,8}?\s+Favou?r", re.IGNORECASE),
+    "no": re.compile(r"\b(\d{1,3})(?:\s+(?!\d+\s)\S+){0,8}?\s+Opposed", re.IGNORECASE),
+    "abstain": re.compile(r"\b(\d{1,3})(?:\s+(?!\d+\s)\S+){0,4}?\s+Abstention", re.IGNORECASE),
+}
+
+# Characters after a row's status that may hold its tally
+ROW_TALLY_CHARS = 250
+
+# Line starts that open a new agenda item
+# (bullets are left out: they mark notes under an item)
+ITEM_START = re.compile(r"^[ \t]*(?:(\d+)\)|(\d+)\.\s|[A-Z]\)|[A-Z]\.\s|[IVX]+\.\s)", re.MULTILINE)
+
+# Sentence ends, for trimming context that has no item marker
+SENTENCE_END = re.compile(r"[.!?]\s+(?=[A-Z])")
+
+FAILED_WORDS = re.compile(r"\b(?:fail\w*|defeated|denied|rejected|disapproved|not\s*approved?)\b", re.IGNORECASE)
+PASSED_WORDS = re.compile(r"\b(?:pass\w*|approved?|adopted|carried|unanimous\w*)\b", re.IGNORECASE)
+TABLED_WORDS = re.compile(r"\b(?:tabled|withdrawn|postponed)\b", re.IGNORECASE)
+
+# Trailing vote vocabulary ("– Resolution passed by a roll call vote of") that
+# introduces the tally rather than describing the item; words may run
+# together ("waspassedby")
+LEAD_IN_WORD = re.compile(
+    r"(?:negative|resolutions?|was|were|passed|approved|adopted|failed|defeated|denied|carried|by|an?|the|"
+    r"roll|called|call|hand|unanimous|voice|board|committee|full|vote[ds]?|taken|with|following|results?|of|"
+    r"as|follows|and|there|motion)+",
+    re.IGNORECASE,
+)
+WORD = re.compile(r"[^\s\ue000-\uf8ff–—:;,.()-]+")
+
+# Sections mentioning votes that the rules should have found something in
+VOTE_HINT = re.compile(r"\b(?:vot(?:e|ed|es|ing)|in\s*favou?r|motion|resolution\s+(?:passed|approved))\b", re.IGNORECASE)
+
+
+def clean_text(text):
+    # Bullets from PDF symbol fonts come out as private-use characters
+    return re.sub(r"[\s\ue000-\uf8ff]+", " ", text).strip(" –—-:;,.")
+
+
+def empty_counts():
+    return {"yes": None, "no": None, "abstain": None, "recused": None}
+
+
+def tally_counts(text):
+    counts = empty_counts()
+    for number, label in COUNT_PART.findall(text):
+        for kind, pattern in LABEL_KINDS:
+            if pattern.fullmatch(label):
+                if kind in counts and counts[kind] is None:
+                    counts[kind] = int(number)
+                break
+    return counts
+
+
+def outcome(text, counts):
+    if TABLED_WORDS.search(text):
+        return "tabled"
+    if FAILED_WORDS.search(text):
+        return "failed"
+    if PASSED_WORDS.search(text):
+        return "passed"
+    if counts["yes"] is not None:
+        return "passed" if counts["yes"] > (counts["no"] or 0) else "failed"
+    return None
+
+
+# Where the trailing vote vocabulary of `context` starts
+def lead_in_start(context):
+    split = len(context)
+    for word in reversed(WORD.findall(context)):
+        if not LEAD_IN_WORD.fullmatch(word):
+            break
+        split = context.rindex(word, 0, split)
+    return split
+
+
+def make_record(item, resolution, result, counts, start, unanimous=False):
+    return {
+        "item": item, "resolution": resolution, "outcome": result, **counts,
+        "unanimous": unanimous, "source": "rules", "_start": start,
+    }
+
+
+# Start of the agenda item a tally at `position` belongs to
+def context_start(text, position, floor):
+    window_start = max(floor, position - MAX_CONTEXT_CHARS)
+    starts = [m for m in ITEM_START.finditer(text, window_start, position)]
+    if starts:
+        return starts[-1]
+    return None
+
+
+def tally_records(text, floor=0, end=None):
+    end = len(text) if end is None else end
+    matches = []
+    for m in TALLY.finditer(text, floor, end):
+        counts = tally_counts(m.group(0))
+        if counts["yes"] is not None or counts["no"] is not None:
+            matches.append((m.start(), m.end(), counts))
+    for m in DASHED_TALLY.finditer(text, floor, end):
+        if not DASHED_LEAD.search(text, max(floor, m.start() - 30), m.start()):
+            continue
+        yes, no, abstain, recused = m.groups()
+        counts = {"yes": int(yes), "no": int(no), "abstain": int(abstain), "recused": int(recused) if recused else None}
+        matches.append((m.start(), m.end(), counts))
+
+    records = []
+    previous_end = floor
+    for start, stop, counts in sorted(matches, key=lambda match: match[0]):
+        if start < previous_end:
+            continue
+        item_match = context_start(text, start, previous_end)
+        if item_match:
+            item = item_match.group(1) or item_match.group(2)
+            context = text[item_match.end():start]
+        else:
+            # Narrative minutes: the last sentences before the tally
+            item = None
+            context = text[max(previous_end, start - MAX_RESOLUTION_CHARS):start]
+            sentence = SENTENCE_END.search(context)
+            if sentence and sentence.end() < len(context) - 80:
+                context = context[sentence.end():]
+        split = lead_in_start(context)
+        resolution = clean_text(context[:split])[:MAX_RESOLUTION_CHARS]
+        # "... 0 recused approved" puts the outcome after the tally
+        result = outcome(context[split:] + " " + text[stop:stop + 12], counts)
+        records.append(make_record(item, resolution, result, counts, start))
+        previous_end = stop
+    return records
+
+
+# CB4-style "Item NN: <text> <status>" rows, up to the next row
+def item_records(text):
+    rows = list(ITEM_ROW.finditer(text))
+    records = []
+    spans = []
+    for i, row in enumerate(rows):
+        end = rows[i + 1].start() if i + 1 < len(rows) else min(len(text), row.end() + MAX_CONTEXT_CHARS)
+        block = text[row.end():end]
+        status = ITEM_STATUS.search(block)
+        if status is None:
+            continue
+        counts = empty_counts()
+        after = block[status.end():status.end() + ROW_TALLY_CHARS]
+        yes = LOOSE_COUNTS["yes"].search(after)
+        if yes:
+            counts["yes"] = int(yes.group(1))
+            for kind in ("no", "abstain"):
+                found = LOOSE_COUNTS[kind].search(after, yes.end())
+                if found:
+                    counts[kind] = int(found.group(1))
+        first_line = block[:status.start()].split("\n")[0]
+        resolution = clean_text(first_line)[:MAX_RESOLUTION_CHARS]
+        result = outcome(status.group(0), counts)
+        records.append(make_record(
+            row.group(1).lstrip("0") or "0", resolution, result, counts, row.start(),
+            counts["yes"] is None and bool(UNANIMOUS.search(after)),
+        ))
+        spans.append((row.start(), end))
+    return records, spans
+
+
+# Structured vote records found by the rules, in document order
+def parse_votes(text):
+    records, spans = item_records(text)
+    # Tallies outside the item rows (rows already read their own tallies)
+    floor = 0
+    for start, end in spans + [(len(text), len(text))]:
+        records.extend(tally_records(text, floor, start))
+        floor = end
+    records.sort(key=lambda record: record["_start"])
+    for record in records:
+        del record["_start"]
+    return records
+
+
+# A section the rules found nothing in although it talks about votes
+def needs_llm(text, records):
+    return not records and bool(VOTE_HINT.search(text))
+
+
+# One line per vote for the vote page
+def format_vote(record):
+    counts = [
+        f"{record[kind]} {label}"
+        for kind, label in [("yes", "in favor"), ("no", "opposed"), ("abstain", "abstained"), ("recused", "recused")]
+        if record.get(kind) is not None
+    ]
+    parts = [record["resolution"] or "Vote"]
+    if record.get("outcome"):
+        parts.append(record["outcome"].capitalize())
+    line = " – ".join(parts)
+    if record.get("unanimous"):
+        counts.insert(0, "unanimous")
+    return f"{line} ({', '.join(counts)})" if counts else line
+
+
+# Votes of one month: rules for every section, `complete(kind, messages)`
+# (the LLM) only for sections the rules found nothing in. Without `complete`
+# those sections are only counted.
+def month_votes(text, complete=None, max_tokens=CHUNK_TOKENS):
+    votes = []
+    unparsed = 0
+    for chunk in chunk_minutes(text, max_tokens):
+        records = parse_votes(chunk)
+        if not needs_llm(chunk, records):
+            votes.extend(records)
+            continue
+        if complete is None:
+            unparsed += 1
+            continue
+        for line in parse_vote_lines(complete("votes", vote_messages(chunk))):
+            votes.append({
+                "item": None, "resolution": line, "outcome": None, **empty_counts(),
+                "unanimous": False, "source": "llm",
+            })
+    return {"votes": votes, "unparsed_sections": unparsed}
@@ -0,0 +1,46 @@
+# gunicorn settings for the Flask app, picked up when run from the repository root
+# (the app's data paths are relative to it):
+#   gunicorn app:app
+import gc
+import glob
+import os
+
+pythonpath = "Manhattan_CB2"
+
+# Workers leave their /metrics numbers here so any worker can report the
+# whole server's (see Manhattan_CB2/metrics.py)
+os.environ.setdefault("METRICS_DIR", "Manhattan_CB2/metrics")
+
+# Streamed summaries keep a thread busy while OpenAI answers, not a whole
+# worker process, so the other threads keep serving ordinary pages
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+
+# A streamed reply can take longer than the default 30 s worker timeout
+timeout = 120
+
+# Import the app once in the master; workers are forked from it
+preload_app = True
+
+
+# Numbers from an earlier run of the server would be added to this one's
+def on_starting(server):
+    for path in glob.glob(os.path.join(os.environ["METRICS_DIR"], "*.json")):
+        os.remove(path)
+
+
+# Parse every board in the master before the workers are forked, so they all
+# share one copy of the data. gc.freeze() moves it out of the collector's
+# generations, which keeps collections in the workers from touching (and so
+# copying) those pages. PRELOAD_BOARDS=0 leaves boards to load on first request.
+def when_ready(server):
+    if os.getenv("PRELOAD_BOARDS", "1") == "1":
+        from app import preload_boards
+
+        preload_boards()
+    # The workers start counting from zero; the preload's timings are the master's
+    from app import metrics
+
+    metrics.flush()
+    gc.freeze()
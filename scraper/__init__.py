@@ -0,0 +1 @@
+# Shared scraping pipeline for the community board notebooks and workflows
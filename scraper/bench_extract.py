@@ -0,0 +1,148 @@
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import pdfplumber
+
+from scraper.extract import extract_pdf_pages, join_pages
+
+# Time and peak memory of PDF extraction on the longest checked-in minutes.
+#
+# Run from the repository root:
+#   python -m scraper.bench_extract [--count 5] [pdf ...]
+# Each PDF is extracted twice, each time in a fresh process so peak RSS
+# belongs to that run alone: once with the notebooks' loop (every page kept
+# open, text concatenated page by page) and once with extract_pdf_pages +
+# join_pages (pages closed as they're read, repeated headers and footers
+# dropped, text normalized).
+# With --dir, every PDF in one folder is extracted in this process instead and
+# the totals are printed as JSON (used by Manhattan_CB2/bench_suite.py):
+#   python -m scraper.bench_extract --dir Bronx_CB1/Bronx_CB1_PDFs
+
+PDF_GLOB = "*/*_PDFs/*.pdf"
+
+
+# The loop the notebooks used before scraper/extract.py
+def notebook_text(file_path):
+    with pdfplumber.open(file_path) as pdf:
+        pdf_text = ""
+        for page in pdf.pages:
+            pdf_text += page.extract_text() or ""
+    return pdf_text.strip()
+
+
+def streaming_text(file_path):
+    _, pages, _ = extract_pdf_pages(file_path)
+    return join_pages(pages)
+
+
+METHODS = {"notebook": notebook_text, "streaming": streaming_text}
+
+
+def page_count(file_path):
+    try:
+        with pdfplumber.open(file_path) as pdf:
+            return len(pdf.pages)
+    except Exception:
+        return 0
+
+
+# Most pages first; the biggest files by size are mostly scans with no text layer
+def largest_pdfs(count):
+    return sorted(glob.glob(PDF_GLOB), key=page_count, reverse=True)[:count]
+
+
+# One extraction in this process; prints its measurements as JSON
+def measure(method, file_path):
+    started = time.perf_counter()
+    text = METHODS[method](file_path)
+    seconds = time.perf_counter() - started
+    print(json.dumps({
+        "seconds": round(seconds, 2),
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "chars": len(text),
+    }))
+
+
+# Extract a folder of PDFs one after another, as the pipeline does with one worker
+def measure_dir(pdf_dir, limit=None):
+    file_paths = sorted(glob.glob(os.path.join(pdf_dir, "*.pdf")))[:limit]
+    pages = 0
+    ocr_pages = 0
+    chars = 0
+    failed = 0
+    started = time.perf_counter()
+    for file_path in file_paths:
+        _, pdf_pages, needs_ocr = extract_pdf_pages(file_path)
+        if pdf_pages is None:
+            failed += 1
+            continue
+        pages += len(pdf_pages)
+        ocr_pages += len(needs_ocr)
+        chars += len(join_pages(pdf_pages))
+    seconds = time.perf_counter() - started
+    print(json.dumps({
+        "pdfs": len(file_paths),
+        "failed": failed,
+        "pages": pages,
+        # Scanned pages; their text needs OCR, which isn't part of this timing
+        "ocr_pages": ocr_pages,
+        "chars": chars,
+        "seconds": round(seconds, 2),
+        "pages_per_second": round(pages / seconds, 2) if seconds else None,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }))
+
+
+def run_measure(method, file_path):
+    output = subprocess.run(
+        [sys.executable, "-m", "scraper.bench_extract", "--measure", method, file_path],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF extraction time and peak memory")
+    parser.add_argument("pdfs", nargs="*", help="PDFs to extract (default: the longest checked-in ones)")
+    parser.add_argument("--count", type=int, default=5, help="how many of the longest PDFs to use")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--dir", help="extract every PDF in this folder and print the totals as JSON")
+    parser.add_argument("--limit", type=int, help="with --dir, only the first N PDFs")
+    parser.add_argument("--measure", nargs=2, metavar=("METHOD", "PDF"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+        return
+    if args.dir:
+        measure_dir(args.dir, args.limit)
+        return
+
+    results = []
+    for file_path in args.pdfs or largest_pdfs(args.count):
+        result = {"pdf": file_path, "pages": page_count(file_path), "mb": round(os.path.getsize(file_path) / 1e6, 1)}
+        for method in METHODS:
+            result[method] = run_measure(method, file_path)
+        results.append(result)
+        if not args.json:
+            old, new = result["notebook"], result["streaming"]
+            print(
+                f"{file_path} ({result['pages']} pages): notebook {old['seconds']}s, {old['peak_rss_mb']} MB peak, "
+                f"{old['chars']} chars; streaming {new['seconds']}s, {new['peak_rss_mb']} MB peak, "
+                f"{new['chars']} chars ({1 - new['chars'] / max(old['chars'], 1):.1%} smaller)"
+            )
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
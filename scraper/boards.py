@@ -0,0 +1,114 @@
+import os
+import re
+
+from bs4 import BeautifulSoup
+
+# Every board the scraper knows about. Adding a board is a new entry here:
+#
+#   folder        folder holding the board's CSVs, PDFs and crawl state
+#   listing_urls  pages that link to the minutes PDFs
+#   container     CSS selector for the blocks holding the links (None for the whole page)
+#   link_pattern  regex a link's href must match (None keeps every link)
+#   url_prefix    prepended to relative hrefs; "{page}" is the listing page's URL
+#   date_heading  CSS selector inside the container whose text is put before
+#                 the link text (Manhattan CB1 lists "January" under a year heading)
+#   listing_csv / output_csv / pdf_dir   file names inside `folder`
+#
+# Board IDs match the app's URLs.
+CB4_ARCHIVES = "https://cbmanhattan.cityofnewyork.us/cb4/archives/"
+
+BOARDS = {
+    "manhattan-cb1": {
+        "folder": "Manhattan_CB1",
+        "listing_urls": ["https://www.nyc.gov/site/manhattancb1/archives/monthly-full-board-meeting-minutes.page"],
+        "container": "div.span4",
+        "link_pattern": None,
+        "url_prefix": "https://www.nyc.gov",
+        "date_heading": "strong",
+        "listing_csv": "Manhattan_CB1.csv",
+        "output_csv": "Manhattan_CB1_with_content.csv",
+        "pdf_dir": "Manhattan_CB1_PDFs",
+    },
+    "manhattan-cb2": {
+        "folder": "Manhattan_CB2",
+        "listing_urls": [
+            "https://cbmanhattan.cityofnewyork.us/cb2/minutes/",
+            "https://cbmanhattan.cityofnewyork.us/cb2/minutes/archives/",
+        ],
+        "container": "div.entry-content",
+        "link_pattern": r"\.pdf|minutes",
+        "url_prefix": "",
+        "date_heading": None,
+        # The CB2 notebook has always written the text back into the listing CSV
+        "listing_csv": None,
+        "output_csv": "Manhattan_CB2.csv",
+        "pdf_dir": "Manhattan_CB2_PDFs",
+    },
+    "manhattan-cb4": {
+        "folder": "Manhattan_CB4",
+        "listing_urls": [
+            f"{CB4_ARCHIVES}{slug}/"
+            for slug in [
+                "2024-full-board-minutes-audio",
+                "2023-full-board-minutes-audio",
+                "2022-full-board-minutes-audio",
+                "2021-full-board-minutes-audio",
+                "full-board-minutes-audio",
+                "2019-full-board-minutes-audio",
+                "2018-full-board-minutes-audio",
+            ]
+        ],
+        "container": None,
+        "link_pattern": r"\.pdf$",
+        "url_prefix": "{page}",
+        "date_heading": None,
+        "listing_csv": "Manhattan_CB4.csv",
+        "output_csv": "Manhattan_CB4_with_content.csv",
+        "pdf_dir": "Manhattan_CB4_PDFs",
+    },
+    "bronx-cb1": {
+        "folder": "Bronx_CB1",
+        "listing_urls": ["https://www.nyc.gov/site/bronxcb1/calendar/board-meeting-minutes.page"],
+        "container": "div.span6.about-description",
+        "link_pattern": None,
+        "url_prefix": "https://www.nyc.gov",
+        "date_heading": None,
+        "listing_csv": "Bronx_CB1.csv",
+        "output_csv": "Bronx_CB1_with_content.csv",
+        "pdf_dir": "Bronx_CB1_PDFs",
+    },
+}
+
+
+def board_path(board, name):
+    return os.path.join(board["folder"], name)
+
+
+def crawl_state_path(board):
+    return board_path(board, f"{board['folder']}_crawl_state.json")
+
+
+# parse(html, url) for a board, as used by Crawler.listing_rows
+def listing_parser(board):
+    pattern = re.compile(board["link_pattern"], re.IGNORECASE) if board["link_pattern"] else None
+
+    def parse(html, url):
+        rows = []
+        soup = BeautifulSoup(html, "html.parser")
+        containers = soup.select(board["container"]) if board["container"] else [soup]
+        for container in containers:
+            prefix = ""
+            if board["date_heading"]:
+                heading = container.select_one(board["date_heading"])
+                prefix = f"{heading.text.strip() if heading else 'Unknown Year'} "
+
+            for link in container.find_all("a", href=True):
+                href = link["href"]
+                if pattern and not pattern.search(href):
+                    continue
+                if not href.startswith("http"):
+                    href = board["url_prefix"].replace("{page}", url) + href
+                rows.append({"Date": prefix + link.text.strip(), "URL": href})
+        return rows
+
+    return parse
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import time
+
+# Change feed written by every pipeline run.
+#
+# Each board's *_with_content.csv gets a *_changes.jsonl next to it. Every
+# run that changed rows appends one line:
+#   {"seq": 7, "run_id": "...", "csv_signature": "<sha256 of the CSV>",
+#    "previous_signature": "<sha256 of the CSV before the run>" or null,
+#    "changes": [{"change": "added" | "changed" | "removed",
+#                 "date": ..., "url": ..., "content_hash": ...}, ...]}
+# ("changed" rows also carry "previous_date", since a corrected date moves a
+# row to another month).
+# csv_signature is the CSV's signature right after the run wrote it, so a
+# consumer that last saw `previous_signature` knows exactly which rows
+# differ from what it has (see Manhattan_CB2/change_feed.py, the reader).
+# Signatures are content hashes rather than mtime/size, so a git checkout or
+# copy of an unchanged CSV doesn't break the chain. Runs that changed nothing
+# aren't logged: the CSV they write has the same bytes, and so the same
+# signature, as before.
+
+
+# Same hash as the app's minutes store keeps per row
+def content_hash(content):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def default_changes_path(output_csv):
+    root, _ = os.path.splitext(output_csv)
+    return f"{root}_changes.jsonl"
+
+
+# sha256 of the file's bytes, or None if there is no file yet
+def file_signature(path):
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+# {url: (date, content hash)} for a listing frame with Date, URL and Content
+def listing_rows(df):
+    rows = {}
+    for date, url, content in zip(df["Date"].tolist(), df["URL"].tolist(), df["Content"].tolist()):
+        content = content if isinstance(content, str) else ""
+        rows[url] = (date if isinstance(date, str) else None, content_hash(content))
+    return rows
+
+
+# Added, changed and removed rows between two runs' outputs, keyed by URL
+def diff_listing(previous, current):
+    changes = []
+    for url, (date, digest) in current.items():
+        if url not in previous:
+            changes.append({"change": "added", "date": date, "url": url, "content_hash": digest})
+        elif previous[url] != (date, digest):
+            changes.append({
+                "change": "changed", "date": date, "url": url, "content_hash": digest,
+                "previous_date": previous[url][0],
+            })
+    for url, (date, digest) in previous.items():
+        if url not in current:
+            changes.append({"change": "removed", "date": date, "url": url, "content_hash": digest})
+    return changes
+
+
+class ChangeFeed:
+    def __init__(self, path):
+        self.path = path
+
+    # Highest seq in the feed; lines a crash cut short are skipped, as the reader does
+    def last_seq(self):
+        seq = 0
+        try:
+            with open(self.path, "r") as f:
+                for line in f:
+                    try:
+                        seq = max(seq, int(json.loads(line)["seq"]))
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except OSError:
+            pass
+        return seq
+
+    def _ends_with_newline(self):
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return True
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) == b"\n"
+        except OSError:
+            return True
+
+    # One line per run, appended and flushed in one write. A line left unfinished
+    # by a crash is closed off first, so the new run doesn't run into it.
+    def append(self, changes, csv_signature, previous_signature):
+        entry = {
+            "seq": self.last_seq() + 1,
+            "run_id": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "csv_signature": csv_signature,
+            "previous_signature": previous_signature,
+            "changes": changes,
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        if not self._ends_with_newline():
+            line = "\n" + line
+        with open(self.path, "a") as f:
+            f.write(line)
+        return entry
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import time
+
+import requests
+
+from scraper.download import HostRateLimiter, make_session
+
+# Already-downloaded PDFs are re-checked with a HEAD request after this long
+PDF_RECHECK_SECONDS = 7 * 24 * 3600
+
+# At most this many PDFs are re-checked per run (oldest check first)
+PDF_CHECKS_PER_RUN = 10
+
+# Conditional crawler for board listing pages and their PDFs.
+#
+# Listing pages are fetched with If-None-Match / If-Modified-Since from the
+# previous crawl. On a 304, or a 200 whose body hashes the same, the page isn't
+# parsed again and the rows parsed last time are reused. PDFs already on disk
+# are re-validated a few at a time with conditional HEAD requests, so a run
+# where nothing changed costs one small request per listing page. State is
+# kept in a JSON file next to the board's CSVs so scheduled runs can share it.
+
+
+def sha256_text(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# Conditional request headers from what the server sent last time
+def conditional_headers(entry):
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def validators(response):
+    return {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+
+
+class Crawler:
+    def __init__(self, state_path, session=None, min_interval=1.0, timeout=30,
+                 pdf_recheck=PDF_RECHECK_SECONDS, pdf_checks_per_run=PDF_CHECKS_PER_RUN, limiter=None):
+        self.state_path = state_path
+        self.session = session or make_session()
+        self.limiter = limiter or HostRateLimiter(min_interval)
+        self.timeout = timeout
+        self.pdf_recheck = pdf_recheck
+        self.pdf_checks_per_run = pdf_checks_per_run
+        self.requests_made = 0
+        try:
+            with open(state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        self.pages = state.get("pages", {})
+        self.pdfs = state.get("pdfs", {})
+
+    def _request(self, method, url, headers):
+        self.limiter.wait(url)
+        self.requests_made += 1
+        return self.session.request(method, url, headers=headers, timeout=self.timeout)
+
+    # Rows for one listing page: (rows, changed).
+    # `parse(html, url)` turns the page into a list of {"Date", "URL"} dicts.
+    def listing_rows(self, url, parse):
+        entry = self.pages.get(url, {})
+        try:
+            response = self._request("GET", url, conditional_headers(entry))
+        except requests.exceptions.RequestException as e:
+            print(f"Error occurred for URL {url}: {e}")
+            return entry.get("rows", []), False
+
+        if response.status_code == 304 and "rows" in entry:
+            return entry["rows"], False
+        if response.status_code != 200:
+            print(f"Failed to fetch webpage {url}. Status code: {response.status_code}")
+            return entry.get("rows", []), False
+
+        body_hash = sha256_text(response.text)
+        if body_hash == entry.get("sha256") and "rows" in entry:
+            rows = entry["rows"]
+        else:
+            rows = parse(response.text, url)
+        changed = rows != entry.get("rows")
+        self.pages[url] = {**validators(response), "sha256": body_hash, "rows": rows}
+        return rows, changed
+
+    # Rows for all of a board's listing pages, in order: (rows, changed)
+    def crawl_listing(self, urls, parse):
+        rows = []
+        changed = False
+        for url in urls:
+            page_rows, page_changed = self.listing_rows(url, parse)
+            rows.extend(page_rows)
+            changed = changed or page_changed
+        return rows, changed
+
+    # Whether a downloaded PDF changed upstream, via a conditional HEAD
+    def pdf_changed(self, url, file_path):
+        entry = self.pdfs.get(url, {})
+        try:
+            response = self._request("HEAD", url, conditional_headers(entry))
+        except requests.exceptions.RequestException as e:
+            print(f"HEAD failed for {url}: {e}")
+            return False
+        if response.status_code == 304:
+            entry["checked_at"] = time.time()
+            self.pdfs[url] = entry
+            return False
+        if response.status_code != 200:
+            return False
+
+        current = validators(response)
+        if entry.get("etag") or entry.get("last_modified"):
+            changed = current != {key: entry.get(key) for key in current}
+        else:
+            # First check: all we can compare against is the file we have
+            length = response.headers.get("Content-Length")
+            changed = length is not None and int(length) != os.path.getsize(file_path)
+        self.pdfs[url] = {**current, "checked_at": time.time()}
+        return changed
+
+    # PDFs that should be (re)downloaded: ones not on disk yet, plus the
+    # already-downloaded ones whose re-check found a change upstream
+    def pdf_updates(self, urls, pdf_dir):
+        updates = []
+        due = []
+        now = time.time()
+        for url in dict.fromkeys(urls):
+            file_path = os.path.join(pdf_dir, os.path.basename(url))
+            if not os.path.exists(file_path):
+                updates.append(url)
+                self.pdfs[url] = {"checked_at": now}
+            elif now - self.pdfs.get(url, {}).get("checked_at", 0) >= self.pdf_recheck:
+                due.append((self.pdfs.get(url, {}).get("checked_at", 0), url, file_path))
+
+        for _, url, file_path in sorted(due)[: self.pdf_checks_per_run]:
+            if self.pdf_changed(url, file_path):
+                print(f"Changed upstream: {url}")
+                updates.append(url)
+        return updates
+
+    def save(self):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"pages": self.pages, "pdfs": self.pdfs}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
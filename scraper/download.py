@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
+
+
+# Keeps requests to the same host at least `min_interval` seconds apart
+class HostRateLimiter:
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, 0.0))
+            self._next[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+
+# Responses worth another try: rate limiting and server-side failures
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+# Pooled session that retries connection errors and RETRY_STATUSES with
+# exponential backoff (or the server's Retry-After); after the last retry the
+# failing response is returned as is, for raise_for_status to report
+def make_session(pool_size=8, retries=2, backoff=1.0):
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    retry = Retry(
+        total=retries, backoff_factor=backoff, status_forcelist=RETRY_STATUSES,
+        allowed_methods=("GET", "HEAD"), respect_retry_after_header=True, raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Downloads PDFs over one pooled session. Files that already exist are skipped
+# without a request or a delay unless `force` is set (the crawler found a newer
+# copy upstream); downloads are rate-limited per host.
+class Downloader:
+    def __init__(self, workers=4, min_interval=1.0, timeout=30, session=None, limiter=None):
+        self.workers = workers
+        self.timeout = timeout
+        self.limiter = limiter or HostRateLimiter(min_interval)
+        self.session = session or make_session(workers)
+
+    def download(self, url, file_path, force=False):
+        if os.path.exists(file_path) and not force:
+            return False
+
+        self.limiter.wait(url)
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+
+        # Write to a temp file first so a failed download never looks complete
+        tmp_path = f"{file_path}.part"
+        with open(tmp_path, "wb") as pdf_file:
+            pdf_file.write(response.content)
+        os.replace(tmp_path, file_path)
+        print(f"Downloaded: {file_path}")
+        return True
+
+    # Download (url, file_path) pairs; returns {url: error} for the ones that failed.
+    # URLs in `force` are downloaded again even if the file exists.
+    def download_all(self, items, force=()):
+        errors = {}
+        force = set(force)
+
+        def fetch(item):
+            url, file_path = item
+            try:
+                self.download(url, file_path, force=url in force)
+            except Exception as e:
+                print(f"Download failed for {url}: {e}")
+                errors[url] = str(e)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(fetch, items))
+        return errors
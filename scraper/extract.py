@@ -0,0 +1,201 @@
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+
+from scraper.ocr import ocr_page, page_needs_ocr
+
+# Bump when extraction output changes so cached text is re-extracted
+EXTRACTOR_VERSION = "pdfplumber-3"
+
+# Placeholders the notebooks have always written for failed PDFs
+EXTRACTION_ERROR = "Error extracting content"
+NEEDS_REVIEW = "Manual review required"
+
+# Lines at the top and bottom of a page checked for repeated letterheads,
+# page numbers and footers
+EDGE_LINES = 4
+
+# An edge line is boilerplate when it's in the same place on at least this
+# share of pages (and on MIN_REPEAT_PAGES or more, so short documents keep
+# their text)
+REPEAT_SHARE = 0.6
+MIN_REPEAT_PAGES = 3
+
+# Numbers are ignored only in lines this short ("Pg. 3", "Page 3 of 12"), so
+# vote tallies that differ only in their counts are never taken for footers
+PAGE_NUMBER_CHARS = 12
+
+DIGITS = re.compile(r"\d+")
+SPACES = re.compile(r"\s+")
+
+# One pass over the joined text: words broken across a line with a hyphen are
+# rejoined, spaces around line ends are trimmed, runs of spaces and tabs
+# become one space, and more than one blank line becomes one
+NORMALIZE = re.compile(
+    r"(?P<hyphen>\b(?P<head>[A-Za-z]*[a-z])-[ \t]*\n[ \t]*(?P<tail>[a-z]+))"
+    r"|(?P<edge>[ \t\xa0\x0c]+(?=\n|$)|(?:(?<=\n)|^)[ \t\xa0\x0c]+)"
+    r"|(?P<breaks>\n(?:[ \t\xa0]*\n){2,})"
+    r"|(?P<spaces>[ \t\xa0\x0c]+)"
+)
+WORD = re.compile(r"[a-z]+")
+NORMALIZED = {"edge": "", "breaks": "\n\n", "spaces": " "}
+
+
+# (text, needs OCR) for each page, one page at a time. pdfplumber caches every
+# parsed character of a page; closing the page once its text is out keeps only
+# the current page's objects in memory instead of the whole document's.
+def iter_pdf_pages(pdf):
+    for page in pdf.pages:
+        text = page.extract_text() or ""
+        needs_ocr = page_needs_ocr(text, bool(page.images))
+        page.close()
+        yield text, needs_ocr
+
+
+# Per-page text of one PDF plus the pages whose text layer needs OCR.
+# Returns (file_path, pages, ocr_pages); pages is None if the PDF can't be read.
+def extract_pdf_pages(file_path):
+    try:
+        with pdfplumber.open(file_path) as pdf:
+            pages = []
+            ocr_pages = []
+            for number, (text, needs_ocr) in enumerate(iter_pdf_pages(pdf)):
+                pages.append(text)
+                if needs_ocr:
+                    ocr_pages.append(number)
+    except Exception as e:
+        print(f"pdfplumber failed for {file_path}: {e}")
+        return file_path, None, []
+    return file_path, pages, ocr_pages
+
+
+# Indexes of a page's top and bottom EDGE_LINES non-empty lines, each with its
+# place on the page ("top", 0 is the first line; "bottom", 0 is the last)
+def edge_lines(lines):
+    filled = [i for i, line in enumerate(lines) if line.strip()]
+    top = filled[:EDGE_LINES]
+    bottom = filled[len(top):][-EDGE_LINES:]
+    return [(i, ("top", rank)) for rank, i in enumerate(top)] + [
+        (i, ("bottom", rank)) for rank, i in enumerate(reversed(bottom))
+    ]
+
+
+# Same line in the same place, ignoring case and spacing (and page numbers)
+def edge_key(line, place):
+    line = SPACES.sub(" ", line.strip().lower())
+    if len(DIGITS.sub("", line)) <= PAGE_NUMBER_CHARS:
+        line = DIGITS.sub("#", line)
+    return place, line
+
+
+# Drop headers and footers repeated across a document's pages.
+#
+# A line counts when it's in the same place at the top or bottom of enough
+# pages; those lines are removed from page edges, never from the middle of a
+# page. The first page keeps its header, so the letterhead is still there once.
+def strip_repeated_lines(pages):
+    split = [page.split("\n") for page in pages]
+    edges = [edge_lines(lines) for lines in split]
+    counts = Counter()
+    for lines, places in zip(split, edges):
+        counts.update({edge_key(lines[i], place) for i, place in places})
+    needed = max(MIN_REPEAT_PAGES, len(pages) * REPEAT_SHARE)
+    repeated = {key for key, count in counts.items() if count >= needed}
+    if not repeated:
+        return pages
+
+    stripped = []
+    for number, (lines, places) in enumerate(zip(split, edges)):
+        drop = {
+            i for i, place in places
+            if edge_key(lines[i], place) in repeated and not (number == 0 and place[0] == "top")
+        }
+        stripped.append("\n".join(line for i, line in enumerate(lines) if i not in drop))
+    return stripped
+
+
+# Most line-end hyphens in the minutes are real compounds ("non-profit",
+# "follow-up"), so the hyphen is only dropped when the joined word is used
+# elsewhere in the same document ("com-munity" when "community" is)
+def normalize_text(text):
+    words = set(WORD.findall(text.lower()))
+
+    def replace(match):
+        if match.lastgroup != "hyphen":
+            return NORMALIZED[match.lastgroup]
+        head, tail = match.group("head", "tail")
+        if (head + tail).lower() in words:
+            return head + tail
+        return f"{head}-{tail}"
+
+    return NORMALIZE.sub(replace, text)
+
+
+# Pages without their repeated headers and footers, joined once and normalized
+def join_pages(pages):
+    if pages is None:
+        return EXTRACTION_ERROR
+    pdf_text = normalize_text("\n".join(strip_repeated_lines(pages))).strip()
+    if not pdf_text:
+        return NEEDS_REVIEW
+    return pdf_text
+
+
+# Results arrive in job order as they finish, so OCR'd pages are cached even
+# if a long run is interrupted
+def run_jobs(pool, fn, jobs):
+    if pool is None:
+        return (fn(job) for job in jobs)
+    return pool.map(fn, jobs)
+
+
+# Extract many PDFs; returns {file_path: text}.
+#
+# pdfplumber runs across a process pool first. When an OCR cache and engine are
+# given, only the pages flagged by page_needs_ocr are OCR'd, one pool task per
+# page, and every result is cached under the PDF's SHA-256 (from `hashes`).
+def extract_many(file_paths, workers=None, hashes=None, ocr_cache=None, ocr_engine=None):
+    file_paths = list(file_paths)
+    if not file_paths:
+        return {}
+
+    pool = None if workers == 1 else ProcessPoolExecutor(max_workers=workers)
+    try:
+        results = {
+            path: (pages, ocr_pages)
+            for path, pages, ocr_pages in run_jobs(pool, extract_pdf_pages, file_paths)
+        }
+
+        use_ocr = ocr_cache is not None and ocr_engine is not None and hashes is not None
+        pending = []
+        reused = 0
+        for path, (pages, ocr_pages) in results.items():
+            if not (use_ocr and pages and ocr_pages):
+                continue
+            cached = ocr_cache.get_pages(hashes[path], ocr_engine)
+            for number in ocr_pages:
+                if number in cached:
+                    pages[number] = cached[number]
+                    reused += 1
+                else:
+                    pending.append((path, number))
+
+        if any(ocr_pages for _, ocr_pages in results.values()):
+            if use_ocr:
+                print(f"OCR: {len(pending)} pages to run, {reused} from cache")
+            else:
+                print("OCR: Tesseract not available, scanned pages are left as extracted")
+
+        for path, number, text in run_jobs(pool, ocr_page, pending):
+            if text is None:
+                continue
+            text = text.replace("\x0c", "").strip()
+            ocr_cache.put_page(hashes[path], number, ocr_engine, text)
+            results[path][0][number] = text
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return {path: join_pages(pages) for path, (pages, _) in results.items()}
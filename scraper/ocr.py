@@ -0,0 +1,114 @@
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+
+import pdfplumber
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+# Resolution pages are rendered at before OCR
+OCR_DPI = 300
+
+# A page with fewer usable characters than this is treated as a scanned image
+MIN_PAGE_CHARS = 25
+
+# Below this share of letters/digits/whitespace the text layer is garbage
+MIN_CLEAN_RATIO = 0.6
+
+# pdfplumber prints glyphs it can't map to Unicode as "(cid:123)"
+CID_GLYPH = re.compile(r"\(cid:\d+\)")
+
+# Page-level OCR for scanned minutes.
+#
+# pdfplumber runs first; only pages whose text layer is empty or unreadable are
+# rendered and passed to local Tesseract. Results are cached in SQLite by
+# (PDF SHA-256, page number, engine version), so a page is OCR'd once no matter
+# how many times the pipeline runs.
+
+
+# Engine version string, or None when Tesseract isn't installed
+def tesseract_engine():
+    if pytesseract is None:
+        return None
+    try:
+        version = pytesseract.get_tesseract_version()
+    except Exception:
+        return None
+    return f"tesseract-{version}-{OCR_DPI}dpi"
+
+
+# Whether a page's pdfplumber text is too thin or too broken to keep.
+# Short pages without any images (blank or signature pages) are left alone.
+def page_needs_ocr(text, has_images):
+    raw = (text or "").strip()
+    readable = CID_GLYPH.sub("", raw).strip()
+    if len(readable) < MIN_PAGE_CHARS:
+        # Unmapped glyphs mean there is text we just can't read
+        return has_images or len(readable) < len(raw)
+    clean = sum(1 for ch in readable if ch.isalnum() or ch.isspace())
+    return clean / len(raw) < MIN_CLEAN_RATIO
+
+
+# OCR one page in a worker process; returns (file_path, page_number, text)
+def ocr_page(job):
+    file_path, page_number = job
+    try:
+        with pdfplumber.open(file_path) as pdf:
+            image = pdf.pages[page_number].to_image(resolution=OCR_DPI).original
+        text = pytesseract.image_to_string(image)
+    except Exception as e:
+        print(f"Tesseract OCR failed for {file_path} page {page_number + 1}: {e}")
+        text = None
+    return file_path, page_number, text
+
+
+class OcrCache:
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ocr_pages (
+                    pdf_sha256 TEXT NOT NULL,
+                    page INTEGER NOT NULL,
+                    engine TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    PRIMARY KEY (pdf_sha256, page, engine)
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # {page_number: text} for the cached pages of one PDF
+    def get_pages(self, pdf_sha256, engine):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT page, text FROM ocr_pages WHERE pdf_sha256 = ? AND engine = ?",
+                (pdf_sha256, engine),
+            ).fetchall()
+        return dict(rows)
+
+    def put_page(self, pdf_sha256, page, engine, text):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ocr_pages VALUES (?, ?, ?, ?)",
+                (pdf_sha256, page, engine, text),
+            )
+
+
+def default_ocr_cache_path(output_csv):
+    root, _ = os.path.splitext(output_csv)
+    return f"{root}_ocr.sqlite3"
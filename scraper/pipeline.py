@@ -0,0 +1,188 @@
+import argparse
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from scraper.changes import ChangeFeed, default_changes_path, diff_listing, file_signature, listing_rows
+from scraper.download import Downloader
+from scraper.extract import EXTRACTION_ERROR, EXTRACTOR_VERSION, NEEDS_REVIEW, extract_many
+from scraper.ocr import OcrCache, default_ocr_cache_path, tesseract_engine
+
+# Download-and-extract stage shared by all boards.
+#
+# Takes a board's listing CSV (Date, URL), downloads any PDFs that aren't on
+# disk yet, and writes the *_with_content.csv. A manifest next to the output
+# records each URL's PDF SHA-256 and the extractor version; when both match,
+# the text already in the previous output CSV is reused instead of running
+# pdfplumber again. Scanned pages are OCR'd with Tesseract and cached per page
+# (see scraper/ocr.py). PDFs that came out empty are retried once the OCR
+# engine changes (e.g. Tesseract gets installed). A run that added, changed or
+# removed rows appends them to the board's change feed (scraper/changes.py).
+
+
+def sha256_file(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def default_manifest_path(output_csv):
+    root, _ = os.path.splitext(output_csv)
+    return f"{root}_manifest.json"
+
+
+class Manifest:
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, "r") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    # Hash a PDF, reusing the stored hash while its size and mtime are unchanged
+    def file_hash(self, url, file_path):
+        stat = os.stat(file_path)
+        entry = self.entries.get(url, {})
+        if entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("sha256"):
+            return entry["sha256"]
+        return sha256_file(file_path)
+
+    def is_current(self, url, sha256, content, ocr_engine):
+        entry = self.entries.get(url)
+        if not entry or entry.get("sha256") != sha256 or entry.get("extractor") != EXTRACTOR_VERSION:
+            return False
+        return content not in (EXTRACTION_ERROR, NEEDS_REVIEW) or entry.get("ocr") == ocr_engine
+
+    def record(self, url, file_path, sha256, ocr_engine):
+        stat = os.stat(file_path)
+        self.entries[url] = {
+            "file": os.path.basename(file_path),
+            "sha256": sha256,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "extractor": EXTRACTOR_VERSION,
+            "ocr": ocr_engine,
+        }
+
+    def save(self, urls):
+        # Only keep URLs that are still listed
+        entries = {url: self.entries[url] for url in sorted(set(urls)) if url in self.entries}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+
+def previous_output(output_csv):
+    try:
+        return pd.read_csv(output_csv, usecols=["Date", "URL", "Content"])
+    except (OSError, ValueError):
+        return None
+
+
+def previous_contents(previous):
+    if previous is None:
+        return {}
+    return {
+        url: content
+        for url, content in zip(previous["URL"], previous["Content"])
+        if isinstance(content, str)
+    }
+
+
+def process_listing(listing, pdf_dir, output_csv, manifest_path=None, downloader=None, extract_workers=None,
+                    ocr=True, ocr_cache_path=None, refresh=(), changes_path=None):
+    df = pd.read_csv(listing) if isinstance(listing, str) else listing.copy()
+    os.makedirs(pdf_dir, exist_ok=True)
+    manifest = Manifest(manifest_path or default_manifest_path(output_csv))
+    previous = previous_output(output_csv)
+    previous_signature = file_signature(output_csv)
+    cached = previous_contents(previous)
+    downloader = downloader or Downloader()
+    ocr_engine = tesseract_engine() if ocr else None
+
+    urls = df["URL"].tolist()
+    file_paths = {url: os.path.join(pdf_dir, os.path.basename(url)) for url in urls}
+
+    # `refresh` lists URLs whose PDF changed upstream (see scraper/crawler.py)
+    download_errors = downloader.download_all(list(file_paths.items()), force=refresh)
+
+    # Decide which PDFs actually need pdfplumber
+    hashes = {}
+    to_extract = []
+    for url, file_path in file_paths.items():
+        if url in download_errors or not os.path.exists(file_path):
+            continue
+        hashes[url] = manifest.file_hash(url, file_path)
+        if not (url in cached and manifest.is_current(url, hashes[url], cached[url], ocr_engine)):
+            to_extract.append(file_path)
+
+    print(f"{len(to_extract)} of {len(file_paths)} PDFs need extraction")
+    ocr_cache = OcrCache(ocr_cache_path or default_ocr_cache_path(output_csv)) if ocr_engine and to_extract else None
+    extracted = extract_many(
+        sorted(set(to_extract)),
+        workers=extract_workers,
+        hashes={file_paths[url]: sha for url, sha in hashes.items()},
+        ocr_cache=ocr_cache,
+        ocr_engine=ocr_engine,
+    )
+
+    content_list = []
+    failed_files = []
+    for url in urls:
+        file_path = file_paths[url]
+        if url not in hashes:
+            content = EXTRACTION_ERROR
+        elif file_path in extracted:
+            content = extracted[file_path]
+        else:
+            content = cached[url]
+        if url in hashes:
+            manifest.record(url, file_path, hashes[url], ocr_engine)
+        if content in (EXTRACTION_ERROR, NEEDS_REVIEW):
+            failed_files.append(os.path.basename(file_path))
+        content_list.append(content)
+
+    df["Content"] = content_list
+    df.to_csv(output_csv, index=False)
+    manifest.save(urls)
+
+    changes = diff_listing(listing_rows(previous) if previous is not None else {}, listing_rows(df))
+    if changes:
+        ChangeFeed(changes_path or default_changes_path(output_csv)).append(
+            changes, file_signature(output_csv), previous_signature
+        )
+    counts = {kind: sum(1 for change in changes if change["change"] == kind) for kind in ("added", "changed", "removed")}
+    print(f"{counts['added']} added, {counts['changed']} changed, {counts['removed']} removed")
+    return df, failed_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download and extract a board's minutes PDFs")
+    parser.add_argument("listing", help="listing CSV with Date and URL columns")
+    parser.add_argument("--pdf-dir", required=True, help="folder holding the downloaded PDFs")
+    parser.add_argument("--output", required=True, help="*_with_content.csv to write")
+    parser.add_argument("--manifest", help="manifest path (default: next to the output)")
+    parser.add_argument("--download-workers", type=int, default=4)
+    parser.add_argument("--min-interval", type=float, default=1.0, help="seconds between requests to one host")
+    parser.add_argument("--extract-workers", type=int, default=None)
+    parser.add_argument("--no-ocr", action="store_true", help="skip Tesseract for scanned pages")
+    parser.add_argument("--ocr-cache", help="OCR page cache path (default: next to the output)")
+    args = parser.parse_args()
+
+    downloader = Downloader(workers=args.download_workers, min_interval=args.min_interval)
+    _, failed_files = process_listing(
+        args.listing, args.pdf_dir, args.output, args.manifest, downloader, args.extract_workers,
+        ocr=not args.no_ocr, ocr_cache_path=args.ocr_cache,
+    )
+    if failed_files:
+        print("Manual review required for:\n" + "\n".join(failed_files))
+
+
+if __name__ == "__main__":
+    main()
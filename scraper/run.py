@@ -0,0 +1,123 @@
+import argparse
+import asyncio
+import os
+
+import pandas as pd
+
+from scraper.boards import BOARDS, board_path, crawl_state_path, listing_parser
+from scraper.crawler import Crawler
+from scraper.download import Downloader, HostRateLimiter, make_session
+from scraper.pipeline import process_listing
+
+# Boards crawled at the same time
+BOARD_CONCURRENCY = 8
+
+# Scrapes every board in scraper/boards.py in one job.
+#
+# Boards run concurrently on asyncio; the blocking HTTP and pandas work runs in
+# worker threads. All boards share one connection pool and one per-host rate
+# limiter, so boards hosted on the same site (most are on nyc.gov) are polite
+# to it as a group. Extraction already fans out over a process pool per board,
+# so only one board extracts at a time while the others crawl and download.
+#
+# Run from the repo root: python -m scraper.run [board_id ...]
+
+
+# Listing rows and the PDFs to (re)download for one board (blocking)
+def crawl_board(board, session, limiter):
+    crawler = Crawler(crawl_state_path(board), session=session, limiter=limiter)
+    rows, changed = crawler.crawl_listing(board["listing_urls"], listing_parser(board))
+    listing = pd.DataFrame(rows, columns=["Date", "URL"])
+
+    if board["listing_csv"] and listing.size:
+        listing_csv = board_path(board, board["listing_csv"])
+        if changed or not os.path.exists(listing_csv):
+            listing.to_csv(listing_csv, index=False)
+
+    refresh = crawler.pdf_updates(listing["URL"], board_path(board, board["pdf_dir"]))
+    return crawler, listing, changed, refresh
+
+
+async def run_board(board_id, board, session, limiter, downloader, extract_lock, extract_workers, ocr):
+    crawler, listing, changed, refresh = await asyncio.to_thread(crawl_board, board, session, limiter)
+    if listing.empty:
+        # Don't replace the board's CSV with nothing when its site is down
+        print(f"{board_id}: no listing rows, skipping")
+        return []
+
+    pdf_dir = board_path(board, board["pdf_dir"])
+    os.makedirs(pdf_dir, exist_ok=True)
+    items = [(url, os.path.join(pdf_dir, os.path.basename(url))) for url in listing["URL"]]
+    await asyncio.to_thread(downloader.download_all, items, refresh)
+
+    async with extract_lock:
+        _, failed_files = await asyncio.to_thread(
+            process_listing, listing, pdf_dir, board_path(board, board["output_csv"]),
+            downloader=downloader, extract_workers=extract_workers, ocr=ocr,
+        )
+    crawler.save()
+    print(
+        f"{board_id}: {len(listing)} documents, listing {'changed' if changed else 'unchanged'}, "
+        f"{len(refresh)} PDFs fetched, {crawler.requests_made} crawl requests"
+    )
+    return failed_files
+
+
+async def run_boards(board_ids, min_interval=1.0, download_workers=4, extract_workers=None, ocr=True,
+                     concurrency=BOARD_CONCURRENCY):
+    session = make_session(max(download_workers, concurrency))
+    limiter = HostRateLimiter(min_interval)
+    downloader = Downloader(workers=download_workers, session=session, limiter=limiter)
+    extract_lock = asyncio.Lock()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(board_id):
+        async with semaphore:
+            return await run_board(
+                board_id, BOARDS[board_id], session, limiter, downloader, extract_lock, extract_workers, ocr
+            )
+
+    results = await asyncio.gather(*(run_one(board_id) for board_id in board_ids), return_exceptions=True)
+
+    # One board failing doesn't stop the others
+    failed = {}
+    for board_id, result in zip(board_ids, results):
+        if isinstance(result, Exception):
+            print(f"{board_id}: failed: {result}")
+            failed[board_id] = None
+        elif result:
+            failed[board_id] = result
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape board minutes listings, PDFs and text")
+    parser.add_argument("boards", nargs="*", help="board IDs (default: all boards)")
+    parser.add_argument("--min-interval", type=float, default=1.0, help="seconds between requests to one host")
+    parser.add_argument("--download-workers", type=int, default=4)
+    parser.add_argument("--extract-workers", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=BOARD_CONCURRENCY, help="boards crawled at once")
+    parser.add_argument("--no-ocr", action="store_true", help="skip Tesseract for scanned pages")
+    args = parser.parse_args()
+
+    unknown = [board_id for board_id in args.boards if board_id not in BOARDS]
+    if unknown:
+        parser.error(f"unknown boards: {', '.join(unknown)}")
+
+    failed = asyncio.run(
+        run_boards(
+            args.boards or list(BOARDS),
+            min_interval=args.min_interval,
+            download_workers=args.download_workers,
+            extract_workers=args.extract_workers,
+            ocr=not args.no_ocr,
+            concurrency=args.concurrency,
+        )
+    )
+    for board_id, failed_files in failed.items():
+        if failed_files:
+            print(f"{board_id}: manual review required for:\n" + "\n".join(failed_files))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+# The app's modules import each other by name from Manhattan_CB2/ (as under
+# gunicorn's pythonpath); the scraper is the `scraper` package at the root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "Manhattan_CB2")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from stub_server import StubServer  # noqa: E402
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    yield server
+    server.close()
@@ -0,0 +1,90 @@
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Local HTTP server for the scraper and client tests. Each path gets a
+# responder `respond(method, headers) -> (status, headers, body)`; every
+# request is recorded as (method, path, headers, monotonic time).
+class StubServer:
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.respond()
+
+            def do_HEAD(self):
+                self.respond()
+
+            def respond(self):
+                with stub._lock:
+                    stub.requests.append((self.command, self.path, dict(self.headers), time.monotonic()))
+                responder = stub.routes.get(self.path)
+                status, headers, body = responder(self.command, self.headers) if responder else (404, {}, b"")
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD" and status not in (204, 304):
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server.server_address[1]}{path}"
+
+    def route(self, path, respond):
+        self.routes[path] = respond
+
+    def requests_for(self, path):
+        with self._lock:
+            return [request for request in self.requests if request[1] == path]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# A resource with an ETag and Last-Modified that answers conditional requests with 304
+def static(body, etag=None, last_modified=None, content_type="text/html"):
+    last_modified = last_modified or formatdate(0, usegmt=True)
+    validators = {"Last-Modified": last_modified}
+    if etag:
+        validators["ETag"] = etag
+
+    def respond(method, headers):
+        if etag and headers.get("If-None-Match") == etag:
+            return 304, validators, b""
+        if not etag and headers.get("If-Modified-Since") == last_modified:
+            return 304, validators, b""
+        return 200, {**validators, "Content-Type": content_type}, body
+
+    return respond
+
+
+# Responders in turn; the last one keeps answering
+def sequence(*responders):
+    remaining = list(responders)
+
+    def respond(method, headers):
+        responder = remaining.pop(0) if len(remaining) > 1 else remaining[0]
+        return responder(method, headers)
+
+    return respond
+
+
+def status(code, headers=None, body=b""):
+    return lambda method, request_headers: (code, headers or {}, body)
@@ -0,0 +1,104 @@
+import hashlib
+import os
+
+import pandas as pd
+import pytest
+
+from change_feed import read_runs, runs_between, touched_urls
+from minutes_store import MinutesStore
+from scraper.changes import ChangeFeed, default_changes_path
+from scraper.download import Downloader, make_session
+from scraper.pipeline import process_listing
+from stub_server import static
+
+PDF_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Bronx_CB1", "Bronx_CB1_PDFs")
+PDFS = {"September-23-Minutes.pdf": "September 2023", "November-23-Minutes.pdf": "November 2023"}
+
+
+@pytest.fixture
+def board(stub_server, tmp_path):
+    for name in PDFS:
+        with open(os.path.join(PDF_DIR, name), "rb") as f:
+            stub_server.route(f"/{name}", static(f.read(), content_type="application/pdf"))
+    csv_path = str(tmp_path / "Board_with_content.csv")
+    downloader = Downloader(workers=2, min_interval=0, session=make_session(2, retries=0, backoff=0))
+
+    # One pipeline run over a listing of the given PDFs
+    def run(*names):
+        listing = pd.DataFrame({"Date": [PDFS[name] for name in names], "URL": [stub_server.url(f"/{name}") for name in names]})
+        process_listing(listing, str(tmp_path / "pdfs"), csv_path, downloader=downloader, extract_workers=1, ocr=False)
+        return read_runs(default_changes_path(csv_path))
+
+    run.csv_path = csv_path
+    return run
+
+
+def sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def test_runs_that_change_nothing_are_not_logged(board):
+    runs = board("September-23-Minutes.pdf")
+    assert len(runs) == 1
+    assert runs[0]["csv_signature"] == sha256(board.csv_path)
+
+    assert board("September-23-Minutes.pdf") == runs
+
+
+def test_runs_are_chained_by_the_csv_content_hash(board):
+    first = board("September-23-Minutes.pdf")[0]
+    assert first["previous_signature"] is None
+    board("September-23-Minutes.pdf")
+    runs = board("September-23-Minutes.pdf", "November-23-Minutes.pdf")
+
+    assert [run["seq"] for run in runs] == [1, 2]
+    assert runs[1]["previous_signature"] == first["csv_signature"]
+    assert runs_between(runs, first["csv_signature"], sha256(board.csv_path)) == runs[1:]
+    assert touched_urls(runs[1:]) == {url for url in touched_urls(runs) if url.endswith("November-23-Minutes.pdf")}
+
+
+def test_runs_signed_by_mtime_and_size_fall_back_to_a_full_import():
+    runs = [{"seq": 1, "csv_signature": [2, 100], "previous_signature": [1, 50], "changes": []}]
+    assert runs_between(runs, "a" * 64, "b" * 64) is None
+    assert runs_between(runs, [1, 50], [2, 100]) is None
+
+
+def test_store_follows_the_feed_across_a_checkout(board, tmp_path, monkeypatch):
+    store = MinutesStore(str(tmp_path / "minutes.sqlite3"))
+    board("September-23-Minutes.pdf")
+    assert store.import_csv("board", board.csv_path)
+    assert store.imported_signature("board") == sha256(board.csv_path)
+
+    # A checkout rewrites the file with new mtimes but the same bytes
+    stat = os.stat(board.csv_path)
+    os.utime(board.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert not store.import_csv("board", board.csv_path)
+    assert store.imported_stat("board") == (stat.st_mtime_ns + 10**9, stat.st_size)
+
+    board("September-23-Minutes.pdf", "November-23-Minutes.pdf")
+
+    def write_board(*args, **kwargs):
+        raise AssertionError("the feed covers the change; the board shouldn't be written in full")
+
+    monkeypatch.setattr(store, "write_board", write_board)
+    assert store.import_csv("board", board.csv_path)
+    assert store.imported_signature("board") == sha256(board.csv_path)
+    assert sorted(store.read_metadata("board")["URL"].str.rsplit("/", n=1).str[-1]) == sorted(PDFS)
+
+
+def test_append_after_a_run_cut_off_mid_write(tmp_path):
+    path = tmp_path / "Board_changes.jsonl"
+    feed = ChangeFeed(str(path))
+    for seq in (1, 2):
+        feed.append([{"change": "added", "url": f"https://example.org/{seq}.pdf"}], f"{seq}" * 64, None)
+    # A crash while writing run 3 leaves half a line without its newline
+    with open(path, "a") as f:
+        f.write('{"seq": 3, "run_id": "2024-01-01T00:00:00Z", "csv_sig')
+
+    entry = feed.append([{"change": "added", "url": "https://example.org/4.pdf"}], "4" * 64, "2" * 64)
+    assert entry["seq"] == 3
+    runs = read_runs(str(path))
+    assert [run["seq"] for run in runs] == [1, 2, 3]
+    assert runs[-1]["changes"] == entry["changes"]
+    assert feed.last_seq() == 3
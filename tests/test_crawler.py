@@ -0,0 +1,157 @@
+import os
+
+import pytest
+
+from scraper.crawler import Crawler
+from scraper.download import make_session
+from stub_server import static, status
+
+LISTING = b"""<html><body>
+<a href="/pdfs/january.pdf">January 2024</a>
+<a href="/pdfs/february.pdf">February 2024</a>
+</body></html>"""
+
+
+# Stand-in for a board's listing parser that counts its calls
+class Parser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, html, url):
+        self.calls += 1
+        return [{"Date": line.split(">")[1].split("<")[0], "URL": line.split('"')[1]}
+                for line in html.splitlines() if "<a href" in line]
+
+
+def crawler(tmp_path, **kwargs):
+    return Crawler(str(tmp_path / "crawl_state.json"), session=make_session(2, backoff=0), min_interval=0, **kwargs)
+
+
+def test_etag_304_reuses_rows_without_parsing(stub_server, tmp_path):
+    stub_server.route("/minutes", static(LISTING, etag='"listing-v1"'))
+    url = stub_server.url("/minutes")
+    parse = Parser()
+
+    first = crawler(tmp_path)
+    rows, changed = first.listing_rows(url, parse)
+    first.save()
+    assert changed is True
+    assert [row["Date"] for row in rows] == ["January 2024", "February 2024"]
+
+    # The next scheduled run starts from the saved state
+    second = crawler(tmp_path)
+    again, changed = second.listing_rows(url, parse)
+    assert changed is False
+    assert again == rows
+    assert parse.calls == 1
+    requests_seen = stub_server.requests_for("/minutes")
+    assert requests_seen[1][2].get("If-None-Match") == '"listing-v1"'
+    assert second.requests_made == 1
+
+
+def test_last_modified_304_reuses_rows(stub_server, tmp_path):
+    stub_server.route("/minutes", static(LISTING, last_modified="Mon, 01 Jan 2024 00:00:00 GMT"))
+    url = stub_server.url("/minutes")
+    parse = Parser()
+
+    first = crawler(tmp_path)
+    first.listing_rows(url, parse)
+    first.save()
+    _, changed = crawler(tmp_path).listing_rows(url, parse)
+
+    assert changed is False
+    assert parse.calls == 1
+    assert stub_server.requests_for("/minutes")[1][2].get("If-Modified-Since") == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+def test_same_body_without_validators_is_not_parsed_again(stub_server, tmp_path):
+    stub_server.route("/minutes", lambda method, headers: (200, {}, LISTING))
+    url = stub_server.url("/minutes")
+    parse = Parser()
+
+    state = crawler(tmp_path)
+    state.listing_rows(url, parse)
+    _, changed = state.listing_rows(url, parse)
+    assert changed is False
+    assert parse.calls == 1
+
+
+def test_new_etag_means_changed_rows(stub_server, tmp_path):
+    url = stub_server.url("/minutes")
+    parse = Parser()
+    state = crawler(tmp_path)
+    stub_server.route("/minutes", static(LISTING, etag='"v1"'))
+    state.listing_rows(url, parse)
+
+    updated = LISTING.replace(b"</body>", b'<a href="/pdfs/march.pdf">March 2024</a>\n</body>')
+    stub_server.route("/minutes", static(updated, etag='"v2"'))
+    rows, changed = state.listing_rows(url, parse)
+    assert changed is True
+    assert rows[-1] == {"Date": "March 2024", "URL": "/pdfs/march.pdf"}
+
+
+def test_failed_fetch_keeps_the_previous_rows(stub_server, tmp_path):
+    url = stub_server.url("/minutes")
+    parse = Parser()
+    state = crawler(tmp_path)
+    stub_server.route("/minutes", static(LISTING, etag='"v1"'))
+    rows, _ = state.listing_rows(url, parse)
+
+    stub_server.route("/minutes", status(404))
+    assert state.listing_rows(url, parse) == (rows, False)
+
+
+def test_pdf_head_304_is_unchanged_and_new_etag_is_changed(stub_server, tmp_path):
+    pdf_url = stub_server.url("/pdfs/january.pdf")
+    file_path = tmp_path / "january.pdf"
+    file_path.write_bytes(b"%PDF-1.4 january")
+    state = crawler(tmp_path)
+
+    stub_server.route("/pdfs/january.pdf", static(b"%PDF-1.4 january", etag='"pdf-v1"'))
+    # First check: only the length can be compared
+    assert state.pdf_changed(pdf_url, str(file_path)) is False
+    assert state.pdf_changed(pdf_url, str(file_path)) is False
+    head = stub_server.requests_for("/pdfs/january.pdf")
+    assert [request[0] for request in head] == ["HEAD", "HEAD"]
+    assert head[1][2].get("If-None-Match") == '"pdf-v1"'
+
+    stub_server.route("/pdfs/january.pdf", static(b"%PDF-1.4 january, corrected", etag='"pdf-v2"'))
+    assert state.pdf_changed(pdf_url, str(file_path)) is True
+
+
+def test_no_change_run_costs_one_request_per_listing_page(stub_server, tmp_path):
+    stub_server.route("/minutes", static(LISTING, etag='"v1"'))
+    pdf_dir = tmp_path / "pdfs"
+    pdf_dir.mkdir()
+    parse = Parser()
+
+    first = crawler(tmp_path)
+    rows, _ = first.crawl_listing([stub_server.url("/minutes")], parse)
+    pdf_urls = [stub_server.url(row["URL"]) for row in rows]
+    # Not on disk yet: wanted, without asking the server
+    assert first.pdf_updates(pdf_urls, str(pdf_dir)) == pdf_urls
+    for url in pdf_urls:
+        (pdf_dir / os.path.basename(url)).write_bytes(b"%PDF-1.4")
+    first.save()
+    stub_server.requests.clear()
+
+    second = crawler(tmp_path)
+    rows, changed = second.crawl_listing([stub_server.url("/minutes")], parse)
+    assert changed is False
+    assert second.pdf_updates([stub_server.url(row["URL"]) for row in rows], str(pdf_dir)) == []
+    assert [(method, path) for method, path, _, _ in stub_server.requests] == [("GET", "/minutes")]
+
+
+@pytest.mark.parametrize("checks_per_run", [1, 2])
+def test_due_pdf_rechecks_are_capped_per_run(stub_server, tmp_path, checks_per_run):
+    pdf_dir = tmp_path / "pdfs"
+    pdf_dir.mkdir()
+    urls = []
+    for name in ["a.pdf", "b.pdf", "c.pdf"]:
+        stub_server.route(f"/pdfs/{name}", static(b"%PDF-1.4", etag=f'"{name}"'))
+        (pdf_dir / name).write_bytes(b"%PDF-1.4")
+        urls.append(stub_server.url(f"/pdfs/{name}"))
+
+    state = crawler(tmp_path, pdf_recheck=0, pdf_checks_per_run=checks_per_run)
+    assert state.pdf_updates(urls, str(pdf_dir)) == []
+    assert len(stub_server.requests) == checks_per_run
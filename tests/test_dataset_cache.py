@@ -0,0 +1,59 @@
+import threading
+import time
+
+from dataset_cache import DatasetCache
+
+
+# on_load that blocks until released, recording the boards it ran for
+class SlowOnLoad:
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = []
+
+    def __call__(self, board_id, data):
+        self.release.wait(5)
+        self.calls.append((board_id, data))
+
+
+def make_cache(tmp_path, on_load):
+    csv_path = tmp_path / "board.csv"
+    csv_path.write_text("URL,Date\n")
+    return DatasetCache({"board": str(csv_path)}, lambda path: f"parsed {path}", on_load=on_load)
+
+
+def test_first_load_returns_before_on_load_finishes(tmp_path):
+    on_load = SlowOnLoad()
+    cache = make_cache(tmp_path, on_load)
+
+    started = time.monotonic()
+    data = cache.get("board")
+    assert data.startswith("parsed ")
+    assert time.monotonic() - started < 1
+    assert not cache.wait_loaded("board", timeout=0.05)
+
+    on_load.release.set()
+    assert cache.wait_loaded("board", timeout=5)
+    assert on_load.calls == [("board", data)]
+
+
+def test_preload_runs_on_load_before_returning(tmp_path):
+    on_load = SlowOnLoad()
+    on_load.release.set()
+    cache = make_cache(tmp_path, on_load)
+
+    data = cache.preload("board")
+    assert on_load.calls == [("board", data)]
+    assert cache.wait_loaded("board", timeout=0)
+    # Already loaded: neither get() nor another preload() runs on_load again
+    cache.get("board")
+    cache.preload("board")
+    assert len(on_load.calls) == 1
+
+
+def test_failing_on_load_still_counts_as_loaded(tmp_path):
+    def on_load(board_id, data):
+        raise RuntimeError("index is locked")
+
+    cache = make_cache(tmp_path, on_load)
+    cache.get("board")
+    assert cache.wait_loaded("board", timeout=5)
@@ -0,0 +1,104 @@
+import os
+import time
+
+import pytest
+import requests
+
+from scraper.download import Downloader, make_session
+from stub_server import sequence, static, status
+
+PDF_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Bronx_CB1", "Bronx_CB1_PDFs")
+PDF_NAMES = ["September-23-Minutes.pdf", "November-23-Minutes.pdf"]
+
+
+def read_pdf(name):
+    with open(os.path.join(PDF_DIR, name), "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def downloader():
+    return Downloader(workers=4, min_interval=0, session=make_session(4, retries=2, backoff=0))
+
+
+def test_downloads_a_checked_in_pdf_once(stub_server, downloader, tmp_path):
+    body = read_pdf(PDF_NAMES[0])
+    stub_server.route("/minutes.pdf", static(body, etag='"v1"', content_type="application/pdf"))
+    target = tmp_path / "minutes.pdf"
+
+    assert downloader.download(stub_server.url("/minutes.pdf"), str(target)) is True
+    assert target.read_bytes() == body
+    # Already on disk: no request, no delay
+    assert downloader.download(stub_server.url("/minutes.pdf"), str(target)) is False
+    assert len(stub_server.requests_for("/minutes.pdf")) == 1
+
+
+def test_force_downloads_again(stub_server, downloader, tmp_path):
+    stub_server.route("/minutes.pdf", static(read_pdf(PDF_NAMES[0]), content_type="application/pdf"))
+    target = tmp_path / "minutes.pdf"
+    target.write_bytes(b"old copy")
+
+    assert downloader.download(stub_server.url("/minutes.pdf"), str(target), force=True) is True
+    assert target.read_bytes() == read_pdf(PDF_NAMES[0])
+
+
+def test_server_errors_are_retried(stub_server, downloader, tmp_path):
+    body = read_pdf(PDF_NAMES[0])
+    stub_server.route("/minutes.pdf", sequence(status(503), status(502), static(body)))
+    target = tmp_path / "minutes.pdf"
+
+    assert downloader.download(stub_server.url("/minutes.pdf"), str(target)) is True
+    assert target.read_bytes() == body
+    assert len(stub_server.requests_for("/minutes.pdf")) == 3
+
+
+def test_retry_after_is_honoured(stub_server, downloader, tmp_path):
+    body = read_pdf(PDF_NAMES[0])
+    stub_server.route("/minutes.pdf", sequence(status(429, {"Retry-After": "1"}), static(body)))
+
+    started = time.monotonic()
+    downloader.download(stub_server.url("/minutes.pdf"), str(tmp_path / "minutes.pdf"))
+    requests_seen = stub_server.requests_for("/minutes.pdf")
+    assert len(requests_seen) == 2
+    assert requests_seen[1][3] - requests_seen[0][3] >= 0.9
+    assert time.monotonic() - started >= 0.9
+
+
+def test_gives_up_after_the_retries_and_leaves_no_file(stub_server, downloader, tmp_path):
+    stub_server.route("/minutes.pdf", status(500))
+    target = tmp_path / "minutes.pdf"
+
+    with pytest.raises(requests.HTTPError):
+        downloader.download(stub_server.url("/minutes.pdf"), str(target))
+    # The first try plus two retries
+    assert len(stub_server.requests_for("/minutes.pdf")) == 3
+    assert os.listdir(tmp_path) == []
+
+
+def test_download_all_reports_failures_and_keeps_going(stub_server, downloader, tmp_path):
+    stub_server.route("/a.pdf", static(read_pdf(PDF_NAMES[0])))
+    items = [
+        (stub_server.url("/a.pdf"), str(tmp_path / "a.pdf")),
+        (stub_server.url("/missing.pdf"), str(tmp_path / "missing.pdf")),
+    ]
+
+    errors = downloader.download_all(items)
+    assert list(errors) == [stub_server.url("/missing.pdf")]
+    assert (tmp_path / "a.pdf").exists()
+    # A 404 is not worth retrying
+    assert len(stub_server.requests_for("/missing.pdf")) == 1
+
+
+def test_requests_to_one_host_are_spaced_out(stub_server, tmp_path):
+    downloader = Downloader(workers=4, min_interval=0.2, session=make_session(4, backoff=0))
+    items = []
+    for i in range(4):
+        name = PDF_NAMES[i % len(PDF_NAMES)]
+        stub_server.route(f"/{i}.pdf", static(read_pdf(name)))
+        items.append((stub_server.url(f"/{i}.pdf"), str(tmp_path / f"{i}.pdf")))
+
+    assert downloader.download_all(items) == {}
+    times = sorted(request[3] for request in stub_server.requests)
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert len(times) == 4
+    assert min(gaps) >= 0.18
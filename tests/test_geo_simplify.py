@@ -0,0 +1,148 @@
+import json
+import math
+import os
+import random
+
+import pytest
+
+from geo_simplify import (
+    BOARD_TOLERANCE, COORD_PRECISION, OVERVIEW_TOLERANCE, district_payloads, error_bound, rings,
+    simplified_feature, simplify_geometry,
+)
+
+GEOJSON_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Manhattan_CB2", "static", "Community Districts.geojson"
+)
+
+
+def segment_distance(point, start, end):
+    (px, py), (ax, ay), (bx, by) = point, start, end
+    dx, dy = bx - ax, by - ay
+    length = dx * dx + dy * dy
+    t = 0.0 if length == 0 else max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length))
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+def directed_hausdorff(ring, outline):
+    return max(
+        min(segment_distance(point, outline[i], outline[i + 1]) for i in range(len(outline) - 1))
+        for point in ring
+    )
+
+
+# Symmetric Hausdorff distance between two closed rings (vertices to edges)
+def hausdorff(a, b):
+    return max(directed_hausdorff(a, b), directed_hausdorff(b, a))
+
+
+def signed_area(ring):
+    return sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(ring, ring[1:])) / 2
+
+
+def segments_cross(p1, p2, p3, p4):
+    def orientation(a, b, c):
+        value = (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+        return (value > 0) - (value < 0)
+
+    return (orientation(p1, p2, p3) * orientation(p1, p2, p4) < 0
+            and orientation(p3, p4, p1) * orientation(p3, p4, p2) < 0)
+
+
+def is_simple(ring):
+    edges = list(zip(ring, ring[1:]))
+    for i in range(len(edges)):
+        for j in range(i + 2, len(edges)):
+            # The first and last edges share the closing point
+            if i == 0 and j == len(edges) - 1:
+                continue
+            if segments_cross(*edges[i], *edges[j]):
+                return False
+    return True
+
+
+def assert_valid_ring(ring, precision):
+    assert len(ring) >= 4
+    assert ring[0] == ring[-1]
+    assert all(ring[i] != ring[i + 1] for i in range(len(ring) - 1))
+    assert all(round(value, precision) == value for point in ring for value in point)
+    assert signed_area(ring) != 0
+    assert is_simple(ring)
+
+
+# A wobbly circle: radius 0.01 degrees with up to 0.00003 of noise per vertex
+def wobbly_circle(points=720, seed=1):
+    rng = random.Random(seed)
+    ring = []
+    for i in range(points):
+        angle = 2 * math.pi * i / points
+        radius = 0.01 + rng.uniform(-0.00003, 0.00003)
+        ring.append([-73.98 + radius * math.cos(angle), 40.75 + radius * math.sin(angle)])
+    return ring + [ring[0]]
+
+
+def polygon(*rings_):
+    return {"type": "Polygon", "coordinates": [list(ring) for ring in rings_]}
+
+
+@pytest.mark.parametrize("tolerance", [BOARD_TOLERANCE, 0.0002, OVERVIEW_TOLERANCE])
+def test_circle_stays_within_the_error_bound(tolerance):
+    ring = wobbly_circle()
+    simplified = simplify_geometry(polygon(ring), tolerance, COORD_PRECISION)
+    [outline] = simplified["coordinates"]
+
+    assert_valid_ring(outline, COORD_PRECISION)
+    assert len(outline) < len(ring)
+    assert hausdorff(ring, outline) <= error_bound(tolerance, COORD_PRECISION)
+    # Winding (and so outer ring vs hole) is kept
+    assert (signed_area(outline) > 0) == (signed_area(ring) > 0)
+
+
+def test_square_with_hole_keeps_both_rings():
+    square = [[0, 0], [0.001, 0.00001], [0.002, 0], [0.002, 0.002], [0, 0.002], [0, 0]]
+    hole = [[0.0005, 0.0005], [0.0005, 0.0015], [0.0015, 0.0015], [0.0015, 0.0005], [0.0005, 0.0005]]
+    simplified = simplify_geometry(polygon(square, hole), 0.00005, COORD_PRECISION)
+
+    outer, inner = simplified["coordinates"]
+    for original, ring in [(square, outer), (hole, inner)]:
+        assert_valid_ring(ring, COORD_PRECISION)
+        assert hausdorff(original, ring) <= error_bound(0.00005, COORD_PRECISION)
+    # The vertex 0.00001 off the bottom edge is within tolerance and goes
+    assert [0.001, 0.00001] not in outer
+
+
+def test_ring_smaller_than_the_tolerance_collapses():
+    tiny = [[0, 0], [0.00001, 0], [0.00001, 0.00001], [0, 0]]
+    big = wobbly_circle(points=90)
+    simplified = simplify_geometry(
+        {"type": "MultiPolygon", "coordinates": [[big], [tiny]]}, 0.0001, COORD_PRECISION
+    )
+    assert len(simplified["coordinates"]) == 1
+
+
+@pytest.fixture(scope="module")
+def districts():
+    with open(GEOJSON_PATH, "r") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("code", ["101", "102", "104", "201"])
+def test_board_districts_stay_within_the_error_bound(districts, code):
+    feature = next(f for f in districts["features"] if f["properties"].get("boro_cd") == code)
+    geometry = simplified_feature(feature, BOARD_TOLERANCE, COORD_PRECISION)["geometry"]
+    bound = error_bound(BOARD_TOLERANCE, COORD_PRECISION)
+
+    original_rings = rings(feature["geometry"])
+    simplified_rings = rings(geometry)
+    assert sum(len(ring) for ring in simplified_rings) < sum(len(ring) for ring in original_rings)
+    for ring in simplified_rings:
+        assert_valid_ring(ring, COORD_PRECISION)
+        # Every kept ring matches the original ring it came from
+        assert min(hausdorff(original, ring) for original in original_rings) <= bound
+
+
+def test_payloads_are_smaller_than_the_full_file(districts):
+    payloads = district_payloads(districts, ["101", "201"])
+    full = len(json.dumps(districts, separators=(",", ":")))
+    assert set(payloads) == {"overview", "101", "201"}
+    assert len(payloads["overview"]) < full / 2
+    assert all(len(payloads[code]) < full / 20 for code in ["101", "201"])
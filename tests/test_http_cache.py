@@ -0,0 +1,122 @@
+import pytest
+from flask import Flask, g, make_response
+
+from http_cache import MIN_GZIP_BYTES, add_default_caching, cached_response
+
+PAGE = "<p>" + "Minutes of the full board meeting. " * 100 + "</p>"
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+
+    @app.route("/page")
+    def page():
+        return PAGE
+
+    @app.route("/cached/<int:size>")
+    def cached(size):
+        return cached_response("x" * size, f"page-{size}")
+
+    @app.route("/failed")
+    def failed():
+        return "Error processing content", 500
+
+    @app.route("/no-store")
+    def no_store():
+        # Like /metrics: never worth caching, whatever the body
+        response = make_response(PAGE)
+        response.cache_control.no_store = True
+        return response
+
+    @app.route("/inline-error")
+    def inline_error():
+        # A page that shows an error_reply() message in place of its content
+        g.no_store = True
+        return PAGE
+
+    app.after_request(add_default_caching)
+    return app.test_client()
+
+
+def test_pages_get_an_etag_gzip_and_304(client):
+    response = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.cache_control.public
+
+    again = client.get("/page", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 304
+
+
+@pytest.mark.parametrize("size", [MIN_GZIP_BYTES // 2, MIN_GZIP_BYTES * 2])
+def test_304_repeats_the_etag_of_the_200(client, size):
+    response = client.get(f"/cached/{size}", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert ("Content-Encoding" in response.headers) == (size >= MIN_GZIP_BYTES)
+
+    again = client.get(f"/cached/{size}", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == response.headers["ETag"]
+
+
+@pytest.mark.parametrize("path", ["/failed", "/inline-error"])
+def test_error_replies_are_not_cached(client, path):
+    response = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert "ETag" not in response.headers
+    assert "Content-Encoding" not in response.headers
+    assert not response.cache_control.public
+
+
+@pytest.mark.parametrize("path", ["/inline-error", "/no-store"])
+def test_no_store_responses_only_say_no_store(client, path):
+    response = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Cache-Control"] == "no-store"
+    assert "ETag" not in response.headers
+
+
+# The real app, with its store, corpus, indexes and builds in a scratch directory
+@pytest.fixture(scope="module")
+def site(tmp_path_factory):
+    scratch = tmp_path_factory.mktemp("app")
+    with pytest.MonkeyPatch.context() as env:
+        for name, path in [
+            ("MINUTES_STORE_PATH", "minutes.sqlite3"),
+            ("MINUTES_CORPUS_DIR", "corpus"),
+            ("SEARCH_INDEX_PATH", "search.sqlite3"),
+            ("TRENDS_DIR", "trends"),
+            ("LLM_CACHE_PATH", "llm_cache.sqlite3"),
+            ("STATIC_BUILD_DIR", "build"),
+        ]:
+            env.setenv(name, str(scratch / path))
+        env.delenv("METRICS_DIR", raising=False)
+        import app
+
+        yield app
+        # Let the boards' background on_load finish before the scratch directory goes
+        app.dataset_cache.wait_loaded(ERROR_BOARD, timeout=60)
+
+
+ERROR_BOARD = "manhattan-cb4"
+
+
+def test_app_error_pages_are_500_and_not_cached(site, monkeypatch):
+    def get_month_records(board_id, year, month):
+        raise OSError("minutes store is unreadable")
+
+    monkeypatch.setattr(site, "get_month_records", get_month_records)
+    response = site.app.test_client().get(f"/{ERROR_BOARD}/month/2023/January", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 500
+    assert response.get_data(as_text=True).startswith("Error")
+    assert "ETag" not in response.headers
+    assert response.cache_control.no_store
+
+
+# A year that isn't a number is an unknown month, not an error
+def test_non_numeric_years_are_unknown_months(site):
+    client = site.app.test_client()
+    page = client.get(f"/{ERROR_BOARD}/month/abc/January")
+    assert page.status_code == 200
+    assert "No content available." in page.get_data(as_text=True)
+    for path in [f"/api/{ERROR_BOARD}/month/abc/January", f"/api/{ERROR_BOARD}/vote/abc/January"]:
+        assert client.get(path).status_code == 404, path
@@ -0,0 +1,201 @@
+import threading
+import time
+
+import openai
+import pytest
+from openai.openai_object import OpenAIObject
+
+import llm_cache as llm_cache_module
+from llm_cache import LLMCache, cache_key
+from llm_client import LLMClient
+
+MESSAGES = [{"role": "user", "content": "Summarize the minutes."}]
+
+
+def chat_response(content):
+    return OpenAIObject.construct_from({
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 5, "completion_tokens": 3, "total_tokens": 8},
+    })
+
+
+# openai.ChatCompletion.create stand-in that counts its calls
+class FakeCreate:
+    def __init__(self, content="A summary.", error=None, gate=None):
+        self.content = content
+        self.error = error
+        self.gate = gate
+        self.calls = 0
+        self.entered = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self, **kwargs):
+        with self._lock:
+            self.calls += 1
+        self.entered.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.error is not None:
+            raise self.error
+        return chat_response(self.content)
+
+
+# Clock for the cache's created_at / last_used_at that only moves when told to
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(llm_cache_module.time, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMCache(str(tmp_path / "llm_cache.sqlite3"))
+
+
+@pytest.fixture
+def client():
+    return LLMClient(concurrency=8)
+
+
+def summarize(cache, client, board_id="manhattan-cb1"):
+    return cache.get_or_compute(
+        board_id, "summary", "gpt-4", str(MESSAGES), lambda: client.complete("gpt-4", MESSAGES)
+    )
+
+
+def test_miss_calls_openai_then_hit_does_not(monkeypatch, cache, client):
+    create = FakeCreate("A summary.")
+    monkeypatch.setattr(openai.ChatCompletion, "create", create)
+
+    assert summarize(cache, client) == "A summary."
+    assert summarize(cache, client) == "A summary."
+    assert create.calls == 1
+
+    # Another board is another key
+    assert summarize(cache, client, board_id="bronx-cb1") == "A summary."
+    assert create.calls == 2
+
+
+def test_cache_survives_a_new_instance(monkeypatch, tmp_path, client):
+    create = FakeCreate("Stored.")
+    monkeypatch.setattr(openai.ChatCompletion, "create", create)
+    path = str(tmp_path / "llm_cache.sqlite3")
+
+    summarize(LLMCache(path), client)
+    assert summarize(LLMCache(path), client) == "Stored."
+    assert create.calls == 1
+
+
+def test_entries_expire_after_ttl(clock, tmp_path):
+    cache = LLMCache(str(tmp_path / "llm_cache.sqlite3"), ttl=60)
+    cache.put("key", "value")
+    clock.now += 59
+    assert cache.get("key") == "value"
+    clock.now += 2
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_entry_is_evicted(clock, tmp_path):
+    cache = LLMCache(str(tmp_path / "llm_cache.sqlite3"), max_entries=2)
+    cache.put("a", "1")
+    clock.now += 1
+    cache.put("b", "2")
+    clock.now += 1
+    assert cache.get("a") == "1"
+    clock.now += 1
+    cache.put("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_concurrent_misses_make_one_upstream_call(monkeypatch, cache, client):
+    gate = threading.Event()
+    create = FakeCreate("Shared.", gate=gate)
+    monkeypatch.setattr(openai.ChatCompletion, "create", create)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(summarize(cache, client))) for _ in range(8)]
+    threads[0].start()
+    assert create.entered.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # Let the other callers find the call in flight before it finishes
+    time.sleep(0.1)
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["Shared."] * 8
+    assert create.calls == 1
+
+
+def test_leader_after_a_finished_call_uses_its_result(monkeypatch, cache, client):
+    create = FakeCreate("Fresh call.")
+    monkeypatch.setattr(openai.ChatCompletion, "create", create)
+    key = cache_key("manhattan-cb1", "summary", "gpt-4", str(MESSAGES))
+    lookup = cache.get
+    misses = []
+
+    # The previous leader stores its result and leaves the in-flight map just
+    # after this caller's first lookup missed
+    def get(requested):
+        if not misses:
+            misses.append(requested)
+            cache.put(key, "Stored by the previous leader.", "manhattan-cb1", "summary", "gpt-4")
+            return None
+        return lookup(requested)
+
+    monkeypatch.setattr(cache, "get", get)
+    assert summarize(cache, client) == "Stored by the previous leader."
+    assert create.calls == 0
+
+
+def test_errors_are_not_cached(monkeypatch, cache, client):
+    failing = FakeCreate(error=openai.error.APIError("upstream failed"))
+    monkeypatch.setattr(openai.ChatCompletion, "create", failing)
+    with pytest.raises(openai.error.APIError):
+        summarize(cache, client)
+    assert cache.get(cache_key("manhattan-cb1", "summary", "gpt-4", str(MESSAGES))) is None
+
+    working = FakeCreate("Recovered.")
+    monkeypatch.setattr(openai.ChatCompletion, "create", working)
+    assert summarize(cache, client) == "Recovered."
+    assert working.calls == 1
+
+
+def test_waiting_callers_get_the_error_too(monkeypatch, cache, client):
+    gate = threading.Event()
+    create = FakeCreate(error=openai.error.Timeout("timed out"), gate=gate)
+    monkeypatch.setattr(openai.ChatCompletion, "create", create)
+
+    errors = []
+
+    def call():
+        try:
+            summarize(cache, client)
+        except openai.error.OpenAIError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    threads[0].start()
+    assert create.entered.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(errors) == 4
+    assert create.calls == 1
@@ -0,0 +1,63 @@
+import time
+
+import openai
+import pytest
+
+from fake_openai import start_fake_openai
+from llm_client import LLMBusy, LLMClient
+from metrics import Metrics
+
+MESSAGES = [{"role": "user", "content": "Summarize the minutes of the full board meeting."}]
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    server = start_fake_openai(port=0)
+    monkeypatch.setattr(openai, "api_base", f"http://127.0.0.1:{server.server_address[1]}/v1")
+    monkeypatch.setattr(openai, "api_key", "test")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = LLMClient(concurrency=1, queue_timeout=0.2, metrics=Metrics())
+    monkeypatch.setattr(openai, "requestssession", client.session)
+    return client
+
+
+def busy_count(metrics):
+    return metrics.collect()["openai_busy_total"]
+
+
+def test_complete_and_stream_against_the_local_server(fake_api, client):
+    reply = client.complete("gpt-4", MESSAGES)
+    assert reply.startswith("Summary:")
+    assert "".join(client.stream("gpt-4", MESSAGES)) == reply
+
+
+def test_busy_after_queue_timeout_while_every_slot_is_taken(fake_api, client):
+    # A stream holds its slot until the caller stops reading it
+    stream = client.stream("gpt-4", MESSAGES)
+    assert next(stream)
+
+    started = time.monotonic()
+    with pytest.raises(LLMBusy):
+        client.complete("gpt-4", MESSAGES)
+    waited = time.monotonic() - started
+    assert 0.2 <= waited < 2
+
+    # Closing the stream frees the slot for the next call
+    stream.close()
+    assert client.complete("gpt-4", MESSAGES).startswith("Summary:")
+
+
+def test_busy_calls_are_counted(fake_api, client):
+    stream = client.stream("gpt-4", MESSAGES)
+    next(stream)
+    for _ in range(2):
+        with pytest.raises(LLMBusy):
+            client.complete("gpt-4", MESSAGES)
+    stream.close()
+    assert sum(busy_count(client.metrics).values()) == 2
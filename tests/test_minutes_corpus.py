@@ -0,0 +1,43 @@
+import pandas as pd
+
+from minutes_corpus import open_corpus
+from minutes_store import MinutesStore
+
+ROWS = {
+    "https://example.org/jan.pdf": "January 2024 full board minutes\n" + "Resolution on sidewalk cafes. " * 400,
+    "https://example.org/feb.pdf": "February 2024 full board minutes\n" + "Street closure for a block party. " * 300,
+}
+
+
+def write_csv(path):
+    pd.DataFrame({"Date": ["January 2024", "February 2024"], "URL": list(ROWS), "Content": list(ROWS.values())}).to_csv(
+        path, index=False
+    )
+
+
+def contents(store, corpus):
+    data = store.read_metadata("board")
+    return dict(zip(data["URL"], corpus.fetch_contents(data["id"].tolist())))
+
+
+def test_corpus_is_rebuilt_after_a_forced_reimport(tmp_path):
+    csv_path = str(tmp_path / "board.csv")
+    corpus_path = str(tmp_path / "board.bin")
+    write_csv(csv_path)
+    store = MinutesStore(str(tmp_path / "minutes.sqlite3"))
+    store.import_csv("board", csv_path)
+    assert contents(store, open_corpus(store, "board", corpus_path)) == ROWS
+
+    # Same CSV, same sha256, but every row gets a new ID
+    store.import_csv("board", csv_path, force=True)
+    assert contents(store, open_corpus(store, "board", corpus_path)) == ROWS
+
+
+def test_unchanged_rows_reuse_the_corpus(tmp_path):
+    csv_path = str(tmp_path / "board.csv")
+    write_csv(csv_path)
+    store = MinutesStore(str(tmp_path / "minutes.sqlite3"))
+    store.import_csv("board", csv_path)
+    first = open_corpus(store, "board", str(tmp_path / "board.bin"))
+    second = open_corpus(store, "board", str(tmp_path / "board.bin"))
+    assert second.signature == first.signature == store.rows_signature("board")
@@ -0,0 +1,74 @@
+import threading
+import time
+
+from chunking import estimate_tokens
+from summarizer import summarize_minutes, truncate_partial
+
+MAX_TOKENS = 200
+
+# Minutes long enough for about ten chunks of MAX_TOKENS
+MINUTES = "\n".join(f"Item {i}: the board discussed street closure number {i} at length." for i in range(120))
+
+
+# complete() stand-in that records every prompt and answers with `reply(kind, n)`
+class FakeComplete:
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    def __call__(self, kind, messages):
+        self.prompts.append((kind, messages[-1]["content"]))
+        return self.reply(kind, len(self.prompts))
+
+
+def test_short_partials_are_reduced_into_one_prompt():
+    complete = FakeComplete(lambda kind, n: f"Partial {n}." if kind == "summary-chunk" else "The summary.")
+    assert summarize_minutes(MINUTES, complete, MAX_TOKENS) == "The summary."
+
+    kinds = [kind for kind, _ in complete.prompts]
+    assert kinds.count("summary-chunk") > 1
+    assert kinds[-1] == "summary"
+    # Every chunk summary made it into the final prompt
+    final = complete.prompts[-1][1]
+    assert all(f"Partial {n}." in final for n in range(1, kinds.count("summary-chunk") + 1))
+
+
+def test_partials_over_the_budget_are_truncated_not_sent_whole():
+    # Every chunk summary and every reduced summary is longer than a whole prompt may be
+    oversized = "word " * (MAX_TOKENS * 2)
+    complete = FakeComplete(lambda kind, n: "The summary." if kind == "summary" else f"{n} {oversized}")
+
+    assert summarize_minutes(MINUTES, complete, MAX_TOKENS) == "The summary."
+    for kind, content in complete.prompts:
+        if kind in ("summary-reduce", "summary"):
+            # "Combine: " and the separators between partials come on top of the budget
+            assert estimate_tokens(content) <= MAX_TOKENS + 5, kind
+
+
+def test_truncate_partial_prefers_a_line_break():
+    short = "A short summary."
+    assert truncate_partial(short, 100) is short
+
+    lines = "\n".join(f"Line {i} of a long partial summary." for i in range(100))
+    cut = truncate_partial(lines, 100)
+    assert estimate_tokens(cut) <= 100
+    assert lines.startswith(cut)
+    assert not cut.endswith(" ")
+    assert cut.split("\n")[-1].startswith("Line ")
+
+
+def test_parallel_caps_the_chunk_calls_in_flight():
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def complete(kind, messages):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        return "Partial."
+
+    summarize_minutes(MINUTES, complete, MAX_TOKENS, parallel=2)
+    assert in_flight[1] == 2
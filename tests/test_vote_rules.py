@@ -0,0 +1,64 @@
+import os
+import re
+
+import pytest
+
+from bench_votes import BENCH_CSVS, SAMPLES, load_texts, vote_tuple
+from vote_rules import format_vote, month_votes, parse_votes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_IDS = [f"{board_id}-{i}" for i, (board_id, _, _) in enumerate(SAMPLES)]
+
+# "N in favor" tallies in Manhattan CB1's minutes the rules must read
+MIN_CB1_RECALL = 0.95
+
+
+@pytest.fixture(scope="module")
+def board_texts():
+    return {board_id: load_texts(os.path.join(ROOT, csv_path)) for board_id, csv_path in BENCH_CSVS.items()}
+
+
+@pytest.mark.parametrize("board_id, excerpt, votes", SAMPLES, ids=SAMPLE_IDS)
+def test_sample_votes_are_read_exactly(board_id, excerpt, votes):
+    assert [vote_tuple(record) for record in parse_votes(excerpt)] == votes
+
+
+# The samples are quoted from the checked-in CSVs; if a re-scrape changes
+# the text, the sample has to be updated with it
+@pytest.mark.parametrize("board_id, excerpt, votes", SAMPLES, ids=SAMPLE_IDS)
+def test_sample_is_still_in_the_csv(board_texts, board_id, excerpt, votes):
+    assert any(excerpt in text for text in board_texts[board_id])
+
+
+def test_most_cb1_tallies_are_read(board_texts):
+    texts = board_texts["manhattan-cb1"]
+    mentions = sum(len(re.findall(r"\d+\s*in\s*favou?r", text, re.IGNORECASE)) for text in texts)
+    counted = sum(1 for text in texts for record in parse_votes(text) if record["yes"] is not None)
+    assert counted >= MIN_CB1_RECALL * mentions
+
+
+def test_text_without_votes_has_none():
+    text = "The Chair welcomed the members. Public session: residents spoke about noise on Canal Street."
+    assert parse_votes(text) == []
+    assert month_votes(text) == {"votes": [], "unparsed_sections": 0}
+
+
+def test_section_that_talks_about_a_vote_is_left_for_the_llm():
+    text = "The motion on the sidewalk cafe was discussed and the board will vote next month."
+    assert month_votes(text)["unparsed_sections"] == 1
+
+    calls = []
+
+    def complete(kind, messages):
+        calls.append(kind)
+        return "- Sidewalk cafe motion: deferred"
+
+    result = month_votes(text, complete)
+    assert calls == ["votes"]
+    assert [record["source"] for record in result["votes"]] == ["llm"]
+
+
+def test_format_vote():
+    [record] = parse_votes("4) Financial District Security Improvements Phase II – Resolution\n Vote: 37-0-0\n")
+    assert format_vote(record).endswith("(37 in favor, 0 opposed, 0 abstained)")